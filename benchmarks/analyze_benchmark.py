@@ -0,0 +1,42 @@
+"""
+Бенчмарк анализа статьи: два разбора html (count_words + get_urls)
+против одного разбора (analyze_article) на сохраненных статьях
+"""
+import os
+import time
+from bs4.builder import builder_registry
+from src.maps.hash_map import HashMap
+from src.parser.wiki import analyze_article, count_words, get_urls, read_content
+
+ARTICLES_DIRECTORY = os.path.join(os.path.dirname(__file__), '..', 'articles')
+
+
+def two_parses(html: str, features: str) -> None:
+    """Подсчет слов и поиск ссылок, каждый со своим разбором"""
+    count_words(html, HashMap(), features)
+    get_urls(html, features=features)
+
+
+def one_parse(html: str, features: str) -> None:
+    """Подсчет слов и поиск ссылок за один разбор"""
+    analyze_article(html, HashMap(), features=features)
+
+
+def per_article(func, pages: list, features: str) -> float:
+    """Возвращает среднее время функции на статью в миллисекундах"""
+    start = time.perf_counter()
+    for html in pages:
+        func(html, features)
+    return (time.perf_counter() - start) / len(pages) * 1000
+
+
+if __name__ == '__main__':
+    htmls = [read_content(os.path.join(ARTICLES_DIRECTORY, folder, 'content.txt'))[0]
+             for folder in sorted(os.listdir(ARTICLES_DIRECTORY))]
+    builders = [name for name in ('html.parser', 'lxml') if builder_registry.lookup(name)]
+    print(f'{len(htmls)} articles, ms per article')
+    print(f'{"builder":>12} {"two parses":>11} {"one parse":>10} {"speedup":>8}')
+    for builder in builders:
+        before = per_article(two_parses, htmls, builder)
+        after = per_article(one_parse, htmls, builder)
+        print(f'{builder:>12} {before:>11.1f} {after:>10.1f} {before / after:>7.2f}x')
@@ -0,0 +1,30 @@
+"""
+Бенчмарк чтения сохраненных статей: полное чтение content.txt против
+отображения в память и декодирования только области mw-content-text
+"""
+import os
+import time
+from src.parser.wiki import read_content
+
+ARTICLES_DIRECTORY = os.path.join(os.path.dirname(__file__), '..', 'articles')
+
+
+def read_full(content_path: str) -> int:
+    """Читает content.txt целиком, как раньше делал wiki_parser"""
+    with open(content_path, 'r', encoding='utf8') as file:
+        return len(file.read().encode())
+
+
+if __name__ == '__main__':
+    paths = [os.path.join(ARTICLES_DIRECTORY, folder, 'content.txt')
+             for folder in sorted(os.listdir(ARTICLES_DIRECTORY))]
+    start = time.perf_counter()
+    full_bytes = sum(read_full(path) for path in paths)
+    full_time = time.perf_counter() - start
+    start = time.perf_counter()
+    decoded_bytes = sum(read_content(path)[1] for path in paths)
+    region_time = time.perf_counter() - start
+    print(f'{len(paths)} articles')
+    print(f'full read:   {full_bytes:>10} bytes decoded, {full_time:.4f} s')
+    print(f'region read: {decoded_bytes:>10} bytes decoded, {region_time:.4f} s '
+          f'({decoded_bytes / full_bytes:.0%})')
@@ -0,0 +1,58 @@
+"""
+Бенчмарк повторного чтения счетчиков статей: words.txt через HashMap.read
+против words.bin через CountsFile
+"""
+import os
+import time
+import tempfile
+from src.maps.hash_map import HashMap
+from src.storage.counts import CountsFile, words_to_counts
+
+ARTICLES_DIRECTORY = os.path.join(os.path.dirname(__file__), '..', 'articles')
+
+
+def read_text(paths: list) -> int:
+    """Читает все words.txt в HashMap и возвращает сумму количеств"""
+    return sum(int(value) for path in paths for value in HashMap.read(path).values())
+
+
+def read_binary(paths: list) -> int:
+    """Открывает все words.bin и возвращает сумму количеств"""
+    total = 0
+    for path in paths:
+        with CountsFile(path) as counts_file:
+            total += sum(counts_file.count(index) for index in range(len(counts_file)))
+    return total
+
+
+def lookup_binary(paths: list, words: list) -> int:
+    """Ищет слова в каждом words.bin без чтения всего файла"""
+    found = 0
+    for path in paths:
+        with CountsFile(path) as counts_file:
+            found += sum(word in counts_file for word in words)
+    return found
+
+
+if __name__ == '__main__':
+    folders = sorted(os.listdir(ARTICLES_DIRECTORY))
+    text_paths = [os.path.join(ARTICLES_DIRECTORY, folder, 'words.txt') for folder in folders]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        binary_paths = []
+        for index, text_path in enumerate(text_paths):
+            binary_paths.append(os.path.join(tmp_dir, f'{index}.bin'))
+            words_to_counts(text_path, binary_paths[-1])
+        text_size = sum(os.path.getsize(path) for path in text_paths)
+        binary_size = sum(os.path.getsize(path) for path in binary_paths)
+        print(f'{len(folders)} articles, words.txt {text_size} bytes, words.bin {binary_size} bytes')
+
+        start = time.perf_counter()
+        text_total = read_text(text_paths)
+        print(f'HashMap.read(words.txt):    {time.perf_counter() - start:.3f} s')
+        start = time.perf_counter()
+        binary_total = read_binary(binary_paths)
+        print(f'CountsFile(words.bin) scan: {time.perf_counter() - start:.3f} s')
+        assert text_total == binary_total
+        start = time.perf_counter()
+        lookup_binary(binary_paths, ['и', 'в', 'википедия', 'слово'])
+        print(f'CountsFile 4 lookups each:  {time.perf_counter() - start:.3f} s')
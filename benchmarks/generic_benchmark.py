@@ -0,0 +1,109 @@
+"""
+Бенчмарк общих методов BaseMap на map из SIZE элементов: новые реализации
+против прежних (прежние методы воспроизведены ниже как функции).
+Прежний popitem проходит всю map, поэтому для него измеряются первые LEGACY_POPS
+вызовов и время пересчитывается на один вызов
+"""
+import os
+import time
+import random
+import tempfile
+from src.maps.base_map import BaseMap
+from src.maps.hash_map import HashMap
+from src.maps.tree_map import TreeMap
+
+SIZE = 100_000
+LEGACY_POPS = 20
+
+
+def legacy_eq(first: BaseMap, second: BaseMap) -> bool:
+    """Прежний __eq__: поиск по ключу с перехватом KeyError"""
+    if len(first) != len(second):
+        return False
+    for key, value in first:
+        try:
+            if value != second[key]:
+                return False
+        except KeyError:
+            return False
+    return True
+
+
+def legacy_popitem(map_: BaseMap):
+    """Прежний popitem: проход всей map ради последней пары"""
+    to_del_key = to_del_value = 0
+    for key, value in map_:
+        to_del_key, to_del_value = key, value
+    del map_[to_del_key]
+    return to_del_key, to_del_value
+
+
+def legacy_update(map_: BaseMap, other) -> None:
+    """Прежний update: ключи other и поиск значения по каждому ключу"""
+    for key in other.keys():
+        map_[key] = other[key]
+
+
+def legacy_read(map_type, path: str) -> BaseMap:
+    """Прежний read: построчное чтение, значения остаются строками"""
+    my_obj = map_type()
+    with open(path, 'r', encoding='utf8') as file:
+        for line in file:
+            key, value = line.split()
+            my_obj[key] = value
+    return my_obj
+
+
+def timed(function, *args) -> float:
+    """Возвращает время выполнения function(*args) в секундах"""
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def drain(map_: BaseMap) -> None:
+    """Опустошает map через popitem"""
+    while len(map_):
+        map_.popitem()
+
+
+def legacy_drain_per_pop(map_: BaseMap) -> float:
+    """Возвращает время одного прежнего popitem"""
+    start = time.perf_counter()
+    for _ in range(LEGACY_POPS):
+        legacy_popitem(map_)
+    return (time.perf_counter() - start) / LEGACY_POPS
+
+
+def filled(map_type, pairs: list) -> BaseMap:
+    """Создает map из пар"""
+    map_ = map_type()
+    for key, value in pairs:
+        map_[key] = value
+    return map_
+
+
+if __name__ == '__main__':
+    rnd = random.Random(0)
+    keys = [f'слово{i}' for i in range(SIZE)]
+    rnd.shuffle(keys)  # TreeMap не сбалансирован, сортированные ключи выродили бы его
+    pairs = [(key, rnd.randint(1, 1000)) for key in keys]
+    source = dict(pairs)  # источник update; TreeMap итерируется по возрастанию и выродил бы копию
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'words.txt')
+        with open(path, 'w', encoding='utf8') as file:
+            file.writelines(f'{key} {value}\n' for key, value in pairs)
+
+        print(f'{SIZE} entries, seconds (popitem - whole drain, legacy extrapolated)')
+        print(f'{"map":>8} {"method":>8} {"legacy":>9} {"new":>9}')
+        for map_class in (HashMap, TreeMap):
+            first, second = filled(map_class, pairs), filled(map_class, pairs)
+            rows = [
+                ('__eq__', timed(legacy_eq, first, second), timed(first.__eq__, second)),
+                ('update', timed(legacy_update, map_class(), source), timed(map_class().update, source)),
+                ('read', timed(legacy_read, map_class, path), timed(map_class.read, path)),
+                ('popitem', legacy_drain_per_pop(filled(map_class, pairs)) * SIZE,
+                 timed(drain, first)),
+            ]
+            for method, legacy_time, new_time in rows:
+                print(f'{map_class.__name__:>8} {method:>8} {legacy_time:>9.3f} {new_time:>9.3f}')
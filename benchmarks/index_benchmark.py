@@ -0,0 +1,47 @@
+"""
+Бенчмарк поиска статей по слову: перебор всех words.txt (как grep)
+против инвертированного индекса
+"""
+import os
+import time
+import random
+import tempfile
+from src.parser.file import file_reader
+from src.storage.inverted_index import InvertedIndex, add_articles
+
+ARTICLES_DIRECTORY = os.path.join(os.path.dirname(__file__), '..', 'articles')
+QUERIES = 200
+
+
+def scan_postings(base_path: str, word: str) -> list:
+    """Находит статьи со словом, читая words.txt каждой статьи"""
+    found = []
+    for folder in sorted(os.listdir(base_path)):
+        for line in file_reader(os.path.join(base_path, folder, 'words.txt')):
+            current, count = line.split()
+            if current == word:
+                found.append((folder, int(count)))
+                break
+    return found
+
+
+if __name__ == '__main__':
+    folders = sorted(os.listdir(ARTICLES_DIRECTORY))
+    vocabulary = sorted({line.split()[0] for folder in folders
+                         for line in file_reader(os.path.join(ARTICLES_DIRECTORY, folder, 'words.txt'))})
+    queries = random.Random(0).sample(vocabulary, QUERIES)
+    with tempfile.TemporaryDirectory() as index_path:
+        start = time.perf_counter()
+        add_articles(ARTICLES_DIRECTORY, index_path)
+        print(f'index of {len(folders)} articles built in {time.perf_counter() - start:.3f} s')
+
+        start = time.perf_counter()
+        expected = [scan_postings(ARTICLES_DIRECTORY, word) for word in queries]
+        scan_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with InvertedIndex(index_path) as index:
+            found = [index.postings(word) for word in queries]
+        index_time = time.perf_counter() - start
+        assert found == expected
+    print(f'{QUERIES} queries: scanning words.txt {scan_time:.3f} s, index {index_time:.4f} s')
@@ -0,0 +1,64 @@
+"""
+Микро-бенчмарк чтения и записи строк: построчный ввод-вывод против блочного
+"""
+import os
+import time
+import tempfile
+from src.storage.block_io import BlockWriter, block_reader
+
+LINES = 1_000_000
+
+
+def readline_reader(filename: str):
+    """Построчное чтение через readline (как раньше делал file_reader)"""
+    with open(filename, 'r', encoding='utf8') as file:
+        line = file.readline()
+        while line:
+            yield line
+            line = file.readline()
+
+
+def per_pair_writer(pairs: list, filename: str):
+    """Запись по одному write на пару (как раньше делал list_writer)"""
+    with open(filename, 'w', encoding='utf8') as file:
+        for key, value in pairs:
+            file.write(f'{key} {value}\n')
+
+
+def block_line_reader(filename: str):
+    """Чтение блоками через block_reader"""
+    for lines in block_reader(filename):
+        for _ in lines:
+            pass
+
+
+def block_pair_writer(pairs: list, filename: str):
+    """Запись пачками через BlockWriter"""
+    with BlockWriter(filename) as writer:
+        writer.write_pairs(pairs)
+
+
+def lines_per_second(func, *args, repeat: int = 3) -> float:
+    """Возвращает лучшую из repeat скорость функции в строках в секунду"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        if result is not None:
+            for _ in result:
+                pass
+        best = min(best, time.perf_counter() - start)
+    return LINES / best
+
+
+if __name__ == '__main__':
+    data = [(f'слово{index:07d}', index % 100) for index in range(LINES)]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'words.txt')
+        write_before = lines_per_second(per_pair_writer, data, path)
+        write_after = lines_per_second(block_pair_writer, data, path)
+        read_before = lines_per_second(readline_reader, path)
+        read_after = lines_per_second(block_line_reader, path)
+    print(f'{"":>6} {"before, lines/s":>16} {"after, lines/s":>16}')
+    print(f'{"write":>6} {write_before:>16,.0f} {write_after:>16,.0f}')
+    print(f'{"read":>6} {read_before:>16,.0f} {read_after:>16,.0f}')
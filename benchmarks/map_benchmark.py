@@ -0,0 +1,67 @@
+"""
+Бенчмарк подсчета слов: HashMap с цепочками против OpenHashMap с открытой адресацией и dict.
+Поток слов строится из words.txt сохраненных статей (каждое слово повторяется
+столько раз, сколько оно встретилось) и перемешивается.
+Подсчет через get + setitem сравнивается с bulk_add (для dict - Counter.update)
+"""
+import os
+import time
+import random
+from collections import Counter
+from src.maps.hash_map import HashMap
+from src.maps.open_hash_map import OpenHashMap
+from src.parser.file import file_reader
+
+ARTICLES_DIRECTORY = os.path.join(os.path.dirname(__file__), '..', 'articles')
+
+
+def load_tokens(base_path: str = ARTICLES_DIRECTORY) -> list:
+    """Восстанавливает поток слов сохраненных статей"""
+    tokens = []
+    for folder in sorted(os.listdir(base_path)):
+        for line in file_reader(os.path.join(base_path, folder, 'words.txt')):
+            word, count = line.split()
+            tokens.extend([word] * int(count))
+    random.Random(0).shuffle(tokens)
+    return tokens
+
+
+def count(map_type, tokens: list):
+    """Подсчитывает слова так же, как count_words"""
+    counter = map_type()
+    for word in tokens:
+        counter[word] = counter.get(word, 0) + 1
+    return counter
+
+
+def bulk_count(map_type, tokens: list):
+    """Подсчитывает слова через bulk_add (один поиск на слово)"""
+    counter = map_type()
+    if isinstance(counter, dict):
+        counter = Counter()
+        counter.update(tokens)
+    else:
+        counter.bulk_add(tokens)
+    return counter
+
+
+def lookup(counter, tokens: list) -> int:
+    """Ищет каждое слово потока в уже заполненной map"""
+    return sum(counter[word] for word in tokens)
+
+
+if __name__ == '__main__':
+    words = load_tokens()
+    print(f'{len(words)} tokens, {len(set(words))} distinct words')
+    print(f'{"map":>12} {"count, s":>9} {"bulk_add, s":>12} {"lookup, s":>10}')
+    for map_class in (HashMap, OpenHashMap, dict):
+        start = time.perf_counter()
+        filled = count(map_class, words)
+        count_time = time.perf_counter() - start
+        start = time.perf_counter()
+        bulk_count(map_class, words)
+        bulk_time = time.perf_counter() - start
+        start = time.perf_counter()
+        lookup(filled, words)
+        lookup_time = time.perf_counter() - start
+        print(f'{map_class.__name__:>12} {count_time:>9.3f} {bulk_time:>12.3f} {lookup_time:>10.3f}')
@@ -0,0 +1,50 @@
+"""
+Бенчмарк памяти на элемент: map заполняется словарем сохраненных статей
+(дополненным до VOCABULARY_SIZE), память считается через tracemalloc.
+Ключи создаются до начала измерения, а значение у всех одно, поэтому
+учитывается только сама структура map.
+Словарь вставляется в перемешанном порядке (TreeMap при сортированной
+вставке упирается в предел рекурсии) и отдельно по возрастанию
+"""
+import time
+import random
+import tracemalloc
+from benchmarks.tree_benchmark import sorted_vocabulary
+from src.maps.avl_tree_map import AVLTreeMap
+from src.maps.hash_map import HashMap
+from src.maps.open_hash_map import OpenHashMap
+from src.maps.sorted_block_map import SortedBlockMap
+from src.maps.tree_map import TreeMap
+
+VOCABULARY_SIZE = 200_000
+
+
+def measure(map_type, words: list):
+    """
+    Заполняет map словами
+    :return: байт на элемент и время заполнения
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    filled = map_type()
+    for word in words:
+        filled[word] = 1
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del filled
+    return size / len(words), elapsed
+
+
+if __name__ == '__main__':
+    vocabulary = sorted_vocabulary(VOCABULARY_SIZE)
+    shuffled = vocabulary[:]
+    random.Random(0).shuffle(shuffled)
+    print(f'{len(vocabulary)} words (tracemalloc slows filling down)')
+    print(f'{"map":>15} {"order":>9} {"bytes/entry":>12} {"fill, s":>8}')
+    for map_class in (HashMap, OpenHashMap, TreeMap, AVLTreeMap, SortedBlockMap, dict):
+        for order, words in (('shuffled', shuffled), ('sorted', vocabulary)):
+            if map_class is TreeMap and order == 'sorted':
+                continue
+            per_entry, fill_time = measure(map_class, words)
+            print(f'{map_class.__name__:>15} {order:>9} {per_entry:>12.1f} {fill_time:>8.3f}')
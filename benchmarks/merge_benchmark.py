@@ -0,0 +1,67 @@
+"""
+Бенчмарк объединения файлов words.txt: files_merge против heap_files_merge
+, многопроходного hierarchical_files_merge и mapreduce_files_merge
+(процессов по числу CPU)
+"""
+import os
+import time
+import random
+import filecmp
+import tempfile
+from src.parser.file import file_reader, files_merge, heap_files_merge, hierarchical_files_merge, \
+    mapreduce_files_merge
+
+ARTICLES_DIRECTORY = os.path.join(os.path.dirname(__file__), '..', 'articles')
+INPUTS = (10, 100, 1000)
+WORDS_PER_FILE = 200
+
+
+def load_vocabulary(base_path: str = ARTICLES_DIRECTORY, limit: int = 5000) -> list:
+    """Собирает словарь из words.txt сохраненных статей"""
+    vocabulary = set()
+    for folder in sorted(os.listdir(base_path)):
+        for line in file_reader(os.path.join(base_path, folder, 'words.txt')):
+            vocabulary.add(line.split()[0])
+    return sorted(vocabulary)[:limit]
+
+
+def make_inputs(directory: str, vocabulary: list, count: int) -> list:
+    """Создает count отсортированных файлов вида words.txt из случайных слов словаря"""
+    rnd = random.Random(count)
+    filenames = []
+    for index in range(count):
+        words = sorted(rnd.sample(vocabulary, WORDS_PER_FILE))
+        filename = os.path.join(directory, f'{index}.txt')
+        with open(filename, 'w', encoding='utf8') as file:
+            for word in words:
+                file.write(f'{word} {rnd.randint(1, 20)}\n')
+        filenames.append(filename)
+    return filenames
+
+
+def measure(merge, filenames: list, result_path: str) -> float:
+    """Возвращает время работы функции объединения"""
+    start = time.perf_counter()
+    merge(*filenames, result_path=result_path)
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    vocab = load_vocabulary()
+    print(f'{"inputs":>8} {"files_merge":>12} {"heap_merge":>12} {"speedup":>8} {"fan_in_64":>10} {"mapreduce":>10}')
+    for inputs in INPUTS:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            files = make_inputs(tmp_dir, vocab, inputs)
+            old_path = os.path.join(tmp_dir, 'old.txt')
+            new_path = os.path.join(tmp_dir, 'new.txt')
+            tree_path = os.path.join(tmp_dir, 'tree.txt')
+            old_time = measure(files_merge, files, old_path)
+            new_time = measure(heap_files_merge, files, new_path)
+            tree_time = measure(hierarchical_files_merge, files, tree_path)
+            mapreduce_path = os.path.join(tmp_dir, 'mapreduce.txt')
+            mapreduce_time = measure(mapreduce_files_merge, files, mapreduce_path)
+            assert filecmp.cmp(old_path, new_path, shallow=False), 'results differ'
+            assert filecmp.cmp(old_path, tree_path, shallow=False), 'results differ'
+            assert filecmp.cmp(old_path, mapreduce_path, shallow=False), 'results differ'
+            print(f'{inputs:>8} {old_time:>12.3f} {new_time:>12.3f} '
+                  f'{old_time / new_time:>7.1f}x {tree_time:>10.3f} {mapreduce_time:>10.3f}')
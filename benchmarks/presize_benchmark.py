@@ -0,0 +1,53 @@
+"""
+Бенчмарк подсчета слов статей в HashMap без оценки размера и с оценкой
+по предыдущим статьям (как в save_article).
+Поток слов каждой статьи восстанавливается из ее words.txt
+"""
+import os
+import time
+import random
+from src.maps.hash_map import HashMap
+from src.parser.file import file_reader
+from src.parser.wiki import SizeEstimate
+
+ARTICLES_DIRECTORY = os.path.join(os.path.dirname(__file__), '..', 'articles')
+REPEATS = 5
+
+
+def article_tokens(base_path: str = ARTICLES_DIRECTORY) -> list:
+    """Возвращает перемешанные потоки слов всех сохраненных статей"""
+    articles = []
+    for folder in sorted(os.listdir(base_path)):
+        tokens = []
+        for line in file_reader(os.path.join(base_path, folder, 'words.txt')):
+            word, count = line.split()
+            tokens.extend([word] * int(count))
+        random.Random(0).shuffle(tokens)
+        articles.append(tokens)
+    return articles
+
+
+def count_articles(articles: list, estimate) -> float:
+    """
+    Подсчитывает слова каждой статьи в новой HashMap
+    :param estimate: SizeEstimate или None (без оценки размера)
+    :return: время в секундах
+    """
+    start = time.perf_counter()
+    for tokens in articles:
+        counter = HashMap()
+        if estimate is not None:
+            counter.reserve(estimate.value)
+        counter.bulk_add(tokens)
+        if estimate is not None:
+            estimate.update(len(counter))
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    texts = article_tokens()
+    print(f'{len(texts)} articles, {sum(map(len, texts))} tokens, best of {REPEATS}')
+    without_hint = min(count_articles(texts, None) for _ in range(REPEATS))
+    with_hint = min(count_articles(texts, SizeEstimate()) for _ in range(REPEATS))
+    print(f'no size hint:       {without_hint:.3f} s')
+    print(f'previous articles:  {with_hint:.3f} s')
@@ -0,0 +1,44 @@
+"""
+Бенчмарк задержки одной вставки: HashMap с постепенным переносом элементов
+против OpenHashMap, который перестраивает всю таблицу за одну вставку
+"""
+import gc
+import time
+from src.maps.hash_map import HashMap
+from src.maps.open_hash_map import OpenHashMap
+
+INSERTS = 500_000
+
+
+def insert_latencies(map_type) -> list:
+    """
+    Возвращает отсортированные времена каждой вставки в микросекундах
+    (сборщик мусора отключен, чтобы его паузы не смешивались с перестроениями)
+    """
+    gc.collect()
+    gc.disable()
+    counter = map_type()
+    clock = time.perf_counter_ns
+    latencies = []
+    for index in range(INSERTS):
+        key = f'слово{index}'
+        start = clock()
+        counter[key] = index
+        latencies.append(clock() - start)
+    gc.enable()
+    latencies.sort()
+    return [latency / 1000 for latency in latencies]
+
+
+def percentile(latencies: list, part: float) -> float:
+    """Возвращает перцентиль part (от 0 до 1) отсортированного списка"""
+    return latencies[min(int(part * len(latencies)), len(latencies) - 1)]
+
+
+if __name__ == '__main__':
+    print(f'{INSERTS} inserts, latency in microseconds')
+    print(f'{"map":>12} {"p50":>8} {"p99":>8} {"p99.9":>8} {"max":>10}')
+    for map_class in (HashMap, OpenHashMap):
+        times = insert_latencies(map_class)
+        print(f'{map_class.__name__:>12} {percentile(times, 0.5):>8.2f} '
+              f'{percentile(times, 0.99):>8.2f} {percentile(times, 0.999):>8.2f} {times[-1]:>10.1f}')
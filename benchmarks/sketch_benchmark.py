@@ -0,0 +1,58 @@
+"""
+Бенчмарк статистики корпуса: точный подсчет всех words.txt в одной HashMap
+против объединения сводок статей (Count-Min + HyperLogLog).
+Для каждого способа выводится время, пик памяти и размер словаря
+"""
+import os
+import time
+import shutil
+import tempfile
+import tracemalloc
+from src.maps.hash_map import HashMap
+from src.parser.file import file_reader
+from src.storage.sketches import SKETCH_FILENAME, add_article_sketches, corpus_sketch
+
+ARTICLES_DIRECTORY = os.path.join(os.path.dirname(__file__), '..', 'articles')
+
+
+def exact_counts(base_path: str) -> int:
+    """Подсчитывает слова всех статей в HashMap и возвращает размер словаря"""
+    counter = HashMap()
+    for folder in os.listdir(base_path):
+        for line in file_reader(os.path.join(base_path, folder, 'words.txt')):
+            word, count = line.split()
+            counter.increment(word, int(count))
+    return len(counter)
+
+
+def sketch_counts(base_path: str) -> int:
+    """Объединяет сводки статей и возвращает оценку размера словаря"""
+    return corpus_sketch(base_path).distinct()
+
+
+def measure(function, base_path: str):
+    """Возвращает результат функции, время и пик выделенной памяти"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function(base_path)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        articles_path = os.path.join(tmp_dir, 'articles')
+        shutil.copytree(ARTICLES_DIRECTORY, articles_path)
+        start = time.perf_counter()
+        written = add_article_sketches(articles_path)
+        print(f'{written} article sketches built in {time.perf_counter() - start:.3f} s')
+        words_size = sketch_size = 0
+        for folder in os.listdir(articles_path):
+            words_size += os.path.getsize(os.path.join(articles_path, folder, 'words.txt'))
+            sketch_size += os.path.getsize(os.path.join(articles_path, folder, SKETCH_FILENAME))
+        print(f'on disk: words.txt {words_size / 1024:.0f} KiB, sketch.bin {sketch_size / 1024:.0f} KiB')
+        for name, function in (('exact HashMap', exact_counts), ('merged sketches', sketch_counts)):
+            distinct, elapsed, peak = measure(function, articles_path)
+            print(f'{name:16} {elapsed:7.3f} s {peak / 2 ** 20:7.2f} MiB   distinct words: {distinct}')
@@ -0,0 +1,48 @@
+"""
+Бенчмарк разбиения статьи на слова: get_text + re.split против потокового iter_words.
+Сравнивается пиковая память (tracemalloc) и время на самой большой сохраненной статье
+"""
+import os
+import re
+import time
+import tracemalloc
+from src.parser.wiki import WORD_SPLITTERS, content_block, iter_words, read_content
+
+ARTICLES_DIRECTORY = os.path.join(os.path.dirname(__file__), '..', 'articles')
+
+
+def split_words(main_txt) -> int:
+    """Старый способ: весь текст статьи собирается в строку и разбивается в список"""
+    words = re.split(WORD_SPLITTERS, main_txt.get_text())
+    return sum(1 for word in words if word != '' and word.isalpha())
+
+
+def stream_words(main_txt) -> int:
+    """Новый способ: слова берутся из текстовых узлов по одному"""
+    return sum(1 for _ in iter_words(main_txt.strings))
+
+
+def measure(func, main_txt) -> tuple:
+    """
+    Возвращает результат, время и пиковую дополнительную память функции
+    (время измеряется отдельно, без tracemalloc)
+    """
+    start = time.perf_counter()
+    result = func(main_txt)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    func(main_txt)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+if __name__ == '__main__':
+    paths = [os.path.join(ARTICLES_DIRECTORY, folder, 'content.txt')
+             for folder in os.listdir(ARTICLES_DIRECTORY)]
+    largest = max(paths, key=os.path.getsize)
+    block = content_block(read_content(largest)[0])
+    print(f'{os.path.basename(os.path.dirname(largest))}: {len(block.get_text())} characters')
+    for name, function in (('get_text + re.split', split_words), ('iter_words', stream_words)):
+        words, seconds, peak_bytes = measure(function, block)
+        print(f'{name:>20}: {words} words, {seconds:.3f} s, peak {peak_bytes / 1024:.0f} KiB')
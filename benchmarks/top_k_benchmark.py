@@ -0,0 +1,57 @@
+"""
+Бенчмарк поиска 100 самых частых слов корпуса: полная сортировка HashMap
+по количеству против most_common (куча из k пар) и сводки Space-Saving
+с 10 * k счетчиками. Поток слов восстанавливается из words.txt
+"""
+import time
+import tracemalloc
+from src.maps.hash_map import HashMap
+from src.maps.space_saving import SpaceSaving
+from benchmarks.presize_benchmark import article_tokens
+
+TOP = 100
+CAPACITY = 10 * TOP
+
+
+def timed(function, *args):
+    """Возвращает результат функции, время и пик выделенной памяти"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def count_and_sort(tokens: list) -> list:
+    """Подсчет в HashMap и сортировка всех пар по количеству"""
+    counter = HashMap()
+    counter.bulk_add(tokens)
+    return sorted(counter, key=lambda pair: (-pair[1], pair[0]))[:TOP]
+
+
+def count_and_select(tokens: list) -> list:
+    """Подсчет в HashMap и most_common"""
+    counter = HashMap()
+    counter.bulk_add(tokens)
+    return counter.most_common(TOP)
+
+
+def space_saving(tokens: list) -> list:
+    """Сводка Space-Saving вместо полного подсчета"""
+    summary = SpaceSaving(CAPACITY)
+    summary.bulk_add(tokens)
+    return summary.most_common(TOP)
+
+
+if __name__ == '__main__':
+    stream = [word for tokens in article_tokens() for word in tokens]
+    print(f'{len(stream)} tokens, top {TOP}')
+    expected = None
+    for name, function in (('HashMap + sort', count_and_sort), ('HashMap + most_common', count_and_select),
+                           (f'SpaceSaving({CAPACITY})', space_saving)):
+        top, elapsed, peak = timed(function, stream)
+        expected = expected or {word for word, _ in top}
+        found = len(expected & {word for word, _ in top})
+        print(f'{name:24} {elapsed:7.3f} s {peak / 2 ** 20:8.2f} MiB   {found}/{TOP} of exact top')
@@ -0,0 +1,42 @@
+"""
+Бенчмарк обновления общих количеств слов после добавления одной статьи:
+полное объединение всех words.txt (files_merge и mapreduce_files_merge)
+против инкрементального refresh_totals
+"""
+import os
+import time
+import shutil
+import tempfile
+from src.parser.file import files_merge, mapreduce_files_merge
+from src.storage.totals import refresh_totals
+
+ARTICLES_DIRECTORY = os.path.join(os.path.dirname(__file__), '..', 'articles')
+
+
+def words_files(base_path: str) -> list:
+    """Возвращает пути ко всем words.txt"""
+    return [os.path.join(base_path, folder, 'words.txt') for folder in sorted(os.listdir(base_path))]
+
+
+if __name__ == '__main__':
+    folders = sorted(os.listdir(ARTICLES_DIRECTORY))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        articles_path = os.path.join(tmp_dir, 'articles')
+        totals_path = os.path.join(tmp_dir, 'totals')
+        for folder in folders[:-1]:
+            shutil.copytree(os.path.join(ARTICLES_DIRECTORY, folder), os.path.join(articles_path, folder))
+        start = time.perf_counter()
+        refresh_totals(articles_path, totals_path)
+        print(f'initial totals of {len(folders) - 1} articles: {time.perf_counter() - start:.3f} s')
+
+        shutil.copytree(os.path.join(ARTICLES_DIRECTORY, folders[-1]), os.path.join(articles_path, folders[-1]))
+        result_path = os.path.join(tmp_dir, 'res.txt')
+        start = time.perf_counter()
+        files_merge(*words_files(articles_path), result_path=result_path)
+        print(f'one new article, files_merge:           {time.perf_counter() - start:.3f} s')
+        start = time.perf_counter()
+        mapreduce_files_merge(*words_files(articles_path), result_path=result_path, workers=1)
+        print(f'one new article, mapreduce_files_merge: {time.perf_counter() - start:.3f} s')
+        start = time.perf_counter()
+        refresh_totals(articles_path, totals_path)
+        print(f'one new article, refresh_totals:        {time.perf_counter() - start:.3f} s')
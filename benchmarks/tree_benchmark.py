@@ -0,0 +1,65 @@
+"""
+Бенчмарк деревьев на отсортированном словаре (в таком порядке слова лежат в words.txt).
+Словарь сохраненных статей дополняется словами с числовыми суффиксами до VOCABULARY_SIZE.
+TreeMap вырождается в список, поэтому вставка в него останавливается на RecursionError.
+Поиск по префиксу в AVLTreeMap сравнивается с фильтрацией всего словаря
+"""
+import time
+from benchmarks.map_benchmark import load_tokens
+from src.maps.avl_tree_map import AVLTreeMap
+from src.maps.tree_map import TreeMap
+
+VOCABULARY_SIZE = 200_000
+
+
+def sorted_vocabulary(size: int = VOCABULARY_SIZE) -> list:
+    """Возвращает size различных слов в отсортированном порядке"""
+    words = sorted(set(load_tokens()))
+    vocabulary = set(words)
+    suffix = 0
+    while len(vocabulary) < size:
+        vocabulary.update(f'{word}{suffix}' for word in words[:size - len(vocabulary)])
+        suffix += 1
+    return sorted(vocabulary)
+
+
+def fill(map_type, vocabulary: list):
+    """
+    Вставляет слова по порядку
+    :return: map и количество вставленных слов до RecursionError
+    """
+    tree = map_type()
+    inserted = 0
+    try:
+        for index, word in enumerate(vocabulary):
+            tree[word] = index
+            inserted += 1
+    except RecursionError:
+        pass
+    return tree, inserted
+
+
+if __name__ == '__main__':
+    words = sorted_vocabulary()
+    print(f'{len(words)} sorted words')
+    print(f'{"map":>12} {"inserted":>9} {"insert, s":>10} {"lookup, s":>10} {"height":>7}')
+    for tree_class in (TreeMap, AVLTreeMap):
+        start = time.perf_counter()
+        filled, count = fill(tree_class, words)
+        insert_time = time.perf_counter() - start
+        start = time.perf_counter()
+        for word in words[:count]:
+            filled.get(word)
+        lookup_time = time.perf_counter() - start
+        height = filled.height() if isinstance(filled, AVLTreeMap) else count
+        print(f'{tree_class.__name__:>12} {count:>9} {insert_time:>10.3f} {lookup_time:>10.3f} {height:>7}')
+
+    prefixes = sorted({word[:3] for word in words[::1000]})
+    start = time.perf_counter()
+    tree_found = sum(1 for prefix in prefixes for _ in filled.prefix_items(prefix))
+    tree_time = time.perf_counter() - start
+    start = time.perf_counter()
+    scan_found = sum(1 for prefix in prefixes for word in words if word.startswith(prefix))
+    scan_time = time.perf_counter() - start
+    assert tree_found == scan_found
+    print(f'{len(prefixes)} prefix queries: prefix_items {tree_time:.3f} s, full scan {scan_time:.3f} s')
@@ -0,0 +1,88 @@
+"""
+Бенчмарк общего словаря: память на счетчики всех статей сразу (HashMap со строками,
+HashMap с общими экземплярами строк, массивы id + словарь) и время объединения
+words.txt (heap_files_merge, через словарь, по готовым words.ids)
+"""
+import os
+import time
+import shutil
+import tempfile
+import tracemalloc
+from src.maps.hash_map import HashMap
+from src.parser.file import file_reader, heap_files_merge
+from src.storage.vocabulary import (VOCABULARY_FILENAME, Vocabulary, encode_articles, merge_encoded,
+                                    read_words, vocabulary_files_merge)
+
+ARTICLES_DIRECTORY = os.path.join(os.path.dirname(__file__), '..', 'articles')
+REPEATS = 5
+
+
+def string_maps(filenames: list) -> list:
+    """Счетчики статей в HashMap, у каждой статьи свои строки"""
+    maps = []
+    for filename in filenames:
+        counter = HashMap()
+        for line in file_reader(filename):
+            word, count = line.split()
+            counter[word] = int(count)
+        maps.append(counter)
+    return maps
+
+
+def interned_maps(filenames: list) -> list:
+    """Счетчики статей в HashMap, одинаковые слова - один объект из словаря"""
+    vocabulary = Vocabulary()
+    maps = []
+    for filename in filenames:
+        counter = HashMap()
+        for line in file_reader(filename):
+            word, count = line.split()
+            counter[vocabulary.word(vocabulary.add(word))] = int(count)
+        maps.append(counter)
+    return [vocabulary, maps]
+
+
+def id_arrays(filenames: list) -> list:
+    """Счетчики статей в массивах id и количеств"""
+    vocabulary = Vocabulary()
+    return [vocabulary, [read_words(filename, vocabulary) for filename in filenames]]
+
+
+def retained(function, filenames: list) -> int:
+    """Возвращает, сколько памяти занимает результат функции"""
+    tracemalloc.start()
+    result = function(filenames)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current
+
+
+def best_time(function, *args, **kwargs) -> float:
+    """Лучшее время из REPEATS запусков"""
+    times = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        function(*args, **kwargs)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+if __name__ == '__main__':
+    folders = sorted(os.listdir(ARTICLES_DIRECTORY))
+    filenames = [os.path.join(ARTICLES_DIRECTORY, folder, 'words.txt') for folder in folders]
+    print(f'{len(filenames)} articles')
+    for name, function in (('HashMap, own strings', string_maps), ('HashMap, interned', interned_maps),
+                           ('id arrays + vocabulary', id_arrays)):
+        print(f'{name:24} {retained(function, filenames) / 2 ** 20:7.2f} MiB')
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        articles_path = os.path.join(tmp_dir, 'articles')
+        shutil.copytree(ARTICLES_DIRECTORY, articles_path)
+        vocabulary_path = os.path.join(tmp_dir, VOCABULARY_FILENAME)
+        encode_articles(articles_path, vocabulary_path)
+        result_path = os.path.join(tmp_dir, 'res.txt')
+        print(f'merge, heap_files_merge:   {best_time(heap_files_merge, *filenames, result_path=result_path):.3f} s')
+        print(f'merge, via vocabulary:     '
+              f'{best_time(vocabulary_files_merge, *filenames, result_path=result_path):.3f} s')
+        print(f'merge, encoded words.ids:  {best_time(merge_encoded, articles_path, vocabulary_path, result_path):.3f} s')
@@ -2,3 +2,7 @@ from src.maps import base_map
 from src.maps import hash_map
 from src.maps import linked_list
 from src.maps import tree_map
+from src.maps import open_hash_map
+from src.maps import avl_tree_map
+from src.maps import sorted_block_map
+from src.maps import space_saving
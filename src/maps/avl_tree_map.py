@@ -0,0 +1,245 @@
+"""
+AVL-дерево.
+Сбалансированный вариант TreeMap: высоты левого и правого поддеревьев
+любого узла отличаются не более чем на 1, поэтому глубина дерева O(log n)
+даже при вставке отсортированных ключей (как в words.txt).
+Вставка, поиск и удаление выполняются без рекурсии.
+Размеры поддеревьев позволяют находить порядковые статистики (rank/select) за O(log n)
+"""
+from typing import Tuple
+from src.maps.tree_map import Node, TreeMap
+
+
+class AVLNode(Node):
+    """
+    Узел AVLTreeMap.
+    Помимо ключа, значения и ссылок на детей хранит высоту и размер своего поддерева
+    """
+    def __init__(self, key, value, left=None, right=None):
+        super().__init__(key, value, left, right)
+        self.height = 1
+        self.size = 1
+
+
+def _height(node) -> int:
+    """Возвращает высоту поддерева (0 для пустого)"""
+    return node.height if node is not None else 0
+
+
+def _size(node) -> int:
+    """Возвращает количество узлов поддерева (0 для пустого)"""
+    return node.size if node is not None else 0
+
+
+def _update(node: AVLNode) -> None:
+    """Пересчитывает высоту и размер узла по детям"""
+    left, right = node.left, node.right
+    left_height = left.height if left is not None else 0
+    right_height = right.height if right is not None else 0
+    node.height = (left_height if left_height > right_height else right_height) + 1
+    node.size = (left.size if left is not None else 0) + (right.size if right is not None else 0) + 1
+
+
+def _rotate_left(node: AVLNode) -> AVLNode:
+    """
+    Левый поворот: правый ребенок становится корнем поддерева
+    :return: новый корень поддерева
+    """
+    pivot = node.right
+    node.right = pivot.left
+    pivot.left = node
+    _update(node)
+    _update(pivot)
+    return pivot
+
+
+def _rotate_right(node: AVLNode) -> AVLNode:
+    """
+    Правый поворот: левый ребенок становится корнем поддерева
+    :return: новый корень поддерева
+    """
+    pivot = node.left
+    node.left = pivot.right
+    pivot.right = node
+    _update(node)
+    _update(pivot)
+    return pivot
+
+
+def _balance(node: AVLNode) -> AVLNode:
+    """
+    Пересчитывает высоту узла и при необходимости восстанавливает баланс поворотами
+    :return: новый корень поддерева
+    """
+    _update(node)
+    balance = _height(node.left) - _height(node.right)
+    if balance > 1:
+        if _height(node.left.left) < _height(node.left.right):  # левый-правый случай
+            node.left = _rotate_left(node.left)
+        return _rotate_right(node)
+    if balance < -1:
+        if _height(node.right.right) < _height(node.right.left):  # правый-левый случай
+            node.right = _rotate_right(node.right)
+        return _rotate_left(node)
+    return node
+
+
+class AVLTreeMap(TreeMap):
+    """
+    Сбалансированное (AVL) Binary Search Tree
+    """
+    NODE_TYPE = AVLNode
+
+    def _built(self, node: AVLNode) -> None:
+        """Пересчитывает высоту и размер узла, построенного из отсортированных пар"""
+        _update(node)
+
+    def _find(self, key):
+        """Возвращает узел с ключом или None"""
+        node = self.root
+        while node is not None:
+            if key > node.key:
+                node = node.right
+            elif key < node.key:
+                node = node.left
+            else:  # key == node.key
+                return node
+        return None
+
+    def __getitem__(self, key):
+        node = self._find(key)
+        if node is None:
+            raise KeyError('Such key does not exist')
+        return node.value
+
+    def get(self, key, default=None):
+        """Возвращает значение по ключу, если ключ существует, в противном случае по умолчанию"""
+        node = self._find(key)
+        return default if node is None else node.value
+
+    def __contains__(self, key) -> bool:
+        return self._find(key) is not None
+
+    def _rebuild(self, path: list, child) -> None:
+        """
+        Поднимается от child к корню по пути спуска, подвешивая поддеревья
+        к родителям и восстанавливая баланс
+        :param path: список пар (узел, спуск был направо)
+        :param child: новый корень поддерева под последним узлом пути
+        """
+        while path:
+            parent, is_right = path.pop()
+            if is_right:
+                parent.right = child
+            else:
+                parent.left = child
+            child = _balance(parent)
+        self.root = child
+
+    def _store(self, key, value, add: bool):
+        """
+        Записывает value по ключу (или прибавляет его, если add) за один спуск по дереву
+        :return: новое значение
+        """
+        path = []
+        node = self.root
+        while node is not None:
+            if key > node.key:
+                path.append((node, True))
+                node = node.right
+            elif key < node.key:
+                path.append((node, False))
+                node = node.left
+            else:  # key == node.key
+                if add:
+                    value += node.value
+                node.value = value
+                return value
+        self._size += 1
+        self._rebuild(path, AVLNode(key, value))
+        return value
+
+    def __setitem__(self, key, value):
+        self._store(key, value, False)
+
+    def increment(self, key, n=1) -> int:
+        """
+        Увеличивает значение по ключу на n (если ключа нет, значение считается 0)
+        за один спуск по дереву
+        :return: новое значение
+        """
+        return self._store(key, n, True)
+
+    def __delitem__(self, key):
+        path = []
+        node = self.root
+        while node is not None and key != node.key:
+            is_right = key > node.key
+            path.append((node, is_right))
+            node = node.right if is_right else node.left
+        if node is None:
+            raise KeyError('Such key does not exist')
+
+        if node.left is not None and node.right is not None:  # два ребенка
+            # k,v узла заменяются на k,v наименьшего ключа в правом дереве, удаляется он
+            path.append((node, True))
+            successor = node.right
+            while successor.left is not None:
+                path.append((successor, False))
+                successor = successor.left
+            node.key = successor.key
+            node.value = successor.value
+            node = successor
+        self._size -= 1
+        self._rebuild(path, node.left if node.left is not None else node.right)
+
+    def popitem(self):
+        """Удаляет и возвращает пару с наибольшим ключом, баланс сохраняется"""
+        if self.root is None:
+            raise KeyError('popitem(): map is empty')
+        node = self.root
+        while node.right is not None:
+            node = node.right
+        key, value = node.key, node.value
+        del self[key]
+        return key, value
+
+    def height(self) -> int:
+        """
+        Возвращает высоту дерева
+        :return: int
+        """
+        return _height(self.root)
+
+    def rank(self, key) -> int:
+        """
+        Считает ключи меньше key
+        :return: int (позиция key в отсортированном порядке, если он есть)
+        """
+        rank = 0
+        node = self.root
+        while node is not None:
+            if node.key < key:
+                rank += _size(node.left) + 1
+                node = node.right
+            else:
+                node = node.left
+        return rank
+
+    def select(self, index: int) -> Tuple[str, int]:
+        """
+        Находит пару с index-м по возрастанию ключом (с нуля)
+        :return: пара k, v
+        """
+        if not 0 <= index < _size(self.root):
+            raise IndexError('Index out of range')
+        node = self.root
+        while True:
+            left_size = _size(node.left)
+            if index < left_size:
+                node = node.left
+            elif index > left_size:
+                index -= left_size + 1
+                node = node.right
+            else:
+                return node.key, node.value
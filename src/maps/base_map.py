@@ -1,14 +1,37 @@
 """
 Модуль для правильного создания map
 """
+import heapq
 from abc import ABC, abstractmethod
-from typing import Iterable, Tuple
+from typing import Iterable, Iterator, List, Tuple
+from src.storage.block_io import BlockWriter, block_reader, count_lines
+
+_MISSING = object()  # значение по умолчанию, которое не может быть в map
+
+
+def _count_order(pair: Tuple[str, int]) -> Tuple[int, str]:
+    """Ключ сортировки пар по убыванию значения, затем по возрастанию ключа"""
+    return -pair[1], pair[0]
+
+
+def _read_pairs(path: str) -> Iterator[Tuple[str, object]]:
+    """Итерация по парам k, v файла map; числовые значения преобразуются в int"""
+    for lines in block_reader(path):
+        for line in lines:
+            key, value = line.split()
+            try:
+                value = int(value)
+            except ValueError:
+                pass
+            yield key, value
 
 
 class BaseMap(ABC):
     """
     Класс для карт с абстрактными методами и некоторым универсальным методом для всех maps
     """
+    __slots__ = ()
+
     @abstractmethod
     def __getitem__(self, key: str) -> int:
         ...
@@ -35,11 +58,9 @@ class BaseMap(ABC):
     def __eq__(self, other: 'BaseMap') -> bool:
         if len(self) != len(other):
             return False
+        get = other.get
         for key, value in self:
-            try:
-                if value != other[key]:
-                    return False
-            except KeyError:
+            if get(key, _MISSING) != value:
                 return False
         return True
 
@@ -53,6 +74,22 @@ class BaseMap(ABC):
         """Возвращает итерацию с кортежами k, v"""
         yield from self
 
+    def sorted_items(self) -> Iterable[Tuple[str, int]]:
+        """Возвращает пары k, v в порядке возрастания ключей"""
+        return iter(sorted(self, key=lambda elem: elem[0]))
+
+    def most_common(self, k: int = None) -> List[Tuple[str, int]]:
+        """
+        Возвращает k пар с наибольшими значениями (самые частые слова) по убыванию значений,
+        при равных значениях - по возрастанию ключей. Используется куча размера k,
+        поэтому map не копируется и не сортируется целиком
+        :param k: количество пар (None - все пары)
+        :return: список пар k, v
+        """
+        if k is None:
+            return sorted(self, key=_count_order)
+        return heapq.nsmallest(k, self, key=_count_order)
+
     def values(self) -> Iterable[int]:
         """Возвращает итерацию, выполненную из значений карты"""
         return (value for key, value in self)
@@ -65,20 +102,35 @@ class BaseMap(ABC):
     def fromkeys(cls, iterable, value=None) -> 'BaseMap':
         """Создает новую map с ключами из iterable и значениями"""
         res_map = cls()
+        if hasattr(iterable, '__len__'):
+            res_map.reserve(len(iterable))
         for key in iterable:
             res_map[key] = value
         return res_map
 
+    def reserve(self, size: int) -> None:
+        """
+        Готовит map к хранению size элементов, чтобы вставки не перестраивали ее.
+        Реализации без перестроений (деревья) ничего не делают
+        """
+
     def update(self, other=None) -> None:
-        """Обновляет значения по ключам и значениям из other"""
+        """
+        Обновляет значения по ключам и значениям из other.
+        Если размер other известен, место выделяется заранее один раз
+        """
         if other is None:
             return
-        if hasattr(other, "keys"):
-            for key in other.keys():
-                self[key] = other[key]
+        if hasattr(other, '__len__'):
+            self.reserve(len(self) + len(other))
+        if hasattr(other, 'items'):
+            pairs = other.items()
+        elif hasattr(other, 'keys'):
+            pairs = ((key, other[key]) for key in other.keys())
         else:
-            for key, value in other:
-                self[key] = value
+            pairs = other
+        for key, value in pairs:
+            self[key] = value
 
     def get(self, key, default=None) -> int:
         """Возвращает значение по ключу, если ключ существует, в противном случае по умолчанию"""
@@ -103,14 +155,14 @@ class BaseMap(ABC):
             return default
 
     def popitem(self):
-        """Удаляет и возвращает последнюю пару (ключ, значение) в виде 2-кортежа"""
-        to_del_key = 0
-        to_del_value = 0
+        """
+        Удаляет и возвращает пару (ключ, значение) в виде 2-кортежа.
+        Какая пара удаляется, определяет реализация; по умолчанию - первая при итерации
+        """
         for key, value in self:
-            to_del_key = key
-            to_del_value = value
-        del self[to_del_key]
-        return to_del_key, to_del_value
+            del self[key]
+            return key, value
+        raise KeyError('popitem(): map is empty')
 
     def setdefault(self, key, default=None):
         """
@@ -122,6 +174,31 @@ class BaseMap(ABC):
         self[key] = default
         return default
 
+    def increment(self, key, n=1) -> int:
+        """
+        Увеличивает значение по ключу на n (если ключа нет, значение считается 0)
+        :return: новое значение
+        """
+        value = self.get(key, 0) + n
+        self[key] = value
+        return value
+
+    def bulk_add(self, iterable) -> None:
+        """Увеличивает на 1 значение каждого ключа из iterable (подсчет слов)"""
+        increment = self.increment
+        for key in iterable:
+            increment(key)
+
+    def merge_counts(self, other) -> None:
+        """
+        Прибавляет значения other (map или dict) к значениям по тем же ключам.
+        Резервируется место под большую из двух map (ключи обычно пересекаются)
+        """
+        self.reserve(max(len(self), len(other)))
+        increment = self.increment
+        for key, value in other.items():
+            increment(key, value)
+
     def sum(self):
         """Возвращает сумму значений"""
         return sum(value for key, value in self)
@@ -133,18 +210,17 @@ class BaseMap(ABC):
 
     def write(self, path: str, mode='a') -> None:
         """Записывает map в файл"""
-        with open(path, mode, encoding='utf8') as file:
-            for key, value in self:
-                file.write(f'{key} {value}\n')
+        with BlockWriter(path, mode) as writer:
+            writer.write_pairs(self)
 
     @classmethod
     def read(cls, path: str) -> 'BaseMap':
-        """Считывает map из файла"""
+        """
+        Считывает map из файла. Место под все строки выделяется заранее,
+        числовые значения (счетчики слов) преобразуются в int
+        """
         my_obj = cls()
-        with open(path, 'r', encoding='utf8') as file:
-            line = file.readline()
-            while line != '':
-                key, value = line.split()
-                my_obj[key] = value
-                line = file.readline()
+        my_obj.reserve(count_lines(path))
+        for key, value in _read_pairs(path):
+            my_obj[key] = value
         return my_obj
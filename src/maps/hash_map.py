@@ -11,77 +11,257 @@ from src.maps.base_map import BaseMap
 
 class HashMap(BaseMap):
     """
-    Класс структуры данных Hashmap
+    Класс структуры данных Hashmap.
+    Размер inner list - степень двойки, индекс корзины - hash & (capacity - 1),
+    hash каждого ключа хранится в узле и не пересчитывается.
+    Изменение размера постепенное: новый inner list создается сразу, а элементы
+    старого переносятся по MIGRATE_STEP корзин при каждом изменении map,
+    поэтому ни одна вставка не перестраивает всю таблицу
     """
-    def __init__(self, _capacity=10):
-        self._inner_list = [None] * _capacity
-        self._capacity = _capacity
+    MIN_CAPACITY = 8
+    MAX_LOAD = 0.7  # расширение списка при заполнении более чем на 70%
+    MIN_LOAD = 0.125  # уменьшение списка при заполнении менее чем на 12.5%
+    MIGRATE_STEP = 8  # сколько корзин старого списка переносится за одно изменение
+
+    def __init__(self, _capacity=10, expected_size=0):
+        """
+        :param _capacity: начальный размер inner list
+        :param expected_size: ожидаемое количество элементов, inner list сразу
+        создается такого размера, чтобы они поместились без расширений
+        """
+        self._initial_capacity = max(self._round_capacity(_capacity), self._capacity_for(expected_size))
+        self._reset(self._initial_capacity)
+
+    @classmethod
+    def _capacity_for(cls, size: int) -> int:
+        """Возвращает наименьший размер inner list, в который size элементов помещаются без расширения"""
+        capacity = cls.MIN_CAPACITY
+        while capacity * cls.MAX_LOAD <= size:
+            capacity *= 2
+        return capacity
+
+    @classmethod
+    def _round_capacity(cls, capacity: int) -> int:
+        """Округляет capacity вверх до степени двойки"""
+        result = cls.MIN_CAPACITY
+        while result < capacity:
+            result *= 2
+        return result
+
+    def _reset(self, capacity: int) -> None:
+        """Создает пустой inner list размера capacity"""
+        self._inner_list = [None] * capacity
+        self._capacity = capacity
+        self._mask = capacity - 1
         self._size = 0
+        self._old_list = None  # inner list, элементы которого еще переносятся
+        self._old_mask = 0
+        self._migrated = 0  # сколько корзин старого списка уже перенесено
+        self._pop_index = capacity - 1  # с какой корзины popitem начинает поиск
+
+    @staticmethod
+    def _find_in(inner_list: list, index: int, key, key_hash: int):
+        """Ищет узел с ключом в корзине index списка inner_list"""
+        bucket = inner_list[index]
+        if bucket is not None:
+            node = bucket.head
+            while node is not None:
+                if node.hash_ == key_hash and (node.key is key or node.key == key):
+                    return node
+                node = node.next_
+        return None
+
+    def _find(self, key, key_hash: int):
+        """Ищет узел с ключом в новом и, если идет перенос, в старом списке"""
+        node = self._find_in(self._inner_list, key_hash & self._mask, key, key_hash)
+        if node is None and self._old_list is not None:
+            node = self._find_in(self._old_list, key_hash & self._old_mask, key, key_hash)
+        return node
 
     def __getitem__(self, key):
-        hashed_key = hash(key) % self._capacity
-        if self._inner_list[hashed_key] is not None:
-            for node_key, node_value in self._inner_list[hashed_key]:
-                if node_key == key:
-                    return node_value
-        raise KeyError('Such key does not exists')
+        node = self._find(key, hash(key))
+        if node is None:
+            raise KeyError('Such key does not exists')
+        return node.value
+
+    def get(self, key, default=None):
+        """Возвращает значение по ключу, если ключ существует, в противном случае по умолчанию"""
+        node = self._find(key, hash(key))
+        return default if node is None else node.value
+
+    def __contains__(self, key) -> bool:
+        return self._find(key, hash(key)) is not None
 
     def __setitem__(self, key, value):
-        hashed_key = hash(key) % self._capacity
-        if self._inner_list[hashed_key] is not None:
-            to_add = True
-            for node_key, node_value in self._inner_list[hashed_key]:
-                if node_key == key:
-                    self._inner_list[hashed_key].set_data(key, value)
-                    self._size -= 1  # когда ключ существует, _size не должен увеличиваться
-                    to_add = False
-                    break
-            if to_add:
-                self._inner_list[hashed_key].add_data(key, value)
+        if self._old_list is not None:
+            self._migrate(self.MIGRATE_STEP)
+        key_hash = hash(key)
+        node = self._find(key, key_hash)
+        if node is not None:  # когда ключ существует, _size не должен увеличиваться
+            node.value = value
+            return
+
+        self._insert(key, value, key_hash)
+
+    def _insert(self, key, value, key_hash: int) -> None:
+        """Добавляет новый ключ в новый inner list"""
+        index = key_hash & self._mask
+        if self._inner_list[index] is not None:
+            self._inner_list[index].add_data(key, value, key_hash)
         else:
-            self._inner_list[hashed_key] = LinkedList(LinkedElem(key, value))
+            self._inner_list[index] = LinkedList(LinkedElem(key, value, hash_=key_hash))
         self._size += 1
 
-        if self._size >= 0.7 * self._capacity:  # расширение списка при заполнении более чем на 70%
-            self._capacity *= 2
-            new_inner_list = [None] * self._capacity
-            for elem in self._inner_list:
-                if elem is not None:
-                    for node_key, node_value in elem:
-                        hashed_key = hash(node_key) % self._capacity
-                        if new_inner_list[hashed_key] is not None:
-                            new_inner_list[hashed_key].add_data(node_key, node_value)
-                        else:
-                            new_inner_list[hashed_key] \
-                                = LinkedList(LinkedElem(node_key, node_value))
-            self._inner_list = new_inner_list
+        if self._size >= self.MAX_LOAD * self._capacity:
+            self._start_resize(self._capacity * 2)
+
+    def _increment(self, key, key_hash: int, n) -> int:
+        """Увеличивает значение ключа с известным hash за один поиск"""
+        if self._old_list is not None:
+            self._migrate(self.MIGRATE_STEP)
+        node = self._find(key, key_hash)
+        if node is not None:
+            node.value += n
+            return node.value
+        self._insert(key, n, key_hash)
+        return n
+
+    def increment(self, key, n=1) -> int:
+        """
+        Увеличивает значение по ключу на n (если ключа нет, значение считается 0)
+        за один поиск корзины
+        :return: новое значение
+        """
+        return self._increment(key, hash(key), n)
+
+    def merge_counts(self, other) -> None:
+        """
+        Прибавляет значения other к значениям по тем же ключам.
+        Если other - HashMap, используются сохраненные в нем hash ключей
+        """
+        if not isinstance(other, HashMap):
+            super().merge_counts(other)
+            return
+        self.reserve(max(self._size, other._size))
+        for elem in other._buckets():
+            node = elem.head
+            while node is not None:
+                self._increment(node.key, node.hash_, node.value)
+                node = node.next_
 
     def __delitem__(self, key):
-        hashed_key = hash(key) % self._capacity
-        if self._inner_list[hashed_key] is not None:
-            self._inner_list[hashed_key].del_first_by_key(key)
-            self._size -= 1
-        else:
-            raise KeyError
+        if self._old_list is not None:
+            self._migrate(self.MIGRATE_STEP)
+        key_hash = hash(key)
+        if not self._remove_from(self._inner_list, key_hash & self._mask, key, key_hash) \
+                and (self._old_list is None or not self._remove_from(
+                    self._old_list, key_hash & self._old_mask, key, key_hash)):
+            raise KeyError('Such key does not exists')
+        self._size -= 1
+
+        # список не уменьшается меньше начального размера (или размера из reserve)
+        if self._capacity > self._initial_capacity and self._size <= self.MIN_LOAD * self._capacity:
+            self._start_resize(self._capacity // 2)
+
+    @staticmethod
+    def _remove_from(inner_list: list, index: int, key, key_hash: int) -> bool:
+        """Удаляет ключ из корзины index списка inner_list, пустая корзина освобождается"""
+        bucket = inner_list[index]
+        if bucket is None or not bucket.remove(key, key_hash):
+            return False
+        if bucket.head is None:
+            inner_list[index] = None
+        return True
+
+    def _start_resize(self, capacity: int) -> None:
+        """
+        Начинает перенос элементов в новый inner list размера capacity.
+        Порог расширения (70%) и уменьшения (12.5%) далеко друг от друга:
+        после расширения заполнение 35%, после уменьшения 25%, поэтому
+        чередование вставок и удалений у порога не вызывает новых перестроений
+        """
+        if self._old_list is not None:  # предыдущий перенос нужно закончить
+            self._migrate(len(self._old_list))
+        self._old_list = self._inner_list
+        self._old_mask = self._mask
+        self._migrated = 0
+        self._inner_list = [None] * capacity
+        self._capacity = capacity
+        self._mask = capacity - 1
+        self._pop_index = capacity - 1
 
-        if self._size <= 0.3 * self._capacity:  # уменьшение списка при заполнении менее чем на 30%
-            self._capacity //= 2
-            new_inner_list = [None] * self._capacity
-            for elem in self._inner_list:
+    def _migrate(self, steps: int) -> None:
+        """Переносит следующие steps корзин старого списка в новый, узлы переиспользуются"""
+        old_list = self._old_list
+        inner_list = self._inner_list
+        mask = self._mask
+        end = min(self._migrated + steps, len(old_list))
+        for old_index in range(self._migrated, end):
+            bucket = old_list[old_index]
+            if bucket is None:
+                continue
+            node = bucket.head
+            while node is not None:
+                next_node = node.next_
+                index = node.hash_ & mask
+                if inner_list[index] is not None:
+                    inner_list[index].add_node(node)
+                else:
+                    node.next_ = None
+                    inner_list[index] = LinkedList(node)
+                node = next_node
+            old_list[old_index] = None
+        self._migrated = end
+        if end == len(old_list):
+            self._old_list = None
+
+    def reserve(self, size: int) -> None:
+        """
+        Расширяет inner list сразу до размера, при котором size элементов
+        помещаются без расширений (перенос элементов выполняется целиком).
+        Этот размер запоминается: clear() возвращается к нему, а не к начальному
+        """
+        capacity = self._capacity_for(size)
+        if capacity > self._initial_capacity:
+            self._initial_capacity = capacity
+        if capacity > self._capacity:
+            self._start_resize(capacity)
+            self._migrate(len(self._old_list))
+
+    def popitem(self):
+        """
+        Удаляет и возвращает пару (ключ, значение) из последней непустой корзины.
+        Поиск продолжается с корзины, найденной прошлым вызовом, поэтому
+        опустошение map через popitem занимает линейное время
+        """
+        if not self._size:
+            raise KeyError('popitem(): map is empty')
+        if self._old_list is not None:
+            self._migrate(len(self._old_list))
+        inner_list = self._inner_list
+        mask = self._mask
+        index = self._pop_index
+        while inner_list[index] is None:
+            index = (index - 1) & mask
+        self._pop_index = index
+        node = inner_list[index].head
+        key, value = node.key, node.value
+        del self[key]
+        return key, value
+
+    def _buckets(self):
+        """Возвращает непустые корзины нового и старого списков"""
+        for inner_list in (self._inner_list, self._old_list or ()):
+            for elem in inner_list:
                 if elem is not None:
-                    for node_key, node_value in elem:
-                        hashed_key = hash(node_key) % self._capacity
-                        if new_inner_list[hashed_key] is not None:
-                            new_inner_list[hashed_key].add_data(node_key, node_value)
-                        else:
-                            new_inner_list[hashed_key] \
-                                = LinkedList(LinkedElem(node_key, node_value))
-            self._inner_list = new_inner_list
+                    yield elem
 
     def __iter__(self):
-        for elem in self._inner_list:
-            if elem is not None:
-                yield from elem or []
+        for elem in self._buckets():
+            node = elem.head
+            while node is not None:
+                yield node.key, node.value
+                node = node.next_
 
     def __str__(self):
         string = ', '.join(f'{key}: {value}' for key, value in self)
@@ -100,10 +280,8 @@ class HashMap(BaseMap):
         return sorted(self, key=lambda elem: elem[0], reverse=reverse)
 
     def clear(self):
-        """Очищает Hashmap"""
-        self._capacity = 10
-        self._inner_list = [None] * self._capacity
-        self._size = 0
+        """Очищает Hashmap, размер inner list возвращается к начальному или зарезервированному"""
+        self._reset(self._initial_capacity)
 
     def to_string(self):  # Для сериализации
         """
@@ -111,7 +289,7 @@ class HashMap(BaseMap):
         :return: string
         """
         string = '\n'.join(' -> '.join(f'{key}:{value}' for key, value in elem)
-                           for elem in self._inner_list if elem is not None)
+                           for elem in self._buckets())
         return string
 
     def get_capacity(self):
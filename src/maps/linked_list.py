@@ -1,6 +1,9 @@
 """
 Linked list.
 Каждый узел имеет данные и ссылку на следующий узел.
+Узлы и списки объявлены с __slots__ (без __dict__ на объект), а каждый
+вызов iter() создает независимый итератор, поэтому вложенные обходы
+одного списка не мешают друг другу
 """
 
 
@@ -8,10 +11,13 @@ class LinkedElem:
     """
     Класс узлов с ссылками в одном направлении
     """
-    def __init__(self, key, value=None, next_=None):
+    __slots__ = ('key', 'value', 'next_', 'hash_')
+
+    def __init__(self, key, value=None, next_=None, hash_=None):
         self.key = key
         self.value = value
         self.next_ = next_
+        self.hash_ = hash_  # сохраненный hash(key), чтобы не считать его повторно
 
     def __str__(self):
         """
@@ -37,27 +43,43 @@ class LinkedElem:
         return self.next_ is not None
 
 
+class LinkedListIterator:
+    """
+    Итератор по парам (ключ, значение) linked list.
+    Хранит собственный текущий узел, поэтому обходы одного списка независимы
+    """
+    __slots__ = ('_node',)
+
+    def __init__(self, node):
+        self._node = node
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        node = self._node
+        if node is None:
+            raise StopIteration
+        self._node = node.next_
+        return node.key, node.value
+
+
 class LinkedList:
     """
     Linked list
     """
+    __slots__ = ('head', 'length', 'tail')
+
     def __init__(self, head):
         self.head = head
         self.length = 1
         self.tail = self.head
-        self.iter = None
 
     def __iter__(self):
-        self.iter = self.head
-        return self
+        return LinkedListIterator(self.head)
 
-    def __next__(self):
-        if self.iter is not None:
-            res = self.iter
-            iter_next = self.iter.next_
-            self.iter = iter_next
-            return res.key, res.value
-        raise StopIteration
+    def __len__(self) -> int:
+        return self.length
 
     def __str__(self):
         string_out = ''
@@ -77,17 +99,52 @@ class LinkedList:
             new_key, new_value = new_data.split()
             self.add_data(new_key, new_value)
             new_data = input()
-            self.length += 1
 
-    def add_data(self, new_key, new_value):
+    def add_data(self, new_key, new_value, hash_=None):
         """
         Добавляет элемент в конец списка.
         :param new_key: data you want to add
         :param new_value: new value
+        :param hash_: hash ключа
         :return: None
         """
-        self.tail.next_ = LinkedElem(new_key, new_value)
+        self.tail.next_ = LinkedElem(new_key, new_value, hash_=hash_)
         self.tail = self.tail.next_
+        self.length += 1
+
+    def add_node(self, node):
+        """
+        Добавляет существующий узел в конец списка (без создания нового узла)
+        :param node: узел
+        :return: None
+        """
+        node.next_ = None
+        self.tail.next_ = node
+        self.tail = node
+        self.length += 1
+
+    def remove(self, key, hash_=None) -> bool:
+        """
+        Удаляет первый найденный элемент с заданным ключом
+        :param key: ключ
+        :param hash_: hash ключа (если задан, сначала сравниваются hash)
+        :return: был ли элемент удален
+        """
+        previous = None
+        current = self.head
+        while current is not None:
+            if (hash_ is None or current.hash_ == hash_) and current.key == key:
+                if previous is None:
+                    self.head = current.next_
+                else:
+                    previous.next_ = current.next_
+                if current is self.tail:
+                    self.tail = previous
+                self.length -= 1
+                return True
+            previous = current
+            current = current.next_
+        return False
 
     def set_data(self, key, new_data):
         """
@@ -208,5 +265,5 @@ if __name__ == '__main__':
     print(linked_list)
     linked_list.del_first_by_key(1)
     print(linked_list)
-    for el in linked_list:
-        print(f'({el.key}, {el.value})', end=' -> ')
\ No newline at end of file
+    for key, value in linked_list:
+        print(f'({key}, {value})', end=' -> ')
\ No newline at end of file
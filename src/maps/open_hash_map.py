@@ -0,0 +1,229 @@
+"""
+Hash map с открытой адресацией.
+Ключи, значения и хэши хранятся в трех параллельных списках, коллизии
+разрешаются линейным пробированием, поэтому на элемент не создаются
+дополнительные объекты (узлы, списки).
+Удаленные элементы помечаются "надгробием", чтобы не разрывать цепочки проб
+"""
+from src.maps.base_map import BaseMap
+
+_EMPTY = object()  # пустая ячейка
+_DELETED = object()  # ячейка удаленного элемента
+_DELETED_HASH = -1  # hash() никогда не возвращает -1, поэтому с ним ничего не совпадет
+
+
+class OpenHashMap(BaseMap):
+    """
+    Класс Hashmap с открытой адресацией и линейным пробированием
+    """
+    __slots__ = ('_keys', '_values', '_hashes', '_capacity', '_size', '_used', '_pop_index',
+                 '_initial_capacity')
+
+    MIN_CAPACITY = 8
+    MAX_LOAD = 0.7  # расширение при заполнении (вместе с надгробиями) более чем на 70%
+    MIN_LOAD = 0.125  # уменьшение при заполнении менее чем на 12.5%
+
+    def __init__(self, _capacity=MIN_CAPACITY, expected_size=0):
+        """
+        :param _capacity: начальный размер списков
+        :param expected_size: ожидаемое количество элементов, списки сразу
+        создаются такого размера, чтобы они поместились без расширений
+        """
+        capacity = self.MIN_CAPACITY
+        while capacity < _capacity:
+            capacity *= 2
+        self._initial_capacity = max(capacity, self._capacity_for(expected_size))
+        self._reset(self._initial_capacity)
+
+    @classmethod
+    def _capacity_for(cls, size: int) -> int:
+        """Возвращает наименьший размер списков, в который size элементов помещаются без расширения"""
+        capacity = cls.MIN_CAPACITY
+        while capacity * cls.MAX_LOAD <= size:
+            capacity *= 2
+        return capacity
+
+    def _reset(self, capacity: int) -> None:
+        """Создает пустые списки размера capacity (степень двойки)"""
+        self._capacity = capacity
+        self._keys = [_EMPTY] * capacity
+        self._values = [None] * capacity
+        self._hashes = [0] * capacity
+        self._size = 0  # количество элементов
+        self._used = 0  # количество занятых ячеек, включая надгробия
+        self._pop_index = capacity - 1  # с какой ячейки popitem начинает поиск
+
+    def _find(self, key, key_hash: int) -> int:
+        """Возвращает индекс ячейки с ключом или -1, если ключа нет"""
+        mask = self._capacity - 1
+        keys = self._keys
+        hashes = self._hashes
+        index = key_hash & mask
+        while True:
+            slot_key = keys[index]
+            if slot_key is _EMPTY:
+                return -1
+            if hashes[index] == key_hash and (slot_key is key or slot_key == key):
+                return index
+            index = (index + 1) & mask
+
+    def __getitem__(self, key):
+        index = self._find(key, hash(key))
+        if index < 0:
+            raise KeyError('Such key does not exists')
+        return self._values[index]
+
+    def get(self, key, default=None):
+        """Возвращает значение по ключу, если ключ существует, в противном случае по умолчанию"""
+        index = self._find(key, hash(key))
+        return default if index < 0 else self._values[index]
+
+    def __contains__(self, key) -> bool:
+        return self._find(key, hash(key)) >= 0
+
+    def __setitem__(self, key, value):
+        self._store(key, value, False)
+
+    def increment(self, key, n=1) -> int:
+        """
+        Увеличивает значение по ключу на n (если ключа нет, значение считается 0)
+        за одно пробирование
+        :return: новое значение
+        """
+        return self._store(key, n, True)
+
+    def _store(self, key, value, add: bool):
+        """
+        Записывает value по ключу (или прибавляет его, если add) за одно пробирование
+        :return: новое значение
+        """
+        key_hash = hash(key)
+        mask = self._capacity - 1
+        keys = self._keys
+        hashes = self._hashes
+        index = key_hash & mask
+        free = -1  # первое надгробие на пути пробирования
+        while True:
+            slot_key = keys[index]
+            if slot_key is _EMPTY:
+                break
+            if slot_key is _DELETED:
+                if free < 0:
+                    free = index
+            elif hashes[index] == key_hash and (slot_key is key or slot_key == key):
+                if add:
+                    value += self._values[index]
+                self._values[index] = value
+                return value
+            index = (index + 1) & mask
+
+        if free >= 0:  # надгробие переиспользуется, занятых ячеек не прибавляется
+            index = free
+        else:
+            self._used += 1
+        keys[index] = key
+        hashes[index] = key_hash
+        self._values[index] = value
+        self._size += 1
+
+        if self._used >= self.MAX_LOAD * self._capacity:
+            # если место заняли надгробия, достаточно перестроить список того же размера
+            if self._size >= self.MAX_LOAD / 2 * self._capacity:
+                self._resize(self._capacity * 2)
+            else:
+                self._resize(self._capacity)
+        return value
+
+    def __delitem__(self, key):
+        index = self._find(key, hash(key))
+        if index < 0:
+            raise KeyError('Such key does not exists')
+        self._keys[index] = _DELETED
+        self._hashes[index] = _DELETED_HASH
+        self._values[index] = None
+        self._size -= 1
+
+        # список не уменьшается меньше начального размера (или размера из reserve)
+        if self._capacity > self._initial_capacity and self._size <= self.MIN_LOAD * self._capacity:
+            self._resize(self._capacity // 2)
+
+    def _resize(self, capacity: int) -> None:
+        """Перестраивает списки под новый размер, надгробия при этом удаляются"""
+        old_keys, old_values, old_hashes = self._keys, self._values, self._hashes
+        self._reset(capacity)
+        mask = capacity - 1
+        keys, values, hashes = self._keys, self._values, self._hashes
+        size = 0
+        for key, value, key_hash in zip(old_keys, old_values, old_hashes):
+            if key is _EMPTY or key is _DELETED:
+                continue
+            index = key_hash & mask
+            while keys[index] is not _EMPTY:
+                index = (index + 1) & mask
+            keys[index] = key
+            values[index] = value
+            hashes[index] = key_hash
+            size += 1
+        self._size = size
+        self._used = size
+
+    def reserve(self, size: int) -> None:
+        """
+        Расширяет списки сразу до размера, при котором size элементов помещаются без расширений.
+        Этот размер запоминается: clear() возвращается к нему, а не к начальному
+        """
+        capacity = self._capacity_for(size)
+        if capacity > self._initial_capacity:
+            self._initial_capacity = capacity
+        if capacity > self._capacity:
+            self._resize(capacity)
+
+    def popitem(self):
+        """
+        Удаляет и возвращает пару (ключ, значение) из последней занятой ячейки.
+        Поиск продолжается с ячейки, найденной прошлым вызовом, поэтому
+        опустошение map через popitem занимает линейное время
+        """
+        if not self._size:
+            raise KeyError('popitem(): map is empty')
+        keys = self._keys
+        mask = self._capacity - 1
+        index = self._pop_index
+        while keys[index] is _EMPTY or keys[index] is _DELETED:
+            index = (index - 1) & mask
+        self._pop_index = index
+        key, value = keys[index], self._values[index]
+        del self[key]
+        return key, value
+
+    def __iter__(self):
+        for key, value in zip(self._keys, self._values):
+            if key is not _EMPTY and key is not _DELETED:
+                yield key, value
+
+    def __str__(self):
+        string = ', '.join(f'{key}: {value}' for key, value in self)
+        return '{' + string + '}'
+
+    __repr__ = __str__
+
+    def __len__(self) -> int:
+        return self._size
+
+    def sort(self, reverse=False):
+        """
+        Сортирует Hashmap по ключам
+        :return: sorted list
+        """
+        return sorted(self, key=lambda elem: elem[0], reverse=reverse)
+
+    def clear(self):
+        """Очищает Hashmap, размер списков возвращается к начальному или зарезервированному"""
+        self._reset(self._initial_capacity)
+
+    def get_capacity(self):
+        """
+        Получает capacity inner list
+        :return: int
+        """
+        return self._capacity
@@ -0,0 +1,200 @@
+"""
+Map на отсортированных блоках (sorted list of lists).
+Ключи и значения хранятся в широких отсортированных списках-блоках, ключ ищется
+двоичным поиском (bisect) сначала по последним ключам блоков, затем внутри блока.
+Узлов на элемент не создается, поэтому памяти на элемент нужно меньше, чем
+HashMap и TreeMap, а итерация идет по возрастанию ключей без сортировки.
+Вставка ключа больше всех существующих (как при чтении words.txt) - добавление
+в конец последнего блока, амортизированно O(1)
+"""
+from bisect import bisect_left
+from typing import Iterable, Tuple
+from src.maps.base_map import BaseMap
+
+
+class SortedBlockMap(BaseMap):
+    """
+    Класс map на отсортированных блоках
+    """
+    __slots__ = ('_keys', '_values', '_maxes', '_size', '_block_size')
+
+    BLOCK_SIZE = 512  # блок делится пополам, когда становится больше 2 * BLOCK_SIZE
+
+    def __init__(self, block_size=BLOCK_SIZE):
+        self._block_size = block_size
+        self._keys = []  # блоки ключей
+        self._values = []  # блоки значений (параллельно _keys)
+        self._maxes = []  # последний (наибольший) ключ каждого блока
+        self._size = 0
+
+    def _locate(self, key) -> Tuple[int, int]:
+        """
+        Находит блок и позицию в нем, где лежит или должен лежать ключ
+        :return: индекс блока (len(_maxes), если ключ больше всех) и позиция в блоке
+        """
+        block = bisect_left(self._maxes, key)
+        if block == len(self._maxes):
+            return block, 0
+        return block, bisect_left(self._keys[block], key)
+
+    def __getitem__(self, key):
+        block, index = self._locate(key)
+        if block < len(self._maxes):
+            keys = self._keys[block]
+            if keys[index] == key:
+                return self._values[block][index]
+        raise KeyError('Such key does not exist')
+
+    def get(self, key, default=None):
+        """Возвращает значение по ключу, если ключ существует, в противном случае по умолчанию"""
+        block, index = self._locate(key)
+        if block < len(self._maxes) and self._keys[block][index] == key:
+            return self._values[block][index]
+        return default
+
+    def __contains__(self, key) -> bool:
+        block, index = self._locate(key)
+        return block < len(self._maxes) and self._keys[block][index] == key
+
+    def _store(self, key, value, add: bool):
+        """
+        Записывает value по ключу (или прибавляет его, если add) за один двоичный поиск
+        :return: новое значение
+        """
+        maxes = self._maxes
+        if not maxes:
+            self._keys.append([key])
+            self._values.append([value])
+            maxes.append(key)
+            self._size += 1
+            return value
+        block, index = self._locate(key)
+        if block == len(maxes):  # ключ больше всех: добавляется в конец последнего блока
+            block -= 1
+            self._keys[block].append(key)
+            self._values[block].append(value)
+            maxes[block] = key
+        else:
+            keys = self._keys[block]
+            if keys[index] == key:
+                values = self._values[block]
+                if add:
+                    value += values[index]
+                values[index] = value
+                return value
+            keys.insert(index, key)
+            self._values[block].insert(index, value)
+        self._size += 1
+        if len(self._keys[block]) > 2 * self._block_size:
+            self._split(block)
+        return value
+
+    def _split(self, block: int) -> None:
+        """Делит переполненный блок пополам"""
+        keys, values = self._keys[block], self._values[block]
+        half = len(keys) // 2
+        self._keys.insert(block + 1, keys[half:])
+        self._values.insert(block + 1, values[half:])
+        del keys[half:]
+        del values[half:]
+        self._maxes.insert(block, keys[-1])
+
+    def __setitem__(self, key, value):
+        self._store(key, value, False)
+
+    def increment(self, key, n=1) -> int:
+        """
+        Увеличивает значение по ключу на n (если ключа нет, значение считается 0)
+        за один двоичный поиск
+        :return: новое значение
+        """
+        return self._store(key, n, True)
+
+    def __delitem__(self, key):
+        block, index = self._locate(key)
+        if block == len(self._maxes) or self._keys[block][index] != key:
+            raise KeyError('Such key does not exist')
+        keys, values = self._keys[block], self._values[block]
+        del keys[index]
+        del values[index]
+        self._size -= 1
+        if not keys:  # пустой блок удаляется
+            del self._keys[block]
+            del self._values[block]
+            del self._maxes[block]
+        else:
+            self._maxes[block] = keys[-1]
+            # маленький блок сливается с соседним, чтобы блоки оставались широкими
+            if len(keys) < self._block_size // 2 and block + 1 < len(self._keys):
+                keys.extend(self._keys.pop(block + 1))
+                values.extend(self._values.pop(block + 1))
+                del self._maxes[block]
+                if len(keys) > 2 * self._block_size:
+                    self._split(block)
+
+    def popitem(self):
+        """Удаляет и возвращает пару с наибольшим ключом за O(1)"""
+        if not self._size:
+            raise KeyError('popitem(): map is empty')
+        keys, values = self._keys[-1], self._values[-1]
+        key, value = keys.pop(), values.pop()
+        self._size -= 1
+        if keys:
+            self._maxes[-1] = keys[-1]
+        else:
+            self._keys.pop()
+            self._values.pop()
+            self._maxes.pop()
+        return key, value
+
+    def __iter__(self):
+        for keys, values in zip(self._keys, self._values):
+            yield from zip(keys, values)
+
+    def sorted_items(self) -> Iterable[Tuple[str, int]]:
+        """Возвращает пары k, v в порядке возрастания ключей без сортировки"""
+        return iter(self)
+
+    def rank(self, key) -> int:
+        """
+        Считает ключи меньше key: размеры блоков перед блоком ключа и позиция в нем, O(блоков)
+        :return: int (позиция key в отсортированном порядке, если он есть)
+        """
+        block, index = self._locate(key)
+        return sum(len(keys) for keys in self._keys[:block]) + index
+
+    def select(self, index: int) -> Tuple[str, int]:
+        """
+        Находит пару с index-м по возрастанию ключом (с нуля), O(блоков)
+        :return: пара k, v
+        """
+        if not 0 <= index < self._size:
+            raise IndexError('Index out of range')
+        for keys, values in zip(self._keys, self._values):
+            if index < len(keys):
+                return keys[index], values[index]
+            index -= len(keys)
+        raise IndexError('Index out of range')
+
+    def __str__(self):
+        string = ', '.join(f'{key}: {value}' for key, value in self)
+        return '{' + string + '}'
+
+    __repr__ = __str__
+
+    def __len__(self) -> int:
+        return self._size
+
+    def clear(self):
+        """Очищает map"""
+        self._keys = []
+        self._values = []
+        self._maxes = []
+        self._size = 0
+
+    def blocks(self) -> int:
+        """
+        Возвращает количество блоков
+        :return: int
+        """
+        return len(self._keys)
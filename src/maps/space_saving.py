@@ -0,0 +1,178 @@
+"""
+Space-Saving - потоковый поиск самых частых слов (heavy hitters) в ограниченной памяти.
+Хранится не более capacity счетчиков. Новое слово, когда все счетчики заняты,
+вытесняет слово с наименьшим количеством и получает его количество + 1,
+а вытесненное количество запоминается как погрешность нового слова.
+Для каждого хранимого слова count - error <= настоящее количество <= count,
+и любое слово, встречающееся больше total / capacity раз, гарантированно хранится.
+Сводки разных статей или частей корпуса можно объединять (merge)
+"""
+import heapq
+from typing import Iterable, Iterator, List, Tuple
+from src.maps.base_map import _count_order
+
+
+class SpaceSaving:
+    """
+    Класс сводки Space-Saving.
+    Слово с наименьшим количеством находится кучей, в которой у каждого слова
+    одна запись; запись может быть устаревшей (меньше настоящего количества,
+    потому что количества только растут) и исправляется, только когда оказывается
+    на вершине кучи, поэтому увеличение хранимого слова - O(1)
+    """
+    __slots__ = ('_capacity', '_counts', '_errors', '_heap', '_total')
+
+    CAPACITY = 1000
+
+    def __init__(self, capacity: int = CAPACITY):
+        """
+        :param capacity: наибольшее количество хранимых слов
+        """
+        if capacity < 1:
+            raise ValueError('capacity must be positive')
+        self._capacity = capacity
+        self._counts = {}  # слово -> оценка количества сверху
+        self._errors = {}  # слово -> наибольшая возможная переоценка
+        self._heap = []  # пары (количество, слово), по одной на хранимое слово
+        self._total = 0  # сумма всех увеличений
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def __contains__(self, key) -> bool:
+        return key in self._counts
+
+    def __iter__(self) -> Iterator[Tuple[str, int]]:
+        return iter(self._counts.items())
+
+    @property
+    def capacity(self) -> int:
+        """Наибольшее количество хранимых слов"""
+        return self._capacity
+
+    @property
+    def total(self) -> int:
+        """Сумма всех увеличений (количество слов в потоке)"""
+        return self._total
+
+    def _evict(self) -> Tuple[str, int]:
+        """
+        Убирает слово с наименьшим количеством
+        :return: слово и его количество
+        """
+        heap, counts = self._heap, self._counts
+        low, key = heap[0]
+        while counts[key] != low:  # запись устарела: исправляем и смотрим новую вершину
+            heapq.heapreplace(heap, (counts[key], key))
+            low, key = heap[0]
+        heapq.heappop(heap)
+        del counts[key]
+        del self._errors[key]
+        return key, low
+
+    def increment(self, key, n: int = 1) -> None:
+        """Увеличивает количество слова на n (n > 0)"""
+        self._total += n
+        counts = self._counts
+        count = counts.get(key)
+        if count is not None:
+            counts[key] = count + n
+            return
+        error = 0
+        if len(counts) >= self._capacity:
+            _, error = self._evict()
+        counts[key] = error + n
+        self._errors[key] = error
+        heapq.heappush(self._heap, (error + n, key))
+
+    def bulk_add(self, iterable: Iterable[str]) -> None:
+        """Увеличивает на 1 количество каждого слова из iterable"""
+        counts = self._counts
+        increment = self.increment
+        for key in iterable:
+            count = counts.get(key)
+            if count is None:
+                increment(key)
+            else:
+                counts[key] = count + 1
+                self._total += 1
+
+    def observe(self, iterable: Iterable[str]) -> Iterator[str]:
+        """
+        Пропускает поток слов через сводку: каждое слово учитывается и возвращается дальше
+        (например, в bulk_add map при подсчете слов статьи)
+        """
+        increment = self.increment
+        for key in iterable:
+            increment(key)
+            yield key
+
+    def merge_counts(self, other) -> None:
+        """
+        Прибавляет количества other: map, dict или другой сводки Space-Saving
+        (тогда сводки объединяются через merge)
+        """
+        if isinstance(other, SpaceSaving):
+            self.merge(other)
+            return
+        increment = self.increment
+        for key, value in other.items():
+            if value > 0:
+                increment(key, value)
+
+    def _floor(self) -> int:
+        """Количество, которое могло быть у слова, не попавшего в заполненную сводку"""
+        if len(self._counts) < self._capacity:
+            return 0
+        return min(self._counts.values())
+
+    def merge(self, other: 'SpaceSaving') -> None:
+        """
+        Объединяет сводку с other (Agarwal et al., Mergeable Summaries).
+        Слову, которого нет в одной из сводок, прибавляется наименьшее количество
+        этой сводки (если она заполнена), затем остаются capacity слов с наибольшими количествами
+        """
+        floor, other_floor = self._floor(), other._floor()
+        counts, errors = {}, {}
+        for key in self._counts.keys() | other._counts.keys():
+            counts[key] = self._counts.get(key, floor) + other._counts.get(key, other_floor)
+            errors[key] = self._errors.get(key, floor) + other._errors.get(key, other_floor)
+        kept = heapq.nsmallest(self._capacity, counts.items(), key=_count_order)
+        self._counts = dict(kept)
+        self._errors = {key: errors[key] for key, _ in kept}
+        self._heap = [(count, key) for key, count in kept]
+        heapq.heapify(self._heap)
+        self._total += other._total
+
+    def bounds(self, key) -> Tuple[int, int]:
+        """
+        Возвращает границы настоящего количества слова
+        :return: (нижняя граница, верхняя граница)
+        """
+        count = self._counts.get(key)
+        if count is None:
+            return 0, self._floor()
+        return count - self._errors[key], count
+
+    def most_common(self, k: int = None) -> List[Tuple[str, int]]:
+        """
+        Возвращает k слов с наибольшими оценками количества по убыванию
+        :param k: количество слов (None - все хранимые слова)
+        :return: список пар (слово, оценка количества сверху)
+        """
+        if k is None:
+            return sorted(self._counts.items(), key=_count_order)
+        return heapq.nsmallest(k, self._counts.items(), key=_count_order)
+
+    def guaranteed(self, k: int = None) -> List[Tuple[str, int]]:
+        """
+        Возвращает из most_common(k) слова, которые точно входят в k самых частых:
+        их нижняя граница не меньше оценки следующего слова
+        :return: список пар (слово, оценка количества сверху)
+        """
+        top = self.most_common(None if k is None else k + 1)
+        if k is None or len(top) <= k:
+            threshold = self._floor()
+        else:
+            threshold = top.pop()[1]
+        return [(key, count) for key, count in top if count - self._errors[key] >= threshold]
@@ -1,8 +1,10 @@
 """
 Binary Search Tree.
 Ключи узла слева и справа меньше, чем ключ родительского узла.
+Итерация идет в порядке возрастания ключей
 """
-from src.maps.base_map import BaseMap
+from typing import Iterable, Optional, Tuple
+from src.maps.base_map import BaseMap, _read_pairs
 
 
 class Node:
@@ -27,91 +29,273 @@ class Node:
 
 class TreeMap(BaseMap):
     """
-    Binary Search Tree class
+    Binary Search Tree class.
+    Поиск, вставка и удаление выполняются без рекурсии, поэтому вырожденное
+    дерево (ключи вставлялись по возрастанию) не переполняет стек
     """
+    NODE_TYPE = Node  # класс узлов дерева
+
     def __init__(self, root=None):
         self.root = root
         self._size = 0
 
     def __setitem__(self, key, value):
-        def set_node(node):
+        if self.root is None:
+            self.root = self.NODE_TYPE(key, value)
+            self._size += 1
+            return
+        node = self.root
+        while True:
             if key > node.key:
                 if node.right is None:
-                    node.right = Node(key, value)
-                else:
-                    set_node(node.right)
+                    node.right = self.NODE_TYPE(key, value)
+                    break
+                node = node.right
             elif key < node.key:
                 if node.left is None:
-                    node.left = Node(key, value)
-                else:
-                    set_node(node.left)
-            elif key == node.key:
+                    node.left = self.NODE_TYPE(key, value)
+                    break
+                node = node.left
+            else:  # key == node.key
                 node.value = value
-                self._size -= 1
+                return
+        self._size += 1
 
+    def increment(self, key, n=1) -> int:
+        """
+        Увеличивает значение по ключу на n (если ключа нет, значение считается 0)
+        за один спуск по дереву
+        :return: новое значение
+        """
         if self.root is None:
-            self.root = Node(key, value)
-        else:
-            set_node(self.root)
-        self._size += 1
+            self.root = self.NODE_TYPE(key, n)
+            self._size += 1
+            return n
+        node = self.root
+        while True:
+            if key > node.key:
+                if node.right is None:
+                    node.right = self.NODE_TYPE(key, n)
+                    self._size += 1
+                    return n
+                node = node.right
+            elif key < node.key:
+                if node.left is None:
+                    node.left = self.NODE_TYPE(key, n)
+                    self._size += 1
+                    return n
+                node = node.left
+            else:  # key == node.key
+                node.value += n
+                return node.value
 
     def __getitem__(self, key):
-        def get_node(node):
-            if node is None:
-                raise KeyError('Such key does not exist')
+        node = self.root
+        while node is not None:
             if key > node.key:
-                return get_node(node.right)
-            if key < node.key:
-                return get_node(node.left)
-            return node  # key == node.key
-        return get_node(self.root).value
+                node = node.right
+            elif key < node.key:
+                node = node.left
+            else:  # key == node.key
+                return node.value
+        raise KeyError('Such key does not exist')
+
+    def _unlink(self, node, parent) -> None:
+        """Удаляет узел node, parent - его родитель (None для корня)"""
+        if node.right is None and node.left is None:  # нет детей
+            if parent is None:
+                self.root = None
+            elif parent.right is node:  # "узел, подлежащий удалению" находится справа
+                parent.right = None
+            else:  # "узел, подлежащий удалению", находится слева
+                parent.left = None
+        elif node.right is None or node.left is None:  # один ребенок
+            child = node.right if node.right is not None else node.left
+            node.key = child.key
+            node.value = child.value
+            node.right = child.right
+            node.left = child.left
+        else:  # два ребенка
+            curr = node.right
+            prev = node
+            while curr.left is not None:
+                prev = curr
+                curr = curr.left
+            # меняет k,v "узла, подлежащего удалению" на k,v наименьшего ключа в правом дереве
+            node.key = curr.key
+            node.value = curr.value
+            self._unlink(curr, prev)  # у узла с наименьшим ключом нет левого ребенка
 
     def __delitem__(self, key):
-        def del_node(node, key_, prev_node=None):
-            if node is None:
-                raise KeyError('Such key does not exist')
-            if key_ > node.key:
-                del_node(node.right, key_, node)
-            elif key_ < node.key:
-                del_node(node.left, key_, node)
+        parent = None
+        node = self.root
+        while node is not None:
+            if key > node.key:
+                parent, node = node, node.right
+            elif key < node.key:
+                parent, node = node, node.left
             else:  # key == node.key
-                if node.right is None and node.left is None:  # нет детей
-                    if prev_node is not None:
-                        if prev_node.right is node:  # "узел, подлежащий удалению" находится справа
-                            prev_node.right = None
-                        elif prev_node.left is node:  # "узел, подлежащий удалению, находится слева
-                            prev_node.left = None
-                elif node.right is None or node.left is None:  # один ребенок
-                    child = node.right if node.right is not None else node.left
-                    node.key = child.key
-                    node.value = child.value
-                    node.right = child.right
-                    node.left = child.left
-                else:  # два ребенка
-                    curr = node.right
-                    prev = node
-                    while curr.left is not None:
-                        prev = curr
-                        curr = curr.left
-                    # меняет k,v "узла, подлежащего удалению" на k,v наименьшего ключа в правом дереве
-                    node.key = curr.key
-                    node.value = curr.value
-                    del_node(curr, curr.key, prev)  # del узел с наименьшим ключом в правом дереве
-
-        if self.root is not None and self.root.right is None and self.root.right is None:
-            self.root = None
+                self._unlink(node, parent)
+                self._size -= 1
+                return
+        raise KeyError('Such key does not exist')
+
+    def popitem(self):
+        """
+        Удаляет и возвращает пару с наибольшим ключом
+        (у самого правого узла нет правого ребенка, его место занимает левый)
+        """
+        if self.root is None:
+            raise KeyError('popitem(): map is empty')
+        parent = None
+        node = self.root
+        while node.right is not None:
+            parent = node
+            node = node.right
+        if parent is None:
+            self.root = node.left
         else:
-            del_node(self.root, key)
+            parent.right = node.left
         self._size -= 1
+        return node.key, node.value
+
+    def _iter_nodes(self, low=None):
+        """
+        Обходит узлы в порядке возрастания ключей (in-order) без рекурсии,
+        начиная с первого ключа не меньше low; поддеревья меньше low не посещаются
+        """
+        stack = []
+        node = self.root
+        while node is not None:
+            if low is not None and node.key < low:
+                node = node.right
+            else:
+                stack.append(node)
+                node = node.left
+        while stack:
+            node = stack.pop()
+            yield node
+            node = node.right
+            while node is not None:
+                stack.append(node)
+                node = node.left
 
     def __iter__(self):
-        def iter_node(node):
-            if node is not None:
-                yield node.key, node.value
-                yield from iter_node(node.left)
-                yield from iter_node(node.right)
+        for node in self._iter_nodes():
+            yield node.key, node.value
+
+    def range_items(self, low=None, high=None) -> Iterable[Tuple[str, int]]:
+        """
+        Возвращает пары k, v в порядке возрастания ключей из диапазона [low, high)
+        :param low: нижняя граница включительно (None - без границы)
+        :param high: верхняя граница не включительно (None - без границы)
+        """
+        for node in self._iter_nodes(low):
+            if high is not None and not node.key < high:
+                return
+            yield node.key, node.value
+
+    def prefix_items(self, prefix: str) -> Iterable[Tuple[str, int]]:
+        """Возвращает пары k, v с ключами, начинающимися с prefix, в порядке возрастания"""
+        for node in self._iter_nodes(prefix):
+            if not node.key.startswith(prefix):
+                return
+            yield node.key, node.value
+
+    def sorted_items(self) -> Iterable[Tuple[str, int]]:
+        """Возвращает пары k, v в порядке возрастания ключей без сортировки"""
+        return iter(self)
+
+    def floor(self, key) -> Optional[Tuple[str, int]]:
+        """
+        Находит наибольший ключ, не больший key
+        :return: пара k, v или None, если такого ключа нет
+        """
+        found = None
+        node = self.root
+        while node is not None:
+            if key < node.key:
+                node = node.left
+            else:
+                found = node
+                if not node.key < key:  # key == node.key
+                    break
+                node = node.right
+        return None if found is None else (found.key, found.value)
+
+    def ceiling(self, key) -> Optional[Tuple[str, int]]:
+        """
+        Находит наименьший ключ, не меньший key
+        :return: пара k, v или None, если такого ключа нет
+        """
+        found = None
+        node = self.root
+        while node is not None:
+            if node.key < key:
+                node = node.right
+            else:
+                found = node
+                if not key < node.key:  # key == node.key
+                    break
+                node = node.left
+        return None if found is None else (found.key, found.value)
+
+    def rank(self, key) -> int:
+        """
+        Считает ключи меньше key обходом по возрастанию: O(n)
+        (у AVLTreeMap - O(log n) по размерам поддеревьев)
+        :return: int (позиция key в отсортированном порядке, если он есть)
+        """
+        rank = 0
+        for node in self._iter_nodes():
+            if not node.key < key:
+                break
+            rank += 1
+        return rank
+
+    def select(self, index: int) -> Tuple[str, int]:
+        """
+        Находит пару с index-м по возрастанию ключом (с нуля) обходом по возрастанию: O(n)
+        (у AVLTreeMap - O(log n))
+        :return: пара k, v
+        """
+        if not 0 <= index < self._size:
+            raise IndexError('Index out of range')
+        for position, node in enumerate(self._iter_nodes()):
+            if position == index:
+                return node.key, node.value
+        raise IndexError('Index out of range')
+
+    def _build(self, pairs: list, low: int, high: int):
+        """
+        Строит сбалансированное поддерево из отсортированных пар pairs[low:high]:
+        корень - медиана, поддеревья строятся из левой и правой половин
+        :return: корень поддерева
+        """
+        if low >= high:
+            return None
+        middle = (low + high) // 2
+        node = self.NODE_TYPE(*pairs[middle])
+        node.left = self._build(pairs, low, middle)
+        node.right = self._build(pairs, middle + 1, high)
+        self._built(node)
+        return node
+
+    def _built(self, node) -> None:
+        """Вызывается для узла, поддеревья которого построены (_build)"""
 
-        yield from iter_node(self.root)
+    @classmethod
+    def read(cls, path: str) -> 'TreeMap':
+        """
+        Считывает map из файла. Дерево строится сразу сбалансированным из отсортированных
+        пар (write сохраняет ключи по возрастанию, и сортировка почти ничего не стоит),
+        а не вставками по одному: из отсортированных ключей они дали бы дерево-список
+        """
+        pairs = sorted(dict(_read_pairs(path)).items(), key=lambda elem: elem[0])
+        my_obj = cls()
+        my_obj.root = my_obj._build(pairs, 0, len(pairs))
+        my_obj._size = len(pairs)
+        return my_obj
 
     def clear(self):
         """Очищает TreeMap"""
@@ -1,2 +1,3 @@
 from src.parser import file
 from src.parser import wiki
+from src.parser import async_crawler
@@ -0,0 +1,260 @@
+"""
+Асинхронный обход статей Википедии.
+Все запросы идут через небольшой пул постоянных HTTP/1.1 соединений (keep-alive),
+поэтому тысячи одновременных загрузок не открывают тысячи соединений.
+Разбор html (работа CPU) выполняется в пуле процессов или потоков
+"""
+import ssl
+import asyncio
+import logging
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, Optional, Tuple, Type
+from urllib.parse import quote, urljoin, urlsplit
+from src.maps.base_map import BaseMap
+from src.maps.hash_map import HashMap
+from src.parser.wiki import ARTICLES_DIRECTORY, article_heading, cached_article_urls, save_article
+
+MAX_CONNECTIONS = 8  # сколько соединений с сервером держит пул
+MAX_IN_FLIGHT = 1000  # сколько статей обрабатывается одновременно
+MAX_REDIRECTS = 5
+USER_AGENT = 'wiki-parser'
+
+logger = logging.getLogger(__name__)
+
+
+class HTTPError(Exception):
+    """Сервер ответил статусом, отличным от 200"""
+    def __init__(self, status: int, url: str):
+        super().__init__(f'HTTP {status}')
+        self.status = status
+        self.url = url
+
+
+class ConnectionPool:
+    """
+    Пул постоянных HTTP/1.1 соединений с одним сервером.
+    Запросы ждут свободного соединения, новое соединение открывается,
+    только если открыто меньше size соединений
+    """
+    def __init__(self, origin: str, size: int = MAX_CONNECTIONS):
+        parts = urlsplit(origin)
+        self.host = parts.hostname
+        self.is_https = parts.scheme == 'https'
+        self.port = parts.port or (443 if self.is_https else 80)
+        self.host_header = parts.netloc
+        self._ssl = ssl.create_default_context() if self.is_https else None
+        self._slots = asyncio.Semaphore(size)
+        self._idle = []
+        self.opened = 0  # сколько соединений было открыто
+        self.requests = 0  # сколько запросов было отправлено
+
+    async def _open(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        """Открывает новое соединение"""
+        connection = await asyncio.open_connection(self.host, self.port, ssl=self._ssl)
+        self.opened += 1
+        return connection
+
+    @staticmethod
+    def _close(connection: Tuple[asyncio.StreamReader, asyncio.StreamWriter]) -> None:
+        """Закрывает соединение"""
+        connection[1].close()
+
+    async def get(self, path: str) -> Tuple[int, Dict[str, str], bytes]:
+        """
+        Отправляет GET-запрос по свободному соединению пула.
+        Если переиспользованное соединение оказалось закрыто сервером,
+        запрос один раз повторяется по новому соединению
+        :param path: путь (и query) запроса
+        :return: статус, заголовки (имена в нижнем регистре) и тело ответа
+        """
+        async with self._slots:
+            while True:
+                reused = bool(self._idle)
+                connection = self._idle.pop() if reused else await self._open()
+                try:
+                    status, headers, body, keep_alive = await self._exchange(connection, path)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    self._close(connection)
+                    if reused:
+                        continue
+                    raise
+                except BaseException:
+                    self._close(connection)
+                    raise
+                if keep_alive:
+                    self._idle.append(connection)
+                else:
+                    self._close(connection)
+                return status, headers, body
+
+    async def _exchange(self, connection, path: str) -> Tuple[int, Dict[str, str], bytes, bool]:
+        """Отправляет запрос и читает ответ целиком"""
+        reader, writer = connection
+        request = (f'GET {path} HTTP/1.1\r\n'
+                   f'Host: {self.host_header}\r\n'
+                   f'User-Agent: {USER_AGENT}\r\n'
+                   'Accept-Encoding: identity\r\n'
+                   'Connection: keep-alive\r\n\r\n')
+        writer.write(request.encode('ascii'))
+        await writer.drain()
+        self.requests += 1
+
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError('connection closed by server')
+        version, status = status_line.decode('latin-1').split(None, 2)[:2]
+        headers = {}
+        line = await reader.readline()
+        while line not in (b'\r\n', b'\n', b''):
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+            line = await reader.readline()
+
+        keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            body = await self._read_chunked(reader)
+        elif 'content-length' in headers:
+            body = await reader.readexactly(int(headers['content-length']))
+        else:  # длина неизвестна: тело заканчивается закрытием соединения
+            body = await reader.read()
+            keep_alive = False
+        return int(status), headers, body, keep_alive
+
+    @staticmethod
+    async def _read_chunked(reader: asyncio.StreamReader) -> bytes:
+        """Читает тело ответа с Transfer-Encoding: chunked"""
+        chunks = []
+        while True:
+            size = int((await reader.readline()).split(b';')[0], 16)
+            if size == 0:
+                break
+            chunks.append(await reader.readexactly(size))
+            await reader.readexactly(2)  # \r\n после порции
+        line = await reader.readline()
+        while line not in (b'\r\n', b'\n', b''):  # заголовки после тела
+            line = await reader.readline()
+        return b''.join(chunks)
+
+    async def close(self) -> None:
+        """Закрывает все свободные соединения"""
+        while self._idle:
+            self._close(self._idle.pop())
+
+
+async def fetch(pool: ConnectionPool, url: str) -> Tuple[str, bytes]:
+    """
+    Скачивает страницу через пул, следуя перенаправлениям.
+    Запрос всегда идет на сервер пула, от url используются только путь и query
+    :param pool: пул соединений с сервером статьи
+    :param url: ссылка на статью
+    :return: URL-адрес после перенаправлений и содержимое страницы
+    """
+    origin = f'{"https" if pool.is_https else "http"}://{pool.host_header}'
+    for _ in range(MAX_REDIRECTS + 1):
+        parts = urlsplit(url)
+        path = quote(parts.path or '/', safe="/%:@!$&'()*+,;=")
+        if parts.query:
+            path += '?' + parts.query
+        status, headers, body = await pool.get(path)
+        if status in (301, 302, 303, 307, 308) and 'location' in headers:
+            url = urljoin(origin + path, headers['location'])
+            continue
+        if status != 200:
+            raise HTTPError(status, url)
+        return origin + path, body
+    raise HTTPError(status, url)  # слишком много перенаправлений
+
+
+async def crawl(url: str, depth: int = 0, base_path=ARTICLES_DIRECTORY,
+                origin: Optional[str] = None, connections: int = MAX_CONNECTIONS,
+                executor: Optional[Executor] = None, max_in_flight: int = MAX_IN_FLIGHT,
+                map_type: Type[BaseMap] = HashMap, sketches: bool = False, features: str = None) -> int:
+    """
+    Обходит статьи, начиная с url, на глубину depth.
+    Каждая статья обрабатывается, как только найдена ссылка на нее: уже найденные
+    статьи (по заголовку) повторно не ставятся в очередь
+    :param url: ссылка на базовую статью
+    :param depth: depth of parsing
+    :param base_path: путь, куда записывать файлы с содержимым и т.д.
+    :param origin: сервер, с которого скачиваются все статьи (по умолчанию сервер url);
+    ссылки статей ведут на WIKI_DOMAIN, но запрашиваются у origin по тому же пути
+    :param connections: размер пула соединений
+    :param executor: пул для разбора статей (None - пул потоков цикла событий)
+    :param max_in_flight: сколько статей обрабатывается одновременно
+    :param map_type: класс map для подсчета слов
+    :param sketches: записывать приближенную статистику статей (sketch.bin)
+    :param features: построитель дерева BeautifulSoup (по умолчанию html.parser, см. fast_features)
+    :return: количество обработанных статей
+    """
+    loop = asyncio.get_running_loop()
+    if origin is None:
+        parts = urlsplit(url)
+        origin = f'{parts.scheme}://{parts.netloc}'
+    pool = ConnectionPool(origin, connections)
+    in_flight = asyncio.Semaphore(max_in_flight)
+    seen = {article_heading(url)}
+    tasks = set()
+
+    async def process(page_url: str) -> list:
+        heading = article_heading(page_url)
+        if heading != 'Special:Random':
+            urls = await loop.run_in_executor(executor, cached_article_urls, heading, base_path,
+                                              features)
+            if urls is not None:
+                return urls
+        curr_url, content = await fetch(pool, page_url)
+        return await loop.run_in_executor(executor, save_article,
+                                          article_heading(curr_url), curr_url, content,
+                                          base_path, map_type, sketches, features)
+
+    async def visit(page_url: str, page_depth: int) -> None:
+        async with in_flight:
+            try:
+                urls = await process(page_url)
+            except (OSError, HTTPError, asyncio.IncompleteReadError, ValueError) as error:
+                logger.warning('%s: %s', page_url, error)
+                return
+            except Exception:  # pylint: disable=broad-except
+                # ошибка одной статьи не должна останавливать весь обход
+                logger.exception('%s: unexpected error', page_url)
+                return
+        if page_depth < depth:
+            for new_url in urls:
+                heading = article_heading(new_url)
+                if heading not in seen:
+                    seen.add(heading)
+                    schedule(new_url, page_depth + 1)
+
+    def schedule(page_url: str, page_depth: int) -> None:
+        task = asyncio.create_task(visit(page_url, page_depth))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    schedule(url, 0)
+    try:
+        while tasks:
+            await asyncio.gather(*tasks)
+    finally:
+        # при отмене обхода или ошибке незавершенные задачи отменяются до закрытия пула
+        pending = list(tasks)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        await pool.close()
+    return len(seen)
+
+
+def async_parsing(url: str, depth: int = 0, base_path=ARTICLES_DIRECTORY,
+                  connections: int = MAX_CONNECTIONS, workers: Optional[int] = None) -> int:
+    """
+    Анализирует статьи из базовых статей с помощью asyncio: загрузки идут через пул
+    постоянных соединений, а разбор html - в пуле процессов
+    :param url: ссылка на базовую статью
+    :param depth: depth of parsing
+    :param base_path: путь, куда записывать файлы с содержимым и т.д.
+    :param connections: размер пула соединений
+    :param workers: количество процессов для разбора (None - по числу CPU)
+    :return: количество обработанных статей
+    """
+    with ProcessPoolExecutor(workers) as executor:
+        return asyncio.run(crawl(url, depth, base_path, connections=connections, executor=executor))
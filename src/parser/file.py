@@ -1,22 +1,59 @@
 """
 Модуль для работы с файлами
 """
+import os
+import heapq
+import shutil
+import tempfile
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+from src.storage.block_io import BUFFER_SIZE, BlockWriter, block_reader
+from src.maps.base_map import _count_order
+from src.maps.hash_map import HashMap
 
+MAX_FAN_IN = 64  # сколько файлов открывается одновременно при многопроходном объединении
+MERGE_MEMORY = 1 << 24  # сколько байт буферов на все файлы одного объединения
+MIN_MERGE_BUFFER_SIZE = 1 << 16  # наименьший буфер файла при объединении
+SAMPLE_FILES = 64  # по скольким файлам выбираются границы диапазонов map-reduce
+TASKS_PER_WORKER = 4  # на сколько map-задач на процесс делятся файлы
 
-def file_reader(filename: str):
-    """Функция, считывающая строки в файле"""
-    with open(filename, 'r', encoding='utf8') as file:
-        line = file.readline()
-        while line:
-            yield line
-            line = file.readline()
+
+def file_reader(filename: str, buffer_size: int = BUFFER_SIZE):
+    """Функция, считывающая строки в файле (файл читается блоками по buffer_size байт)"""
+    for lines in block_reader(filename, buffer_size):
+        yield from lines
 
 
 def list_writer(list_to_write: list, filename: str):
     """Функция, которая записывает в файл список, составленный из map"""
-    with open(filename, 'w', encoding='utf8') as file:
-        for key, value in list_to_write:
-            file.write(f'{key} {value}\n')
+    with BlockWriter(filename) as writer:
+        writer.write_pairs(list_to_write)
+
+
+def links_writer(urls: list, filename: str):
+    """
+    Функция, которая записывает ссылки статьи в файл, по одной на строку.
+    Файл сначала пишется во временный и затем переименовывается,
+    чтобы другой поток/процесс не прочитал его наполовину записанным.
+    Имя временного файла уникально (mkstemp), поэтому потоки одного процесса,
+    пишущие один и тот же файл, не мешают друг другу
+    """
+    descriptor, tmp_filename = tempfile.mkstemp(suffix='.tmp', dir=os.path.dirname(filename) or '.')
+    os.close(descriptor)
+    try:
+        with BlockWriter(tmp_filename) as writer:
+            for url in urls:
+                writer.write(f'{url}\n')
+        os.replace(tmp_filename, filename)
+    except BaseException:
+        os.remove(tmp_filename)
+        raise
+
+
+def links_reader(filename: str) -> list:
+    """Функция, считывающая ссылки статьи из файла"""
+    return [line.rstrip('\n') for line in file_reader(filename)]
 
 
 def word_counter(words_list: list, word: str) -> int:
@@ -38,7 +75,7 @@ def files_merge(*filenames: str, result_path: str):
     :param result_path: файл, куда поместится результат
     :return: None
     """
-    with open(result_path, 'w', encoding='utf8') as result_file:
+    with BlockWriter(result_path) as result_file:
         file_readers = [file_reader(filename) for filename in filenames]
         lines = [next(reader, None) for reader in file_readers]
         while any(lines):
@@ -66,5 +103,219 @@ def files_merge(*filenames: str, result_path: str):
                 lines[next_index] = next(file_readers[next_index], None)
 
 
+def _push_line(heap: list, reader_index: int, line: str) -> None:
+    """Разбирает строку один раз и кладет ее в кучу с ключом (слово, номер файла)"""
+    if line:
+        word, num = line.split()
+        heapq.heappush(heap, (word, reader_index, num, line))
+
+
+def merge_buffer_size(files: int) -> int:
+    """
+    Размер буфера каждого файла при объединении files файлов: буферы всех файлов
+    и результата вместе занимают не больше MERGE_MEMORY (но не меньше
+    MIN_MERGE_BUFFER_SIZE и не больше BUFFER_SIZE на файл)
+    """
+    return max(MIN_MERGE_BUFFER_SIZE, min(BUFFER_SIZE, MERGE_MEMORY // (files + 1)))
+
+
+def heap_files_merge(*filenames: str, result_path: str, buffer_size: int = None):
+    """
+    Объединяет несколько отсортированных файлов в один с помощью кучи (k-way merge).
+    Каждая строка разбирается один раз, количества одинаковых слов суммируются.
+    Результат побайтно совпадает с files_merge
+    :param filenames: итерируемый с именами файлов
+    :param result_path: файл, куда поместится результат
+    :param buffer_size: буфер каждого файла в байтах (None - по количеству файлов, merge_buffer_size)
+    :return: None
+    """
+    if buffer_size is None:
+        buffer_size = merge_buffer_size(len(filenames))
+    with BlockWriter(result_path, buffer_size=buffer_size) as result_file:
+        file_readers = [file_reader(filename, buffer_size) for filename in filenames]
+        heap = []
+        for reader_index, reader in enumerate(file_readers):
+            _push_line(heap, reader_index, next(reader, None))
+        while heap:
+            min_word, reader_index, num, min_word_line = heapq.heappop(heap)
+            # Если слово встречается только один раз, строка пишется как есть
+            if not heap or heap[0][0] != min_word:
+                result_file.write(min_word_line)
+                _push_line(heap, reader_index, next(file_readers[reader_index], None))
+                continue
+            # Если слово встречается несколько раз, сначала забираем все его вхождения,
+            # и только потом продвигаем файлы, как это делает files_merge
+            next_indexes = [reader_index]
+            result_word_count = int(num)
+            while heap and heap[0][0] == min_word:
+                _, reader_index, num, _ = heapq.heappop(heap)
+                next_indexes.append(reader_index)
+                result_word_count += int(num)
+            result_file.write(f'{min_word} {str(result_word_count)}\n')
+            for next_index in next_indexes:
+                _push_line(heap, next_index, next(file_readers[next_index], None))
+
+
+def _merge_run(filenames: list, result_path: str, buffer_size: int = None) -> str:
+    """Объединяет одну группу файлов в промежуточный файл (нужна для пула процессов)"""
+    heap_files_merge(*filenames, result_path=result_path, buffer_size=buffer_size)
+    return result_path
+
+
+def hierarchical_files_merge(*filenames: str, result_path: str, max_fan_in: int = MAX_FAN_IN,
+                             workers: int = None, tmp_dir: str = None, buffer_size: int = None):
+    """
+    Объединяет файлы в несколько проходов, открывая не больше max_fan_in файлов за раз.
+    Файлы делятся на группы по max_fan_in, каждая группа объединяется в промежуточный
+    файл во временной папке, затем промежуточные файлы объединяются так же (дерево),
+    пока их не станет не больше max_fan_in. Результат совпадает с heap_files_merge
+    :param filenames: итерируемый с именами файлов
+    :param result_path: файл, куда поместится результат
+    :param max_fan_in: максимальное количество одновременно объединяемых файлов
+    :param workers: количество процессов для объединения групп одного прохода
+    (None или 1 - без пула, тогда открыто не больше max_fan_in + 1 файлов)
+    :param tmp_dir: папка, в которой создается временная папка для промежуточных файлов
+    :param buffer_size: буфер каждого файла в байтах (None - по количеству файлов группы,
+    merge_buffer_size); в каждом процессе открыто не больше max_fan_in + 1 буферов
+    :return: None
+    """
+    if max_fan_in < 2:
+        raise ValueError('max_fan_in must be at least 2')
+    filenames = list(filenames)
+    if len(filenames) <= max_fan_in:
+        heap_files_merge(*filenames, result_path=result_path, buffer_size=buffer_size)
+        return
+    with tempfile.TemporaryDirectory(dir=tmp_dir) as run_dir:
+        level = 0
+        while len(filenames) > max_fan_in:
+            groups = [filenames[index:index + max_fan_in]
+                      for index in range(0, len(filenames), max_fan_in)]
+            run_paths = [os.path.join(run_dir, f'{level}_{index}.txt')
+                         for index in range(len(groups))]
+            if workers is not None and workers > 1:
+                with ProcessPoolExecutor(workers) as executor:
+                    list(executor.map(_merge_run, groups, run_paths, [buffer_size] * len(groups)))
+            else:
+                for group, run_path in zip(groups, run_paths):
+                    _merge_run(group, run_path, buffer_size)
+            # промежуточные файлы прошлого прохода больше не нужны
+            if level > 0:
+                for filename in filenames:
+                    os.remove(filename)
+            filenames = run_paths
+            level += 1
+        heap_files_merge(*filenames, result_path=result_path, buffer_size=buffer_size)
+
+
+def partition_bounds(filenames: List[str], partitions: int, sample_files: int = SAMPLE_FILES) -> List[str]:
+    """
+    Выбирает границы диапазонов первых букв так, чтобы в каждый диапазон попадало
+    примерно одинаковое количество строк. Оценка строится по первым буквам слов
+    не больше sample_files равномерно выбранных файлов
+    :param filenames: файлы words.txt
+    :param partitions: желаемое количество диапазонов
+    :param sample_files: сколько файлов читается для оценки
+    :return: отсортированные первые буквы диапазонов, кроме первого
+    (диапазонов может получиться меньше, если букв мало)
+    """
+    step = max(len(filenames) // sample_files, 1)
+    letters = sorted(line[0] for filename in filenames[::step] for line in file_reader(filename))
+    if not letters:
+        return []
+    bounds = {letters[len(letters) * part // partitions] for part in range(1, partitions)}
+    bounds.discard(letters[0])  # у первого диапазона нет нижней границы
+    return sorted(bounds)
+
+
+def _file_pairs(filename: str):
+    """Итерация по парам (слово, количество) файла слов"""
+    for line in file_reader(filename):
+        word, count = line.split()
+        yield word, int(count)
+
+
+def file_most_common(filename: str, k: int) -> List[Tuple[str, int]]:
+    """
+    Находит k самых частых слов файла слов (например, res.txt) за один проход.
+    В памяти хранится куча из k пар, а не весь файл
+    :param filename: файл со строками 'слово количество'
+    :param k: количество слов
+    :return: пары (слово, количество) по убыванию количества
+    """
+    return heapq.nsmallest(k, _file_pairs(filename), key=_count_order)
+
+
+def _map_words(filenames: List[str], bounds: List[str], spill_paths: List[str]) -> None:
+    """
+    Map-задача: подсчитывает слова файлов в отдельной HashMap для каждого диапазона
+    и записывает каждую отсортированной в свой промежуточный файл
+    """
+    partials = [HashMap() for _ in spill_paths]
+    for filename in filenames:
+        for line in file_reader(filename):
+            word, count = line.split()
+            partials[bisect_right(bounds, word)].increment(word, int(count))
+    for partial, spill_path in zip(partials, spill_paths):
+        list_writer(partial.sorted_items(), spill_path)
+
+
+def _reduce_words(spill_paths: List[str], result_path: str, top_k: int = 0) -> List[Tuple[str, int]]:
+    """
+    Reduce-задача: объединяет отсортированные промежуточные файлы одного диапазона
+    :return: top_k самых частых слов диапазона
+    """
+    hierarchical_files_merge(*spill_paths, result_path=result_path)
+    return file_most_common(result_path, top_k) if top_k else []
+
+
+def mapreduce_files_merge(*filenames: str, result_path: str, workers: int = None,
+                          partitions: int = None, tmp_dir: str = None,
+                          top_k: int = 0) -> Optional[List[Tuple[str, int]]]:
+    """
+    Объединяет файлы слов по схеме map-reduce. Словарь делится на диапазоны первых букв
+    (partition_bounds); map-задачи считают слова своей части файлов в HashMap по диапазонам,
+    reduce-задачи объединяют результаты map-задач для каждого диапазона,
+    и отсортированные диапазоны склеиваются в result_path.
+    Результат совпадает с files_merge. Если задан top_k, каждая reduce-задача находит
+    самые частые слова своего диапазона; диапазоны не пересекаются, поэтому общий
+    top_k - лучшие из их top_k
+    :param filenames: итерируемый с именами файлов
+    :param result_path: файл, куда поместится результат
+    :param workers: количество процессов (None - по числу CPU, 1 - без пула)
+    :param partitions: количество диапазонов (None - по числу процессов)
+    :param tmp_dir: папка, в которой создается временная папка для промежуточных файлов
+    :param top_k: сколько самых частых слов вернуть (0 - не искать)
+    :return: top_k пар (слово, количество) по убыванию количества или None
+    """
+    filenames = list(filenames)
+    workers = workers or os.cpu_count() or 1
+    bounds = partition_bounds(filenames, partitions or workers)
+    tasks = min(workers * TASKS_PER_WORKER, len(filenames)) or 1
+    chunks = [filenames[index::tasks] for index in range(tasks)]
+    with tempfile.TemporaryDirectory(dir=tmp_dir) as run_dir:
+        spills = [[os.path.join(run_dir, f'map{task}_{part}.txt') for part in range(len(bounds) + 1)]
+                  for task in range(tasks)]
+        part_paths = [os.path.join(run_dir, f'part{part}.txt') for part in range(len(bounds) + 1)]
+        part_spills = [list(paths) for paths in zip(*spills)]
+        if workers > 1:
+            with ProcessPoolExecutor(workers) as executor:
+                list(executor.map(_map_words, chunks, [bounds] * tasks, spills))
+                part_tops = list(executor.map(_reduce_words, part_spills, part_paths,
+                                              [top_k] * len(part_paths)))
+        else:
+            for chunk, spill_paths in zip(chunks, spills):
+                _map_words(chunk, bounds, spill_paths)
+            part_tops = [_reduce_words(spill_paths, part_path, top_k)
+                         for spill_paths, part_path in zip(part_spills, part_paths)]
+        # диапазоны отсортированы и не пересекаются, поэтому результат - их склейка
+        with open(result_path, 'wb') as result:
+            for part_path in part_paths:
+                with open(part_path, 'rb') as part:
+                    shutil.copyfileobj(part, result, BUFFER_SIZE)
+    if not top_k:
+        return None
+    return heapq.nsmallest(top_k, (pair for part_top in part_tops for pair in part_top), key=_count_order)
+
+
 if __name__ == "__main__":
     pass
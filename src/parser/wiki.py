@@ -5,55 +5,206 @@
 """
 import re
 import os
+import mmap
 import time
+import queue
 import shutil
+import logging
 from urllib.request import urlopen
 from urllib.parse import unquote
 from concurrent.futures import ThreadPoolExecutor
 from multiprocessing import Pool
-from typing import List, Union
+from typing import Iterable, Iterator, List, Optional, Tuple, Type, Union
 from bs4 import BeautifulSoup
-from src.parser.file import list_writer, files_merge
+from bs4.builder import builder_registry
+from src.storage.inverted_index import add_articles
+from src.storage.sketches import SKETCH_FILENAME, WordSketch
+from src.storage.vocabulary import Vocabulary
+from src.parser.file import list_writer, links_reader, links_writer, mapreduce_files_merge
+from src.maps.base_map import BaseMap
 from src.maps.hash_map import HashMap
+from src.maps.space_saving import SpaceSaving
 
 ARTICLES_DIRECTORY = os.path.abspath('../../../../wiki/articles')  # место, где записываются данные статей
+INDEX_DIRECTORY = os.path.join(os.path.dirname(ARTICLES_DIRECTORY), 'index')  # инвертированный индекс статей
 WIKI_RANDOM = "https://ru.wikipedia.org/wiki/Special:Random"
 WIKI_DOMAIN = "https://ru.wikipedia.org"
+CONTENT_START = b'id="mw-content-text"'  # начало области статьи, нужной для слов и ссылок
+CONTENT_END = b'class="printfooter"'  # первый блок после области статьи
+LINKS_FILENAME = 'links.txt'  # файл с найденными в статье URL-адресами
+HTML_FEATURES = 'html.parser'  # построитель по умолчанию: результат не зависит от установленных пакетов
+WORKERS = 32  # количество потоков/процессов при многопоточном/многопроцессном анализе
+EXCLUDED_PHRASE = 'править | править код'  # текст ссылок редактирования, который не считается
+WORD_SPLITTERS = re.compile(r'|'.join((r'\s', r'\.', r'\!', r'\?', r',', r';',
+                                       re.escape(EXCLUDED_PHRASE),
+                                       r'\[', r'\]', r'\(', r'\)', r'\n', r'\\', r'\|')))
+TEXT_CHUNK_SIZE = 8192  # сколько символов текста статьи разбивается на слова за раз
+TOP_WORDS = 100  # сколько самых частых слов выводится после объединения
+ESTIMATE_WEIGHT = 0.25  # вес последней статьи в оценке количества различных слов
 
+logger = logging.getLogger(__name__)
 
-def count_words(html_txt: str, hash_map: HashMap) -> HashMap:
+
+class SizeEstimate:
     """
-    Подсчитывает слова в статье Википедии.
-    Хэш-таблица используется для подсчета слов. Ключ - это слово, а значение - номер слова в статье.
+    Скользящая (экспоненциально взвешенная) оценка количества различных слов статьи
+    по предыдущим статьям. Используется, чтобы map для подсчета слов сразу создавалась
+    нужного размера; в каждом процессе оценка своя
+    """
+    def __init__(self, weight: float = ESTIMATE_WEIGHT):
+        self.weight = weight
+        self.value = 0
+
+    def update(self, size: int) -> None:
+        """Учитывает количество слов очередной статьи"""
+        if self.value:
+            self.value = round(self.value + self.weight * (size - self.value))
+        else:
+            self.value = size
+
+
+article_words = SizeEstimate()
+
+
+def content_region(content) -> Tuple[int, int]:
+    """
+    Находит в html-байтах статьи область блока mw-content-text.
+    Блок начинается с тега <div id="mw-content-text"> и заканчивается перед
+    <div class="printfooter">. Если разметка не найдена, областью считается весь текст
+    :param content: html-текст вики-статьи в байтах (bytes или mmap)
+    :return: начало и конец области
+    """
+    start = content.find(CONTENT_START)
+    if start < 0:
+        return 0, len(content)
+    start = max(content.rfind(b'<div', 0, start), 0)
+    end = content.find(CONTENT_END, start)
+    if end < 0:
+        return start, len(content)
+    return start, content.rfind(b'<div', start, end)
+
+
+def read_content(content_path: str) -> Tuple[str, int]:
+    """
+    Отображает content.txt в память и декодирует только область mw-content-text
+    :param content_path: путь к файлу с содержимым статьи
+    :return: html области статьи и количество декодированных байт
+    """
+    with open(content_path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return '', 0
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as content:
+            start, end = content_region(content)
+            html = content[start:end].decode()
+            logger.info('%s: decoded %d of %d bytes', content_path, end - start, len(content))
+    return html, end - start
+
+
+def fast_features() -> str:
+    """
+    Выбирает самый быстрый установленный построитель дерева для BeautifulSoup:
+    lxml, если он установлен, иначе html.parser. По умолчанию lxml не используется,
+    его нужно явно передать в features (например, multi_parsing или crawl)
+    :return: название построителя
+    """
+    if builder_registry.lookup('lxml') is not None:
+        return 'lxml'
+    return HTML_FEATURES
+
+
+def content_block(html_txt: str, features: str = None):
+    """
+    Разбирает html один раз и возвращает блок с текстом статьи
     :param html_txt: html-текст вики-статьи
+    :param features: построитель дерева BeautifulSoup (по умолчанию HTML_FEATURES)
+    :return: тег div внутри mw-content-text
+    """
+    soup = BeautifulSoup(html_txt, features or HTML_FEATURES)
+    return soup.find(id="mw-content-text").div
+
+
+def _phrase_prefix_start(text: str) -> int:
+    """
+    Находит начало самого длинного конца text, с которого может начинаться EXCLUDED_PHRASE
+    :param text: текст
+    :return: индекс начала или len(text), если такого конца нет
+    """
+    index = text.find(EXCLUDED_PHRASE[0], max(len(text) - len(EXCLUDED_PHRASE) + 1, 0))
+    while index >= 0:
+        if EXCLUDED_PHRASE.startswith(text[index:]):
+            return index
+        index = text.find(EXCLUDED_PHRASE[0], index + 1)
+    return len(text)
+
+
+def _text_chunks(strings: Iterable[str], chunk_size: int) -> Iterator[str]:
+    """Склеивает подряд идущие куски текста в порции примерно по chunk_size символов"""
+    pending = []
+    size = 0
+    for string in strings:
+        pending.append(string)
+        size += len(string)
+        if size >= chunk_size:
+            yield ''.join(pending)
+            pending.clear()
+            size = 0
+    if pending:
+        yield ''.join(pending)
+
+
+def iter_words(strings: Iterable[str], chunk_size: int = TEXT_CHUNK_SIZE) -> Iterator[str]:
+    """
+    Лениво разбивает текст, заданный кусками (текстовыми узлами), на слова.
+    Результат такой же, как у re.split(WORD_SPLITTERS, ''.join(strings)) с отбором
+    буквенных слов, но весь текст не собирается в одну строку: куски обрабатываются
+    порциями по chunk_size символов, а между порциями хранится только незаконченное
+    слово (и начало EXCLUDED_PHRASE, если порция может на нем обрываться)
+    :param strings: куски текста
+    :param chunk_size: размер порции в символах
+    :return: итератор по словам в нижнем регистре
+    """
+    carry = ''
+    for chunk in _text_chunks(strings, chunk_size):
+        text = carry + chunk
+        limit = _phrase_prefix_start(text)
+        words = WORD_SPLITTERS.split(text[:limit])
+        # последний кусок может продолжиться в следующей порции
+        carry = words.pop() + text[limit:]
+        for word in words:
+            if word.isalpha():  # чтобы подсчитать числа, isalpha следует изменить на isalnum
+                yield word.lower()
+    if carry.isalpha():
+        yield carry.lower()
+
+
+def count_block_words(main_txt, hash_map: BaseMap, heavy_hitters: SpaceSaving = None,
+                      vocabulary: Vocabulary = None) -> BaseMap:
+    """
+    Подсчитывает слова в уже разобранном блоке статьи
+    :param main_txt: блок статьи (результат content_block)
     :param hash_map: хэш-таблица для записи результатов
+    :param heavy_hitters: сводка самых частых слов, через которую дополнительно проходит поток слов
+    :param vocabulary: общий словарь; если задан, ключи хэш-таблицы - id слов, а не строки
     :return: хэш-таблица (ключ, значение = слово, количество слов)
     """
-    soup = BeautifulSoup(html_txt, 'html.parser')
-    main_txt = soup.find(id="mw-content-text").div
-    splitters = (r'\s', r'\.', r'\!', r'\?', r',', r';',
-                 r'править \| править код',
-                 r'\[', r'\]', r'\(', r'\)', r'\n', r'\\', r'\|')
-    splitters = r'|'.join(splitters)  # при этом строки слов будут разделены
-    words = re.split(splitters, main_txt.get_text())
-    for word in words:
-        if word != '' and word.isalpha():  # чтобы подсчитать числа, isalpha следует изменить на isalnum
-            lower_word = word.lower()
-            hash_map[lower_word] = hash_map.get(lower_word, 0) + 1
+    words = iter_words(main_txt.strings)
+    if heavy_hitters is not None:
+        words = heavy_hitters.observe(words)
+    if vocabulary is not None:
+        words = vocabulary.encode(words)
+    hash_map.bulk_add(words)
     return hash_map
 
 
-def get_urls(html_txt: str, max_urls=-1) -> list:
+def block_urls(main_txt, max_urls=-1) -> list:
     """
-    В данной статье википедии находятся ссылки на другие статьи википедии
-    :param html_txt: html-текст вики-статьи
+    Находит ссылки на другие статьи в уже разобранном блоке статьи
+    :param main_txt: блок статьи (результат content_block)
     :param max_urls: количество требуемых URL-адресов (default "-1" означает "all")
     :return: набор URL-адресов (list)
     """
     url_set = set()
     urls = 0
-    soup = BeautifulSoup(html_txt, 'html.parser')
-    main_txt = soup.find(id="mw-content-text").div
     for link in main_txt.find_all('a'):
         article_link = link.get('href')
         if article_link is not None and url_is_valid(article_link):
@@ -65,6 +216,47 @@ def get_urls(html_txt: str, max_urls=-1) -> list:
     return list(url_set)
 
 
+def count_words(html_txt: str, hash_map: BaseMap, features: str = None,
+                heavy_hitters: SpaceSaving = None, vocabulary: Vocabulary = None) -> BaseMap:
+    """
+    Подсчитывает слова в статье Википедии.
+    Хэш-таблица используется для подсчета слов. Ключ - это слово, а значение - номер слова в статье.
+    :param html_txt: html-текст вики-статьи
+    :param hash_map: хэш-таблица для записи результатов
+    :param features: построитель дерева BeautifulSoup
+    :param heavy_hitters: сводка самых частых слов (например, общая для нескольких статей)
+    :param vocabulary: общий словарь; если задан, слова считаются по их id
+    :return: хэш-таблица (ключ, значение = слово, количество слов)
+    """
+    return count_block_words(content_block(html_txt, features), hash_map, heavy_hitters, vocabulary)
+
+
+def get_urls(html_txt: str, max_urls=-1, features: str = None) -> list:
+    """
+    В данной статье википедии находятся ссылки на другие статьи википедии
+    :param html_txt: html-текст вики-статьи
+    :param max_urls: количество требуемых URL-адресов (default "-1" означает "all")
+    :param features: построитель дерева BeautifulSoup
+    :return: набор URL-адресов (list)
+    """
+    return block_urls(content_block(html_txt, features), max_urls)
+
+
+def analyze_article(html_txt: str, hash_map: BaseMap, max_urls=-1,
+                    features: str = None, heavy_hitters: SpaceSaving = None) -> Tuple[BaseMap, list]:
+    """
+    Разбирает статью один раз и подсчитывает слова и находит ссылки
+    :param html_txt: html-текст вики-статьи
+    :param hash_map: хэш-таблица для записи результатов
+    :param max_urls: количество требуемых URL-адресов (default "-1" означает "all")
+    :param features: построитель дерева BeautifulSoup
+    :param heavy_hitters: сводка самых частых слов
+    :return: хэш-таблица со словами и набор URL-адресов
+    """
+    main_txt = content_block(html_txt, features)
+    return count_block_words(main_txt, hash_map, heavy_hitters), block_urls(main_txt, max_urls)
+
+
 def url_is_valid(url: str) -> bool:
     """
     Проверяет, ведет ли URL-адрес на другую статью в Википедии
@@ -81,69 +273,158 @@ def url_is_valid(url: str) -> bool:
     return True
 
 
-def multi_parsing(url: str, mode: Union[ThreadPoolExecutor, Pool], depth: int = 0) -> None:
+def _submit(executor, url: str, depth: int, results: queue.Queue, *args) -> None:
     """
-    Анализирует статьи из базовых статей (найденные ссылки) и может повторяться несколько раз
+    Отправляет статью в пул; когда она обработана, в results кладется (глубина, результат
+    parse_article), а если при обработке произошла ошибка - (глубина, None).
+    Запись в results выполняется в finally, поэтому даже ошибка в самом обратном вызове
+    не оставит multi_parsing ждать вечно.
+    Поддерживает как concurrent.futures (submit), так и multiprocessing.Pool (apply_async)
+    :param args: остальные аргументы parse_article
+    """
+    def done(result):
+        results.put((depth, result))
+
+    def failed(error):
+        try:
+            logger.warning('%s: %s', url, error)
+        finally:
+            results.put((depth, None))
+
+    def finished(future):
+        result = None
+        try:
+            error = future.exception()
+            if error is not None:
+                logger.warning('%s: %s', url, error)
+            else:
+                result = future.result()
+        finally:
+            results.put((depth, result))
+
+    if hasattr(executor, 'submit'):
+        executor.submit(parse_article, url, *args).add_done_callback(finished)
+    else:
+        executor.apply_async(parse_article, (url, *args), callback=done, error_callback=failed)
+
+
+def multi_parsing(url: str, mode: Union[ThreadPoolExecutor, Pool], depth: int = 0,
+                  workers: int = WORKERS, base_path=ARTICLES_DIRECTORY,
+                  map_type: Type[BaseMap] = HashMap, sketches: bool = False,
+                  features: str = None) -> int:
+    """
+    Анализирует статьи из базовых статей (найденные ссылки) и может повторяться несколько раз.
+    Статьи обрабатываются одним пулом через очередь: как только статья обработана, найденные
+    в ней новые ссылки сразу отправляются в пул, не дожидаясь остальных статей той же глубины.
+    Каждая статья (по заголовку) отправляется в пул не больше одного раза; заголовок
+    случайной статьи становится известен только после ее загрузки
     :param url: ссылка на базовую статью
     :param mode: multi[threading|processing]
     :param depth: depth of parsing
-    :return: None
+    :param workers: количество потоков/процессов
+    :param base_path: путь, куда записывать файлы с содержимым и т.д.
+    :param map_type: класс map для подсчета слов
+    :param sketches: записывать приближенную статистику статей (sketch.bin)
+    :param features: построитель дерева BeautifulSoup (по умолчанию HTML_FEATURES, см. fast_features)
+    :return: количество обработанных статей (без статей, при обработке которых произошла ошибка)
     """
-    curr_urls = [[url]]
-    for _ in range(depth+1):
-        curr_urls = [new_url for urls in curr_urls for new_url in urls]
-        with mode(32) as executor:
-            curr_urls = executor.map(wiki_parser, curr_urls)
+    results = queue.Queue()
+    seen = {article_heading(url)}
+    processed = 0
+    with mode(workers) as executor:
+        _submit(executor, url, 0, results, base_path, map_type, sketches, features)
+        pending = 1
+        while pending:
+            page_depth, result = results.get()
+            pending -= 1
+            if result is None:
+                continue
+            heading, urls = result
+            seen.add(heading)  # настоящий заголовок статьи Special:Random
+            processed += 1
+            if page_depth >= depth:
+                continue
+            for new_url in urls:
+                heading = article_heading(new_url)
+                if heading not in seen:
+                    seen.add(heading)
+                    _submit(executor, new_url, page_depth + 1, results, base_path, map_type, sketches,
+                            features)
+                    pending += 1
+    return processed
 
 
-def wiki_parser(url: str, base_path=ARTICLES_DIRECTORY) -> List[str]:
+def article_heading(url: str) -> str:
     """
-    1) Получает заголовок статьи из URL-адреса
-    2) Если папка с таким заголовком, URL, содержимым, файлами word существует,
-    то считывает содержимое и возвращает URL-адреса из содержимого, остальное идет дальше
-    3) Отправляет запрос, получает содержимое страницы и URL-адрес
-    4) Если папка не существует, функция создает каталог (заголовок его имени) и записывает в url
-    5) Если файл содержимого не существует, он будет записан в двоичный файл
-    6) Если файл words не существует, слова будут подсчитаны (в алфавитном порядке) и записаны
-    7) Получает URL-адреса из содержимого (сначала оно декодируется) и возвращает их
-
+    Получает заголовок статьи (имя ее папки) из URL-адреса
     :param url: ссылка на статью
-    :param base_path: путь, куда записывать файлы с содержимым и т.д.
-    :return: список с найденными URL-адресами wiki (list)
+    :return: заголовок
     """
     heading = unquote(url).split('/wiki/')[-1].replace('_', ' ')
-
-    # проверяет, ведет ли URL-адрес к случайной статье
-    is_random = False
     if heading == 'Special:Random':
-        is_random = True
-        with urlopen(url) as response:
-            curr_url = response.geturl()
-            heading = unquote(curr_url).replace('_', ' ').split('/wiki/')[-1]
-            content = response.read()
+        return heading
+    return heading.replace('?', '(q.mark)')
 
-    heading = heading.replace('?', '(q.mark)')
 
-    # проверяет, существует ли уже папка статьи
-    folder_exists = heading in os.listdir(base_path)
+def cached_article_urls(heading: str, base_path=ARTICLES_DIRECTORY,
+                        features: str = None) -> Optional[List[str]]:
+    """
+    Если папка с таким заголовком, URL, содержимым, файлами word существует,
+    то возвращает сохраненные в links.txt URL-адреса (если links.txt нет, то URL-адреса
+    находятся в содержимом и сохраняются)
+    :param heading: заголовок статьи
+    :param base_path: путь к папке со статьями
+    :param features: построитель дерева BeautifulSoup
+    :return: список URL-адресов или None, если статья еще не сохранена
+    """
     current_path = os.path.join(base_path, heading)
-
     url_path = os.path.join(current_path, 'url.txt')
     content_path = os.path.join(current_path, 'content.txt')
     words_path = os.path.join(current_path, 'words.txt')
+    links_path = os.path.join(current_path, LINKS_FILENAME)
 
-    if folder_exists and os.path.exists(url_path) \
-            and os.path.exists(content_path) and os.path.exists(words_path):
-        with open(content_path, 'r', encoding='utf8') as file:
-            html = file.read()
-        return get_urls(html)
+    if os.path.exists(url_path) and os.path.exists(content_path) and os.path.exists(words_path):
+        if os.path.exists(links_path):
+            return links_reader(links_path)
+        html, _ = read_content(content_path)
+        urls = get_urls(html, features=features)
+        links_writer(urls, links_path)
+        return urls
+    return None
 
-    if not is_random:
-        with urlopen(url) as response:
-            content = response.read()
-            curr_url = response.geturl()
 
-    html = content.decode()
+def save_article(heading: str, curr_url: str, content: bytes,
+                 base_path=ARTICLES_DIRECTORY, map_type: Type[BaseMap] = HashMap,
+                 sketches: bool = False, features: str = None) -> List[str]:
+    """
+    Сохраняет скачанную статью и возвращает ссылки из нее:
+    1) Если папка не существует, функция создает каталог (заголовок его имени) и записывает в url
+    2) Если файл содержимого не существует, он будет записан в двоичный файл
+    3) Если файл words не существует, слова будут подсчитаны (в алфавитном порядке) и записаны
+    4) Получает URL-адреса из содержимого (сначала оно декодируется; если слова считались
+    в (3), то html разбирается один раз для слов и ссылок), записывает их в links.txt и возвращает их
+
+    :param heading: заголовок статьи
+    :param curr_url: URL-адрес статьи после перенаправлений
+    :param content: содержимое страницы
+    :param base_path: путь, куда записывать файлы с содержимым и т.д.
+    :param map_type: класс map для подсчета слов (HashMap, OpenHashMap, ...)
+    :param sketches: вместе со словами записать приближенную статистику (sketch.bin); она строится
+    по уже посчитанной map (один хэш на различное слово) и только добавляет файл в папку статьи:
+    память на статью не уменьшается, экономия - при объединении сводок корпуса (corpus_sketch)
+    :param features: построитель дерева BeautifulSoup
+    :return: список с найденными URL-адресами wiki (list)
+    """
+    folder_exists = heading in os.listdir(base_path)
+    current_path = os.path.join(base_path, heading)
+
+    url_path = os.path.join(current_path, 'url.txt')
+    content_path = os.path.join(current_path, 'content.txt')
+    words_path = os.path.join(current_path, 'words.txt')
+    links_path = os.path.join(current_path, LINKS_FILENAME)
+
+    start, end = content_region(content)
+    html = content[start:end].decode()
 
     # если URL-адрес новый, то файл с ним записывается
     if not folder_exists:
@@ -160,17 +441,105 @@ def wiki_parser(url: str, base_path=ARTICLES_DIRECTORY) -> List[str]:
         with open(content_path, 'wb') as file:
             file.write(content)
 
-    # если слова не были вычислены, то подчитываем их
+    # если слова не были вычислены, то подчитываем их и находим URL-адреса за один разбор html
     if not os.path.exists(words_path):
-        hash_map = HashMap()
-        count_words(html, hash_map)
-        list_writer(hash_map.sort(), words_path)  # записывает все вычисленные слова в файл
+        hash_map = map_type()
+        hash_map.reserve(article_words.value)
+        _, urls = analyze_article(html, hash_map, features=features)
+        article_words.update(len(hash_map))
+        list_writer(hash_map.sorted_items(), words_path)  # записывает все вычисленные слова в файл
+        if sketches:
+            sketch = WordSketch()
+            sketch.update(hash_map.items())
+            sketch.write(os.path.join(current_path, SKETCH_FILENAME))
+    else:
+        urls = get_urls(html, features=features)
 
-    # получаем URL-адреса из статьи
-    return get_urls(html)
+    # сохраняем URL-адреса, чтобы не разбирать html повторно
+    links_writer(urls, links_path)
+    return urls
+
+
+def parse_article(url: str, base_path=ARTICLES_DIRECTORY, map_type: Type[BaseMap] = HashMap,
+                  sketches: bool = False, features: str = None) -> Tuple[str, List[str]]:
+    """
+    1) Получает заголовок статьи из URL-адреса
+    2) Если статья уже сохранена, возвращает ее URL-адреса (cached_article_urls),
+    остальное идет дальше
+    3) Отправляет запрос, получает содержимое страницы и URL-адрес
+    4) Сохраняет статью и возвращает URL-адреса из нее (save_article)
+
+    :param url: ссылка на статью
+    :param base_path: путь, куда записывать файлы с содержимым и т.д.
+    :param map_type: класс map для подсчета слов (HashMap, OpenHashMap, ...)
+    :param sketches: записывать приближенную статистику статьи (sketch.bin)
+    :param features: построитель дерева BeautifulSoup
+    :return: заголовок статьи (для Special:Random - заголовок найденной статьи)
+    и список с найденными URL-адресами wiki
+    """
+    heading = article_heading(url)
+
+    # проверяет, ведет ли URL-адрес к случайной статье
+    is_random = False
+    if heading == 'Special:Random':
+        is_random = True
+        with urlopen(url) as response:
+            curr_url = response.geturl()
+            heading = article_heading(curr_url)
+            content = response.read()
+
+    # проверяет, сохранена ли уже статья
+    urls = cached_article_urls(heading, base_path, features)
+    if urls is not None:
+        return heading, urls
+
+    if not is_random:
+        with urlopen(url) as response:
+            content = response.read()
+            curr_url = response.geturl()
+
+    return heading, save_article(heading, curr_url, content, base_path, map_type, sketches, features)
+
+
+def wiki_parser(url: str, base_path=ARTICLES_DIRECTORY, map_type: Type[BaseMap] = HashMap,
+                sketches: bool = False, features: str = None) -> List[str]:
+    """
+    Обрабатывает статью (parse_article) и возвращает найденные в ней URL-адреса
+    :param url: ссылка на статью
+    :param base_path: путь, куда записывать файлы с содержимым и т.д.
+    :param map_type: класс map для подсчета слов (HashMap, OpenHashMap, ...)
+    :param sketches: записывать приближенную статистику статьи (sketch.bin)
+    :param features: построитель дерева BeautifulSoup
+    :return: список с найденными URL-адресами wiki (list)
+    """
+    _, urls = parse_article(url, base_path, map_type, sketches, features)
+    return urls
+
+
+def rebuild_links_index(base_path=ARTICLES_DIRECTORY, overwrite=False, features: str = None) -> int:
+    """
+    Создает links.txt для сохраненных статей по их content.txt
+    :param base_path: путь к папке со статьями
+    :param overwrite: пересоздать links.txt, даже если он уже есть
+    :param features: построитель дерева BeautifulSoup
+    :return: количество записанных файлов links.txt
+    """
+    written = 0
+    for folder in os.listdir(base_path):
+        content_path = os.path.join(base_path, folder, 'content.txt')
+        links_path = os.path.join(base_path, folder, LINKS_FILENAME)
+        if not os.path.exists(content_path):
+            continue
+        if overwrite or not os.path.exists(links_path):
+            html, _ = read_content(content_path)
+            links_writer(get_urls(html, features=features), links_path)
+            written += 1
+    return written
 
 
 if __name__ == '__main__':
+    from src.parser import async_crawler
+
     shutil.rmtree(ARTICLES_DIRECTORY)
     os.mkdir(ARTICLES_DIRECTORY)
 
@@ -191,9 +560,26 @@ if __name__ == '__main__':
 
     print(len(os.listdir(ARTICLES_DIRECTORY)))
 
+    shutil.rmtree(ARTICLES_DIRECTORY)
+    os.mkdir(ARTICLES_DIRECTORY)
+
+    print('Parsing using asyncio')
+    start = time.time()
+    async_crawler.async_parsing(WIKI_RANDOM, depth=1)
+    print(time.time() - start)
+
+    print(len(os.listdir(ARTICLES_DIRECTORY)))
+
     print('Merging')
     start = time.time()
-    files_merge(*(f'{ARTICLES_DIRECTORY}/{folder}/words.txt'
-                  for folder in os.listdir(ARTICLES_DIRECTORY)),
-                result_path='res.txt')
+    top_words = mapreduce_files_merge(*(f'{ARTICLES_DIRECTORY}/{folder}/words.txt'
+                                        for folder in os.listdir(ARTICLES_DIRECTORY)),
+                                      result_path='res.txt', workers=os.cpu_count(), top_k=TOP_WORDS)
+    print(time.time() - start)
+    print(' '.join(f'{word}:{count}' for word, count in top_words))
+
+    print('Indexing')
+    start = time.time()
+    shutil.rmtree(INDEX_DIRECTORY, ignore_errors=True)  # статьи скачаны заново
+    add_articles(ARTICLES_DIRECTORY, INDEX_DIRECTORY)
     print(time.time() - start)
@@ -0,0 +1,6 @@
+from src.storage import block_io
+from src.storage import counts
+from src.storage import inverted_index
+from src.storage import sketches
+from src.storage import totals
+from src.storage import vocabulary
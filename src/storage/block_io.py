@@ -0,0 +1,88 @@
+"""
+Блочный ввод-вывод строк.
+Строки читаются и записываются пачками с большим буфером,
+чтобы не платить за вызов readline/write на каждую строку
+"""
+from itertools import islice
+from typing import Iterable, Iterator, List, Tuple
+
+BUFFER_SIZE = 1 << 20  # размер буфера файла и блока чтения в байтах
+BATCH_SIZE = 8192  # сколько строк накапливается перед записью одним вызовом write
+
+
+def block_reader(filename: str, buffer_size: int = BUFFER_SIZE) -> Iterator[List[str]]:
+    """
+    Считывает файл блоками строк
+    :param filename: имя файла
+    :param buffer_size: примерный размер блока в байтах
+    :return: итератор по спискам строк (строки с '\\n' на конце)
+    """
+    with open(filename, 'r', encoding='utf8', buffering=buffer_size) as file:
+        lines = file.readlines(buffer_size)
+        while lines:
+            yield lines
+            lines = file.readlines(buffer_size)
+
+
+def count_lines(filename: str, buffer_size: int = BUFFER_SIZE) -> int:
+    """
+    Считает строки файла, не декодируя его (для заблаговременного выделения места)
+    :param filename: имя файла
+    :param buffer_size: размер блока чтения в байтах
+    :return: количество строк
+    """
+    count = 0
+    last = b'\n'
+    with open(filename, 'rb') as file:
+        block = file.read(buffer_size)
+        while block:
+            count += block.count(b'\n')
+            last = block[-1:]
+            block = file.read(buffer_size)
+    return count if last == b'\n' else count + 1
+
+
+class BlockWriter:
+    """
+    Записывает строки в файл пачками: пачка склеивается и пишется одним вызовом write,
+    что быстрее, чем writelines (он вызывает write для каждой строки).
+    Используется как контекстный менеджер
+    """
+    def __init__(self, filename: str, mode: str = 'w',
+                 batch_size: int = BATCH_SIZE, buffer_size: int = BUFFER_SIZE):
+        self._file = open(filename, mode, encoding='utf8', buffering=buffer_size)
+        self._batch_size = batch_size
+        self._lines = []
+
+    def __enter__(self) -> 'BlockWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def write(self, line: str) -> None:
+        """Добавляет строку в пачку (строка должна заканчиваться на '\\n')"""
+        self._lines.append(line)
+        if len(self._lines) >= self._batch_size:
+            self.flush()
+
+    def write_pairs(self, pairs: Iterable[Tuple[str, int]]) -> None:
+        """Записывает пары (ключ, значение) строками 'ключ значение\\n'"""
+        self.flush()
+        pairs = iter(pairs)
+        batch = [f'{key} {value}\n' for key, value in islice(pairs, self._batch_size)]
+        while batch:
+            self._file.write(''.join(batch))
+            batch = [f'{key} {value}\n' for key, value in islice(pairs, self._batch_size)]
+
+    def flush(self) -> None:
+        """Сбрасывает накопленную пачку в файл"""
+        if self._lines:
+            self._file.write(''.join(self._lines))
+            self._lines.clear()
+
+    def close(self) -> None:
+        """Сбрасывает пачку и закрывает файл"""
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
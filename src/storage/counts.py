@@ -0,0 +1,248 @@
+"""
+Компактный бинарный формат счетчиков слов статьи (words.bin).
+Файл состоит из заголовка, массива количеств, массива смещений слов
+и отсортированного блока слов в UTF-8:
+
+    заголовок: magic (4 байта), версия (2), резерв (2), количество слов n (4), размер блока (4)
+    количества: n чисел uint64 (сразу после заголовка, выровнены по 8 байт;
+                общие количества после объединения могут быть больше 2^32)
+    смещения:  n + 1 чисел uint32 - начало каждого слова в блоке слов
+    блок слов: слова в UTF-8 подряд, отсортированные по возрастанию
+
+Все числа little-endian. Порядок байтов UTF-8 совпадает с порядком строк в Python,
+поэтому поиск и объединение работают прямо с байтами, без декодирования
+"""
+import os
+import sys
+import mmap
+import heapq
+import struct
+import tempfile
+from array import array
+from operator import itemgetter
+from typing import Iterable, Iterator, Tuple
+from src.storage.block_io import BlockWriter, block_reader
+
+MAGIC = b'WCNT'
+VERSION = 2  # в версии 1 количества были uint32
+HEADER = struct.Struct('<4sHHII')
+COUNTS_FILENAME = 'words.bin'
+
+
+def _numbers_array(buffer, start: int, end: int, typecode: str) -> memoryview:
+    """
+    Представляет байты [start, end) как массив чисел typecode ('I' или 'Q')
+    без копирования (на little-endian машинах)
+    """
+    if sys.byteorder == 'little':
+        return memoryview(buffer)[start:end].cast(typecode)
+    numbers = array(typecode, buffer[start:end])
+    numbers.byteswap()
+    return memoryview(numbers)
+
+
+def _uint32_array(buffer, start: int, end: int) -> memoryview:
+    """Представляет байты [start, end) как массив uint32 без копирования (на little-endian машинах)"""
+    return _numbers_array(buffer, start, end, 'I')
+
+
+def _uint64_array(buffer, start: int, end: int) -> memoryview:
+    """Представляет байты [start, end) как массив uint64 без копирования (на little-endian машинах)"""
+    return _numbers_array(buffer, start, end, 'Q')
+
+
+def _write_raw(pairs: Iterable[Tuple[bytes, int]], path: str) -> None:
+    """
+    Записывает отсортированные пары (слово в UTF-8, количество) в бинарный файл.
+    Файл пишется во временный и затем переименовывается, поэтому при ошибке
+    (например, количество больше 2^64 - 1) прежний файл не портится
+    """
+    blob = bytearray()
+    offsets = array('I', [0])
+    counts = array('Q')
+    for word, count in pairs:
+        blob += word
+        offsets.append(len(blob))
+        counts.append(count)
+    if sys.byteorder != 'little':
+        offsets.byteswap()
+        counts.byteswap()
+    descriptor, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=os.path.dirname(path) or '.')
+    try:
+        with os.fdopen(descriptor, 'wb') as file:
+            file.write(HEADER.pack(MAGIC, VERSION, 0, len(counts), len(blob)))
+            file.write(counts.tobytes())
+            file.write(offsets.tobytes())
+            file.write(blob)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def write_counts(pairs: Iterable[Tuple[str, int]], path: str) -> None:
+    """
+    Записывает пары (слово, количество) в бинарный файл
+    :param pairs: пары (например, map.items()), порядок не важен
+    :param path: путь к файлу
+    :return: None
+    """
+    pairs = sorted(pairs, key=itemgetter(0))
+    _write_raw(((word.encode('utf8'), int(count)) for word, count in pairs), path)
+
+
+class CountsFile:
+    """
+    Счетчики слов из бинарного файла, отображенного в память через mmap.
+    Файл не разбирается при открытии: слова декодируются только при обращении к ним
+    """
+    def __init__(self, path: str):
+        with open(path, 'rb') as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, size, blob_size = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or version != VERSION:
+            self._mmap.close()
+            raise ValueError(f'{path} is not a word counts file')
+        self._size = size
+        counts_start = HEADER.size
+        offsets_start = counts_start + 8 * size
+        self._blob_start = offsets_start + 4 * (size + 1)
+        if self._blob_start + blob_size > len(self._mmap):
+            self._mmap.close()
+            raise ValueError(f'{path} is truncated')
+        self._counts = _uint64_array(self._mmap, counts_start, offsets_start)
+        self._offsets = _uint32_array(self._mmap, offsets_start, self._blob_start)
+
+    def __enter__(self) -> 'CountsFile':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def word_bytes(self, index: int) -> bytes:
+        """Возвращает слово с номером index в UTF-8"""
+        start = self._blob_start + self._offsets[index]
+        return self._mmap[start:self._blob_start + self._offsets[index + 1]]
+
+    def word(self, index: int) -> str:
+        """Возвращает слово с номером index"""
+        return self.word_bytes(index).decode('utf8')
+
+    def count(self, index: int) -> int:
+        """Возвращает количество слова с номером index"""
+        return self._counts[index]
+
+    def find(self, word: str) -> int:
+        """
+        Бинарный поиск слова
+        :return: номер слова или -1, если слова нет
+        """
+        key = word.encode('utf8')
+        low, high = 0, self._size
+        while low < high:
+            middle = (low + high) // 2
+            if self.word_bytes(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self._size and self.word_bytes(low) == key:
+            return low
+        return -1
+
+    def __getitem__(self, word: str) -> int:
+        index = self.find(word)
+        if index < 0:
+            raise KeyError('Such key does not exist')
+        return self._counts[index]
+
+    def __contains__(self, word: str) -> bool:
+        return self.find(word) >= 0
+
+    def get(self, word: str, default=None) -> int:
+        """Возвращает количество слова или default"""
+        index = self.find(word)
+        return default if index < 0 else self._counts[index]
+
+    def raw_items(self) -> Iterator[Tuple[bytes, int]]:
+        """Итерация по парам (слово в UTF-8, количество) в порядке слов"""
+        for index in range(self._size):
+            yield self.word_bytes(index), self._counts[index]
+
+    def __iter__(self) -> Iterator[Tuple[str, int]]:
+        for word, count in self.raw_items():
+            yield word.decode('utf8'), count
+
+    items = __iter__
+
+    def close(self) -> None:
+        """Освобождает отображение файла"""
+        if not self._mmap.closed:
+            self._offsets.release()
+            self._counts.release()
+            self._mmap.close()
+
+
+def counts_merge(*filenames: str, result_path: str) -> None:
+    """
+    Объединяет несколько бинарных файлов счетчиков в один, суммируя количества.
+    Слова сравниваются как байты и не декодируются
+    :param filenames: пути к файлам words.bin
+    :param result_path: файл, куда поместится результат
+    :return: None
+    """
+    counts_files = [CountsFile(filename) for filename in filenames]
+    try:
+        merged = heapq.merge(*(counts_file.raw_items() for counts_file in counts_files),
+                             key=itemgetter(0))
+
+        def summed():
+            current_word, current_count = None, 0
+            for word, count in merged:
+                if word == current_word:
+                    current_count += count
+                    continue
+                if current_word is not None:
+                    yield current_word, current_count
+                current_word, current_count = word, count
+            if current_word is not None:
+                yield current_word, current_count
+
+        _write_raw(summed(), result_path)
+    finally:
+        for counts_file in counts_files:
+            counts_file.close()
+
+
+def words_to_counts(words_path: str, counts_path: str) -> None:
+    """Конвертирует words.txt (строки 'слово количество') в бинарный формат"""
+    pairs = []
+    for lines in block_reader(words_path):
+        for line in lines:
+            word, count = line.split()
+            pairs.append((word, int(count)))
+    write_counts(pairs, counts_path)
+
+
+def counts_to_words(counts_path: str, words_path: str) -> None:
+    """Конвертирует бинарный файл счетчиков обратно в words.txt"""
+    with CountsFile(counts_path) as counts_file, BlockWriter(words_path) as writer:
+        writer.write_pairs(counts_file)
+
+
+def convert_articles(base_path: str) -> int:
+    """
+    Создает words.bin рядом с каждым words.txt в папках статей, где его еще нет
+    :param base_path: папка со статьями
+    :return: количество сконвертированных статей
+    """
+    converted = 0
+    for folder in os.listdir(base_path):
+        words_path = os.path.join(base_path, folder, 'words.txt')
+        counts_path = os.path.join(base_path, folder, COUNTS_FILENAME)
+        if os.path.exists(words_path) and not os.path.exists(counts_path):
+            words_to_counts(words_path, counts_path)
+            converted += 1
+    return converted
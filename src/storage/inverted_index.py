@@ -0,0 +1,319 @@
+"""
+Инвертированный индекс по сохраненным статьям: слово -> список (статья, количество).
+Индекс - это папка с манифестом и сегментами. Каждый вызов add_articles
+индексирует только новые папки статей и записывает их в новый сегмент,
+старые сегменты не перестраиваются; compact объединяет все сегменты в один.
+
+Манифест (manifest.txt) - строки 'segment <имя файла>' и 'article <папка>';
+номер статьи (article id) - порядковый номер ее строки среди строк 'article'.
+Манифест заменяется атомарно (os.replace), поэтому индекс всегда согласован.
+
+Сегмент - бинарный файл, отображаемый в память через mmap:
+
+    заголовок: magic (4 байта), версия (2), резерв (2), количество слов n (4),
+               количество записей m (4), размер блока слов (4)
+    смещения слов:   n + 1 чисел uint32 - начало каждого слова в блоке слов
+    начала списков:  n + 1 чисел uint32 - номер первой записи слова
+    записи:          m пар uint32 (article id, количество), по возрастанию id
+    блок слов:       слова в UTF-8 подряд, отсортированные по возрастанию
+
+Все числа little-endian. Статьи сегментов не пересекаются, и id в каждом
+следующем сегменте больше, поэтому списки слова из разных сегментов просто
+склеиваются в порядке сегментов
+"""
+import os
+import sys
+import mmap
+import heapq
+import struct
+from array import array
+from itertools import groupby
+from operator import itemgetter
+from typing import Iterable, Iterator, List, Tuple
+from src.storage.block_io import block_reader
+from src.storage.counts import _uint32_array
+
+MAGIC = b'WIDX'
+VERSION = 1
+HEADER = struct.Struct('<4sHHIII')
+MANIFEST_FILENAME = 'manifest.txt'
+WORDS_FILENAME = 'words.txt'
+
+
+def _write_segment(terms: Iterable[Tuple[bytes, array]], path: str) -> int:
+    """
+    Записывает сегмент из отсортированных пар (слово в UTF-8, записи).
+    Файл сначала пишется во временный и затем переименовывается
+    :param terms: слова по возрастанию и их записи (array uint32: id, количество, id, ...)
+    :param path: путь к сегменту
+    :return: количество слов
+    """
+    blob = bytearray()
+    offsets = array('I', [0])
+    starts = array('I', [0])
+    postings = array('I')
+    for word, word_postings in terms:
+        blob += word
+        offsets.append(len(blob))
+        postings.extend(word_postings)
+        starts.append(len(postings) // 2)
+    if sys.byteorder != 'little':
+        offsets.byteswap()
+        starts.byteswap()
+        postings.byteswap()
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, VERSION, 0, len(offsets) - 1, len(postings) // 2, len(blob)))
+        file.write(offsets.tobytes())
+        file.write(starts.tobytes())
+        file.write(postings.tobytes())
+        file.write(blob)
+    os.replace(tmp_path, path)
+    return len(offsets) - 1
+
+
+def build_segment(articles: Iterable[Tuple[int, str]], path: str) -> int:
+    """
+    Строит сегмент по файлам words.txt
+    :param articles: пары (article id, путь к words.txt) по возрастанию id
+    :param path: путь к сегменту
+    :return: количество слов
+    """
+    postings = {}
+    for article_id, words_path in articles:
+        for lines in block_reader(words_path):
+            for line in lines:
+                word, count = line.split()
+                word_postings = postings.get(word)
+                if word_postings is None:
+                    postings[word] = word_postings = array('I')
+                word_postings.append(article_id)
+                word_postings.append(int(count))
+    # порядок строк Python совпадает с порядком их байтов UTF-8
+    return _write_segment(((word.encode('utf8'), postings[word]) for word in sorted(postings)), path)
+
+
+class Segment:
+    """
+    Сегмент индекса, отображенный в память через mmap.
+    Слова декодируются и записи читаются только при обращении к ним
+    """
+    def __init__(self, path: str):
+        with open(path, 'rb') as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, size, postings_size, blob_size = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or version != VERSION:
+            self._mmap.close()
+            raise ValueError(f'{path} is not an index segment')
+        self._size = size
+        offsets_start = HEADER.size
+        starts_start = offsets_start + 4 * (size + 1)
+        postings_start = starts_start + 4 * (size + 1)
+        self._blob_start = postings_start + 8 * postings_size
+        if self._blob_start + blob_size > len(self._mmap):
+            self._mmap.close()
+            raise ValueError(f'{path} is truncated')
+        self._offsets = _uint32_array(self._mmap, offsets_start, starts_start)
+        self._starts = _uint32_array(self._mmap, starts_start, postings_start)
+        self._postings = _uint32_array(self._mmap, postings_start, self._blob_start)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def word_bytes(self, index: int) -> bytes:
+        """Возвращает слово с номером index в UTF-8"""
+        start = self._blob_start + self._offsets[index]
+        return self._mmap[start:self._blob_start + self._offsets[index + 1]]
+
+    def find(self, word: str) -> int:
+        """
+        Бинарный поиск слова
+        :return: номер слова или -1, если слова нет
+        """
+        key = word.encode('utf8')
+        low, high = 0, self._size
+        while low < high:
+            middle = (low + high) // 2
+            if self.word_bytes(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self._size and self.word_bytes(low) == key:
+            return low
+        return -1
+
+    def document_frequency(self, index: int) -> int:
+        """Возвращает количество статей со словом с номером index"""
+        return self._starts[index + 1] - self._starts[index]
+
+    def raw_postings(self, index: int) -> memoryview:
+        """Возвращает записи слова с номером index (uint32: id, количество, id, ...)"""
+        return self._postings[2 * self._starts[index]:2 * self._starts[index + 1]]
+
+    def postings(self, index: int) -> List[Tuple[int, int]]:
+        """Возвращает записи слова с номером index как пары (article id, количество)"""
+        raw = self.raw_postings(index)
+        return list(zip(raw[0::2], raw[1::2]))
+
+    def raw_terms(self) -> Iterator[Tuple[bytes, memoryview]]:
+        """Итерация по парам (слово в UTF-8, записи) в порядке слов"""
+        for index in range(self._size):
+            yield self.word_bytes(index), self.raw_postings(index)
+
+    def close(self) -> None:
+        """Освобождает отображение файла"""
+        if not self._mmap.closed:
+            self._offsets.release()
+            self._starts.release()
+            self._postings.release()
+            self._mmap.close()
+
+
+def read_manifest(index_path: str) -> Tuple[List[str], List[str]]:
+    """
+    Читает манифест индекса
+    :return: имена файлов сегментов и папки статей (индекс в списке - article id)
+    """
+    segments, articles = [], []
+    manifest_path = os.path.join(index_path, MANIFEST_FILENAME)
+    if not os.path.exists(manifest_path):
+        return segments, articles
+    for lines in block_reader(manifest_path):
+        for line in lines:
+            kind, _, name = line.rstrip('\n').partition(' ')
+            (segments if kind == 'segment' else articles).append(name)
+    return segments, articles
+
+
+def write_manifest(index_path: str, segments: List[str], articles: List[str]) -> None:
+    """Атомарно заменяет манифест индекса"""
+    manifest_path = os.path.join(index_path, MANIFEST_FILENAME)
+    tmp_path = f'{manifest_path}.tmp'
+    with open(tmp_path, 'w', encoding='utf8') as file:
+        file.writelines(f'segment {name}\n' for name in segments)
+        file.writelines(f'article {name}\n' for name in articles)
+    os.replace(tmp_path, manifest_path)
+
+
+def _segment_name(first_id: int, end_id: int) -> str:
+    """Имя сегмента со статьями [first_id, end_id)"""
+    return f'segment{first_id:08}-{end_id:08}.idx'
+
+
+def add_articles(base_path: str, index_path: str) -> int:
+    """
+    Добавляет в индекс папки статей с words.txt, которых в нем еще нет.
+    Новые статьи записываются в новый сегмент, существующие сегменты не меняются
+    :param base_path: папка со статьями
+    :param index_path: папка индекса (создается, если ее нет)
+    :return: количество добавленных статей
+    """
+    os.makedirs(index_path, exist_ok=True)
+    segments, articles = read_manifest(index_path)
+    indexed = set(articles)
+    new_folders = [folder for folder in sorted(os.listdir(base_path))
+                   if folder not in indexed
+                   and os.path.exists(os.path.join(base_path, folder, WORDS_FILENAME))]
+    if not new_folders:
+        return 0
+    first_id = len(articles)
+    name = _segment_name(first_id, first_id + len(new_folders))
+    build_segment(((first_id + number, os.path.join(base_path, folder, WORDS_FILENAME))
+                   for number, folder in enumerate(new_folders)),
+                  os.path.join(index_path, name))
+    write_manifest(index_path, segments + [name], articles + new_folders)
+    return len(new_folders)
+
+
+def compact(index_path: str) -> None:
+    """
+    Объединяет все сегменты индекса в один.
+    Слова сравниваются как байты и не декодируются
+    :param index_path: папка индекса
+    :return: None
+    """
+    segments, articles = read_manifest(index_path)
+    if len(segments) < 2:
+        return
+    opened = [Segment(os.path.join(index_path, name)) for name in segments]
+    try:
+        # heapq.merge при равных словах сохраняет порядок сегментов, то есть порядок id
+        merged = heapq.merge(*(segment.raw_terms() for segment in opened), key=itemgetter(0))
+        terms = ((word, array('I', b''.join(raw.tobytes() for _, raw in group)))
+                 for word, group in groupby(merged, key=itemgetter(0)))
+        name = _segment_name(0, len(articles))
+        _write_segment(terms, os.path.join(index_path, name))
+    finally:
+        for segment in opened:
+            segment.close()
+    write_manifest(index_path, [name], articles)
+    for old_name in segments:
+        if old_name != name:
+            os.remove(os.path.join(index_path, old_name))
+
+
+class InvertedIndex:
+    """
+    Запросы к инвертированному индексу. Сегменты отображаются в память,
+    слово ищется бинарным поиском в каждом сегменте
+    """
+    def __init__(self, index_path: str):
+        segment_names, self.articles = read_manifest(index_path)
+        self._segments = [Segment(os.path.join(index_path, name)) for name in segment_names]
+
+    def __enter__(self) -> 'InvertedIndex':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def __contains__(self, word: str) -> bool:
+        return any(segment.find(word) >= 0 for segment in self._segments)
+
+    def _raw_postings(self, word: str) -> Iterator[Tuple[int, int]]:
+        """Итерация по парам (article id, количество) слова по возрастанию id"""
+        for segment in self._segments:
+            index = segment.find(word)
+            if index >= 0:
+                yield from segment.postings(index)
+
+    def postings(self, word: str) -> List[Tuple[str, int]]:
+        """
+        Находит статьи, в которых есть слово
+        :return: пары (папка статьи, количество) в порядке добавления статей
+        """
+        return [(self.articles[article_id], count) for article_id, count in self._raw_postings(word)]
+
+    def document_frequency(self, word: str) -> int:
+        """Возвращает количество статей, в которых есть слово"""
+        total = 0
+        for segment in self._segments:
+            index = segment.find(word)
+            if index >= 0:
+                total += segment.document_frequency(index)
+        return total
+
+    def total_count(self, word: str) -> int:
+        """Возвращает, сколько раз слово встречается во всех статьях"""
+        return sum(count for _, count in self._raw_postings(word))
+
+    def top_k(self, word: str, k: int) -> List[Tuple[str, int]]:
+        """
+        Находит k статей, в которых слово встречается чаще всего
+        :return: пары (папка статьи, количество) по убыванию количества
+        """
+        best = heapq.nlargest(k, self._raw_postings(word), key=itemgetter(1))
+        return [(self.articles[article_id], count) for article_id, count in best]
+
+    def close(self) -> None:
+        """Освобождает отображения сегментов"""
+        for segment in self._segments:
+            segment.close()
+
+
+if __name__ == '__main__':
+    # python -m src.storage.inverted_index <папка индекса> <слово> [k]
+    index_directory, query = sys.argv[1], sys.argv[2].lower()
+    with InvertedIndex(index_directory) as index:
+        for folder, word_count in index.top_k(query, int(sys.argv[3]) if len(sys.argv) > 3 else 10):
+            print(word_count, folder)
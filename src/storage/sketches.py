@@ -0,0 +1,327 @@
+"""
+Приближенная статистика слов для больших обходов: Count-Min sketch (оценка количества
+слова) и HyperLogLog (оценка количества различных слов). Размер обоих не зависит
+от количества слов, и сводки разных статей и процессов объединяются без потерь
+точности: объединение двух сводок равно сводке, построенной по объединенным данным.
+Сводки ведутся вместе с точным подсчетом: статья по-прежнему считается в map
+(она нужна для words.txt), поэтому память на одну статью не меньше. Экономия -
+в статистике корпуса: corpus_sketch объединяет сводки фиксированного размера
+вместо точного объединения всех слов всех статей.
+
+Каждое слово хэшируется один раз (blake2b, 128 бит): младшие 64 бита дают
+строки Count-Min (двойное хэширование), старшие 64 бита - регистр и ранг HyperLogLog.
+
+Границы ошибок:
+    Count-Min с шириной w и глубиной d никогда не занижает количество, а завышает его
+    больше чем на e / w * total (total - сумма всех количеств) с вероятностью не более e^-d;
+    по умолчанию w = 2048, d = 4: 0.13% от total с вероятностью 98%.
+    HyperLogLog с 2^p регистрами имеет стандартную ошибку 1.04 / sqrt(2^p);
+    по умолчанию p = 12: 1.6%, ошибка больше 3 стандартных (4.9%) почти невозможна.
+
+Сводка статьи хранится в ее папке (sketch.bin): заголовок и сжатые zlib
+регистры HyperLogLog и таблица Count-Min (счетчики uint64):
+
+    заголовок: magic (4 байта), версия (2), p (2), ширина (4), глубина (4), total (8)
+
+Все числа little-endian
+"""
+import os
+import sys
+import math
+import zlib
+import struct
+import tempfile
+from array import array
+from hashlib import blake2b
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Tuple
+from src.storage.block_io import block_reader
+
+MAGIC = b'WSKT'
+VERSION = 1
+HEADER = struct.Struct('<4sHHIIQ')
+SKETCH_FILENAME = 'sketch.bin'
+WORDS_FILENAME = 'words.txt'
+CMS_WIDTH = 2048  # счетчиков в строке Count-Min
+CMS_DEPTH = 4  # строк Count-Min
+HLL_PRECISION = 12  # 2^p регистров HyperLogLog
+MASK_32 = (1 << 32) - 1
+MASK_64 = (1 << 64) - 1
+
+
+def word_hash(word: str) -> int:
+    """128-битный хэш слова (общий для Count-Min и HyperLogLog)"""
+    return int.from_bytes(blake2b(word.encode('utf8'), digest_size=16).digest(), 'little')
+
+
+class CountMinSketch:
+    """
+    Класс Count-Min sketch: depth строк по width счетчиков uint64
+    (uint32 переполнялся бы на корпусе больше 2^32 слов).
+    Слово увеличивает в каждой строке один счетчик, оценка - минимум этих счетчиков
+    """
+    __slots__ = ('width', 'depth', 'total', '_table')
+
+    def __init__(self, width: int = CMS_WIDTH, depth: int = CMS_DEPTH):
+        """
+        :param width: счетчиков в строке (степень двойки)
+        :param depth: количество строк
+        """
+        if width < 1 or width & (width - 1) or depth < 1:
+            raise ValueError('width must be a power of two and depth must be positive')
+        self.width = width
+        self.depth = depth
+        self.total = 0  # сумма всех количеств
+        self._table = array('Q', bytes(8 * width * depth))
+
+    @classmethod
+    def from_error(cls, epsilon: float, delta: float) -> 'CountMinSketch':
+        """
+        Создает sketch, который завышает количество не больше чем на epsilon * total
+        с вероятностью не меньше 1 - delta
+        """
+        width = 1 << max(0, math.ceil(math.log2(math.e / epsilon)))
+        return cls(width, max(1, math.ceil(math.log(1 / delta))))
+
+    @property
+    def epsilon(self) -> float:
+        """Относительная граница завышения (доля от total)"""
+        return math.e / self.width
+
+    @property
+    def delta(self) -> float:
+        """Вероятность превысить границу завышения"""
+        return math.exp(-self.depth)
+
+    def _cells(self, hash_value: int) -> List[int]:
+        """Индексы счетчиков слова в таблице (по одному в каждой строке)"""
+        first, second = hash_value & MASK_32, (hash_value >> 32) & MASK_32 | 1
+        mask, width = self.width - 1, self.width
+        return [row * width + ((first + row * second) & mask) for row in range(self.depth)]
+
+    def add_hash(self, hash_value: int, n: int = 1) -> None:
+        """Увеличивает количество слова с хэшем hash_value на n"""
+        table = self._table
+        for cell in self._cells(hash_value):
+            table[cell] += n
+        self.total += n
+
+    def add(self, word: str, n: int = 1) -> None:
+        """Увеличивает количество слова на n"""
+        self.add_hash(word_hash(word), n)
+
+    def estimate_hash(self, hash_value: int) -> int:
+        """Оценка количества слова с хэшем hash_value"""
+        table = self._table
+        return min(table[cell] for cell in self._cells(hash_value))
+
+    def estimate(self, word: str) -> int:
+        """Оценка количества слова (не меньше настоящего)"""
+        return self.estimate_hash(word_hash(word))
+
+    def error_bound(self) -> float:
+        """Граница завышения оценки: epsilon * total"""
+        return self.epsilon * self.total
+
+    def merge(self, other: 'CountMinSketch') -> None:
+        """Прибавляет счетчики other (размеры должны совпадать)"""
+        if (self.width, self.depth) != (other.width, other.depth):
+            raise ValueError('cannot merge Count-Min sketches of different sizes')
+        table = self._table
+        for cell, count in enumerate(other._table):
+            if count:
+                table[cell] += count
+        self.total += other.total
+
+
+class HyperLogLog:
+    """
+    Класс HyperLogLog: 2^precision регистров, в каждом - наибольший ранг
+    (номер первого единичного бита) хэшей, попавших в регистр
+    """
+    __slots__ = ('precision', '_registers')
+
+    def __init__(self, precision: int = HLL_PRECISION):
+        """
+        :param precision: p, количество регистров - 2^p (4 <= p <= 16)
+        """
+        if not 4 <= precision <= 16:
+            raise ValueError('precision must be between 4 and 16')
+        self.precision = precision
+        self._registers = bytearray(1 << precision)
+
+    @property
+    def standard_error(self) -> float:
+        """Стандартная относительная ошибка оценки"""
+        return 1.04 / math.sqrt(len(self._registers))
+
+    def add_hash(self, hash_value: int) -> None:
+        """Учитывает слово с хэшем hash_value"""
+        bits = 64 - self.precision
+        hash_value = (hash_value >> 64) & MASK_64
+        index = hash_value >> bits
+        rank = bits - (hash_value & ((1 << bits) - 1)).bit_length() + 1
+        if rank > self._registers[index]:
+            self._registers[index] = rank
+
+    def add(self, word: str) -> None:
+        """Учитывает слово"""
+        self.add_hash(word_hash(word))
+
+    def count(self) -> int:
+        """Оценка количества различных слов"""
+        size = len(self._registers)
+        alpha = 0.7213 / (1 + 1.079 / size)
+        estimate = alpha * size * size / sum(2.0 ** -register for register in self._registers)
+        zeros = self._registers.count(0)
+        if estimate <= 2.5 * size and zeros:
+            estimate = size * math.log(size / zeros)  # linear counting для малых оценок
+        return round(estimate)
+
+    def merge(self, other: 'HyperLogLog') -> None:
+        """Объединяет регистры с other (точность должна совпадать)"""
+        if self.precision != other.precision:
+            raise ValueError('cannot merge HyperLogLogs of different precision')
+        self._registers = bytearray(map(max, self._registers, other._registers))
+
+
+class WordSketch:
+    """
+    Приближенная статистика слов статьи или корпуса:
+    Count-Min для количеств и HyperLogLog для размера словаря
+    """
+    __slots__ = ('frequencies', 'vocabulary')
+
+    def __init__(self, width: int = CMS_WIDTH, depth: int = CMS_DEPTH,
+                 precision: int = HLL_PRECISION):
+        self.frequencies = CountMinSketch(width, depth)
+        self.vocabulary = HyperLogLog(precision)
+
+    def add(self, word: str, n: int = 1) -> None:
+        """Увеличивает количество слова на n (слово хэшируется один раз)"""
+        hash_value = word_hash(word)
+        self.frequencies.add_hash(hash_value, n)
+        self.vocabulary.add_hash(hash_value)
+
+    def update(self, pairs: Iterable[Tuple[str, int]]) -> None:
+        """Учитывает пары (слово, количество), например map.items()"""
+        add = self.add
+        for word, count in pairs:
+            add(word, count)
+
+    def estimate(self, word: str) -> int:
+        """Оценка количества слова"""
+        return self.frequencies.estimate(word)
+
+    def distinct(self) -> int:
+        """Оценка количества различных слов"""
+        return self.vocabulary.count()
+
+    def merge(self, other: 'WordSketch') -> None:
+        """Объединяет сводку с other"""
+        self.frequencies.merge(other.frequencies)
+        self.vocabulary.merge(other.vocabulary)
+
+    def write(self, path: str) -> None:
+        """
+        Записывает сводку в файл через временный файл с уникальным именем,
+        поэтому одновременные записи одного файла не мешают друг другу
+        """
+        table = array('Q', self.frequencies._table)
+        if sys.byteorder != 'little':
+            table.byteswap()
+        descriptor, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=os.path.dirname(path) or '.')
+        try:
+            with os.fdopen(descriptor, 'wb') as file:
+                file.write(HEADER.pack(MAGIC, VERSION, self.vocabulary.precision, self.frequencies.width,
+                                       self.frequencies.depth, self.frequencies.total))
+                file.write(zlib.compress(bytes(self.vocabulary._registers) + table.tobytes()))
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    @classmethod
+    def read(cls, path: str) -> 'WordSketch':
+        """Читает сводку из файла"""
+        with open(path, 'rb') as file:
+            data = file.read()
+        magic, version, precision, width, depth, total = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f'{path} is not a word sketch')
+        sketch = cls(width, depth, precision)
+        body = zlib.decompress(data[HEADER.size:])
+        registers = 1 << precision
+        if len(body) != registers + 8 * width * depth:
+            raise ValueError(f'{path} is truncated')
+        sketch.vocabulary._registers = bytearray(body[:registers])
+        table = array('Q', body[registers:])
+        if sys.byteorder != 'little':
+            table.byteswap()
+        sketch.frequencies._table = table
+        sketch.frequencies.total = total
+        return sketch
+
+
+def words_sketch(words_path: str) -> WordSketch:
+    """Строит сводку по файлу words.txt"""
+    sketch = WordSketch()
+    for lines in block_reader(words_path):
+        for line in lines:
+            word, count = line.split()
+            sketch.add(word, int(count))
+    return sketch
+
+
+def add_article_sketches(base_path: str, overwrite: bool = False) -> int:
+    """
+    Создает sketch.bin для сохраненных статей по их words.txt
+    :param base_path: путь к папке со статьями
+    :param overwrite: пересоздать sketch.bin, даже если он уже есть
+    :return: количество записанных сводок
+    """
+    written = 0
+    for folder in os.listdir(base_path):
+        words_path = os.path.join(base_path, folder, WORDS_FILENAME)
+        sketch_path = os.path.join(base_path, folder, SKETCH_FILENAME)
+        if os.path.exists(words_path) and (overwrite or not os.path.exists(sketch_path)):
+            words_sketch(words_path).write(sketch_path)
+            written += 1
+    return written
+
+
+def merge_sketches(filenames: Iterable[str]) -> WordSketch:
+    """Объединяет сводки из файлов sketch.bin"""
+    merged = WordSketch()
+    for filename in filenames:
+        merged.merge(WordSketch.read(filename))
+    return merged
+
+
+def corpus_sketch(base_path: str, workers: int = 1) -> WordSketch:
+    """
+    Объединяет сводки всех статей: части статей объединяются в отдельных процессах,
+    затем объединяются их результаты
+    :param base_path: путь к папке со статьями
+    :param workers: количество процессов (1 - без пула)
+    :return: сводка корпуса
+    """
+    filenames = [os.path.join(base_path, folder, SKETCH_FILENAME) for folder in sorted(os.listdir(base_path))]
+    filenames = [filename for filename in filenames if os.path.exists(filename)]
+    if workers <= 1:
+        return merge_sketches(filenames)
+    merged = WordSketch()
+    with ProcessPoolExecutor(workers) as executor:
+        for partial in executor.map(merge_sketches, [filenames[index::workers] for index in range(workers)]):
+            merged.merge(partial)
+    return merged
+
+
+if __name__ == '__main__':
+    # python -m src.storage.sketches <папка статей> [слово ...]
+    add_article_sketches(sys.argv[1])
+    corpus = corpus_sketch(sys.argv[1], os.cpu_count() or 1)
+    print(f'words: {corpus.frequencies.total}, distinct: ~{corpus.distinct()}, '
+          f'error: +{corpus.frequencies.error_bound():.0f}')
+    for query in sys.argv[2:]:
+        print(query, corpus.estimate(query.lower()))
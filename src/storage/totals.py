@@ -0,0 +1,261 @@
+"""
+Инкрементальные общие количества слов по всем статьям (то же, что res.txt).
+Папка итогов содержит:
+
+    manifest.txt      - поколение, файлы итогов, длина журнала и учтенные папки статей:
+                        'generation <n>', 'base <n>', 'run <n>', 'log <байт>',
+                        'folder <отпечаток> <смещение> <папка>'
+    totals<n>.txt     - общие количества на момент поколения n (строки 'слово количество'
+                        по возрастанию), файл 'base' манифеста
+    delta<n>.txt      - изменения количеств, внесенные обновлением n (строки 'слово изменение'
+                        по возрастанию, изменение может быть отрицательным), файлы 'run' манифеста
+    changes.log       - журнал изменений, только дописывается: записи
+                        '+ <строк> <отпечаток> <папка>' (вклад статьи) и
+                        '- <строк> <отпечаток> <папка>' (вычтенный вклад), за каждой
+                        идут строки 'слово количество'
+
+Отпечаток папки - размер и время изменения ее words.txt. При обновлении новые папки
+прибавляются, а у измененных и удаленных вычитается прежний вклад: он читается
+из журнала по смещению из манифеста, поэтому старый words.txt не нужен.
+Обновление не переписывает файл итогов: отсортированные изменения пишутся отдельным
+файлом delta<n>.txt, и текущие итоги - это файл итогов плюс все такие файлы.
+Когда файлы изменений вместе достигают 1/COMPACTION_RATIO размера файла итогов
+(или их становится больше MAX_RUNS), они объединяются с итогами в новый файл итогов.
+Поэтому стоимость обновления в среднем пропорциональна количеству новых данных,
+а не размеру словаря и не количеству всех статей; export_totals объединяет
+файл итогов с файлами изменений за один проход.
+Манифест заменяется атомарно и является точкой фиксации: файл итогов нового
+поколения и дописанные записи журнала до замены манифеста не считаются
+"""
+import os
+import sys
+import heapq
+import shutil
+from itertools import groupby
+from operator import itemgetter
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from src.storage.block_io import BlockWriter, block_reader
+
+MANIFEST_FILENAME = 'manifest.txt'
+LOG_FILENAME = 'changes.log'
+WORDS_FILENAME = 'words.txt'
+COMPACTION_RATIO = 4  # изменения объединяются с итогами, когда достигают 1/4 их размера
+MAX_RUNS = 16  # больше файлов изменений не копится, чтобы чтение итогов оставалось быстрым
+
+
+def _totals_filename(generation: int) -> str:
+    """Имя файла итогов поколения generation"""
+    return f'totals{generation:06}.txt'
+
+
+def _delta_filename(generation: int) -> str:
+    """Имя файла изменений обновления generation"""
+    return f'delta{generation:06}.txt'
+
+
+def fingerprint(words_path: str) -> str:
+    """Отпечаток words.txt: размер и время изменения"""
+    stat = os.stat(words_path)
+    return f'{stat.st_size}-{stat.st_mtime_ns}'
+
+
+class Manifest:
+    """
+    Состояние итогов: поколение, поколение файла итогов (base), поколения файлов
+    изменений после него (runs), зафиксированная длина журнала
+    и учтенные папки (папка -> (отпечаток, смещение записи '+' в журнале))
+    """
+    def __init__(self, generation: int = 0, log_size: int = 0,
+                 folders: Optional[Dict[str, Tuple[str, int]]] = None,
+                 base: Optional[int] = None, runs: Optional[List[int]] = None):
+        self.generation = generation
+        self.base = base if base is not None else generation
+        self.runs = runs if runs is not None else []
+        self.log_size = log_size
+        self.folders = folders if folders is not None else {}
+
+    @classmethod
+    def read(cls, totals_path: str) -> 'Manifest':
+        """Читает манифест (пустой, если итоги еще не создавались)"""
+        manifest = cls()
+        manifest_path = os.path.join(totals_path, MANIFEST_FILENAME)
+        if not os.path.exists(manifest_path):
+            return manifest
+        base = None
+        for lines in block_reader(manifest_path):
+            for line in lines:
+                kind, _, rest = line.rstrip('\n').partition(' ')
+                if kind == 'generation':
+                    manifest.generation = int(rest)
+                elif kind == 'base':
+                    base = int(rest)
+                elif kind == 'run':
+                    manifest.runs.append(int(rest))
+                elif kind == 'log':
+                    manifest.log_size = int(rest)
+                else:  # folder
+                    folder_fingerprint, offset, folder = rest.split(' ', 2)
+                    manifest.folders[folder] = (folder_fingerprint, int(offset))
+        # в манифестах без файлов изменений итоги всегда были в файле текущего поколения
+        manifest.base = base if base is not None else manifest.generation
+        return manifest
+
+    def write(self, totals_path: str) -> None:
+        """Атомарно заменяет манифест"""
+        manifest_path = os.path.join(totals_path, MANIFEST_FILENAME)
+        tmp_path = f'{manifest_path}.tmp'
+        with BlockWriter(tmp_path) as writer:
+            writer.write(f'generation {self.generation}\n')
+            writer.write(f'base {self.base}\n')
+            for run in self.runs:
+                writer.write(f'run {run}\n')
+            writer.write(f'log {self.log_size}\n')
+            for folder, (folder_fingerprint, offset) in sorted(self.folders.items()):
+                writer.write(f'folder {folder_fingerprint} {offset} {folder}\n')
+        os.replace(tmp_path, manifest_path)
+
+    def totals_file(self, totals_path: str) -> Optional[str]:
+        """Путь к файлу итогов (None, если итогов еще нет)"""
+        if self.base == 0:
+            return None
+        return os.path.join(totals_path, _totals_filename(self.base))
+
+    def run_files(self, totals_path: str) -> List[str]:
+        """Пути к файлам изменений после файла итогов"""
+        return [os.path.join(totals_path, _delta_filename(run)) for run in self.runs]
+
+    def files(self, totals_path: str) -> List[str]:
+        """Пути ко всем файлам, из которых складываются текущие итоги"""
+        totals_file = self.totals_file(totals_path)
+        return ([totals_file] if totals_file is not None else []) + self.run_files(totals_path)
+
+
+def _read_pairs(words_path: str) -> Iterator[Tuple[str, int]]:
+    """Итерация по парам (слово, количество) файла words.txt"""
+    for lines in block_reader(words_path):
+        for line in lines:
+            word, count = line.split()
+            yield word, int(count)
+
+
+def _read_record(log, offset: int) -> Iterator[Tuple[str, int]]:
+    """Читает пары записи журнала, начинающейся со смещения offset"""
+    log.seek(offset)
+    size = int(log.readline().split(b' ', 2)[1])
+    for _ in range(size):
+        word, count = log.readline().decode('utf8').split()
+        yield word, int(count)
+
+
+def _append_record(log, sign: str, folder: str, folder_fingerprint: str,
+                   pairs: list) -> int:
+    """
+    Дописывает запись в журнал
+    :return: смещение записи
+    """
+    log.seek(0, os.SEEK_END)
+    offset = log.tell()
+    lines = [f'{sign} {len(pairs)} {folder_fingerprint} {folder}\n']
+    lines.extend(f'{word} {count}\n' for word, count in pairs)
+    log.write(''.join(lines).encode('utf8'))
+    return offset
+
+
+def _merge_totals(files: List[str]) -> Iterator[Tuple[str, int]]:
+    """
+    Объединяет отсортированные файл итогов и файлы изменений, складывая количества
+    одинаковых слов; слова, количество которых стало 0, пропускаются
+    """
+    merged = heapq.merge(*(_read_pairs(path) for path in files), key=itemgetter(0))
+    for word, pairs in groupby(merged, key=itemgetter(0)):
+        count = sum(count for _, count in pairs)
+        if count < 0:
+            raise ValueError(f'negative total for {word!r}: the change log is inconsistent')
+        if count:
+            yield word, count
+
+
+def _needs_compaction(manifest: 'Manifest', totals_path: str) -> bool:
+    """Пора ли объединить файлы изменений с файлом итогов"""
+    if len(manifest.runs) > MAX_RUNS:
+        return True
+    totals_file = manifest.totals_file(totals_path)
+    totals_size = os.path.getsize(totals_file) if totals_file is not None else 0
+    runs_size = sum(os.path.getsize(path) for path in manifest.run_files(totals_path))
+    return runs_size * COMPACTION_RATIO >= totals_size
+
+
+def refresh_totals(base_path: str, totals_path: str) -> Tuple[int, int, int]:
+    """
+    Обновляет общие количества слов по папкам статей:
+    прибавляет новые папки, а у измененных и удаленных вычитает прежний вклад
+    :param base_path: папка со статьями
+    :param totals_path: папка итогов (создается, если ее нет)
+    :return: количество добавленных, обновленных и удаленных статей
+    """
+    os.makedirs(totals_path, exist_ok=True)
+    manifest = Manifest.read(totals_path)
+    current = {}
+    for folder in os.listdir(base_path):
+        words_path = os.path.join(base_path, folder, WORDS_FILENAME)
+        if os.path.exists(words_path):
+            current[folder] = fingerprint(words_path)
+    added = [folder for folder in current if folder not in manifest.folders]
+    changed = [folder for folder, (old, _) in manifest.folders.items()
+               if folder in current and current[folder] != old]
+    removed = [folder for folder in manifest.folders if folder not in current]
+    if not added and not changed and not removed:
+        return 0, 0, 0
+
+    delta = {}
+    folders = dict(manifest.folders)
+    log_path = os.path.join(totals_path, LOG_FILENAME)
+    with open(log_path, 'ab+') as log:
+        log.truncate(manifest.log_size)  # незафиксированные записи прошлого обновления
+        for folder in changed + removed:
+            old_fingerprint, offset = folders.pop(folder)
+            pairs = list(_read_record(log, offset))
+            _append_record(log, '-', folder, old_fingerprint, pairs)
+            for word, count in pairs:
+                delta[word] = delta.get(word, 0) - count
+        for folder in changed + added:
+            pairs = list(_read_pairs(os.path.join(base_path, folder, WORDS_FILENAME)))
+            folders[folder] = (current[folder], _append_record(log, '+', folder, current[folder], pairs))
+            for word, count in pairs:
+                delta[word] = delta.get(word, 0) + count
+        log.flush()
+        os.fsync(log.fileno())
+        log_size = log.tell()
+
+    generation = manifest.generation + 1
+    new_manifest = Manifest(generation, log_size, folders, manifest.base, manifest.runs + [generation])
+    run_path = os.path.join(totals_path, _delta_filename(generation))
+    with BlockWriter(run_path) as writer:
+        # порядок строк Python совпадает с порядком слов в файлах итогов
+        writer.write_pairs((word, count) for word, count in sorted(delta.items(), key=itemgetter(0)) if count)
+    if _needs_compaction(new_manifest, totals_path):
+        files = new_manifest.files(totals_path)
+        new_manifest.base, new_manifest.runs = generation, []
+        with BlockWriter(new_manifest.totals_file(totals_path)) as writer:
+            writer.write_pairs(_merge_totals(files))
+    new_manifest.write(totals_path)
+    for path in set(manifest.files(totals_path) + [run_path]) - set(new_manifest.files(totals_path)):
+        os.remove(path)
+    return len(added), len(changed), len(removed)
+
+
+def export_totals(totals_path: str, result_path: str) -> None:
+    """Записывает текущие итоги (файл итогов вместе с файлами изменений) в result_path (например, res.txt)"""
+    manifest = Manifest.read(totals_path)
+    if not manifest.runs and manifest.base != 0:
+        shutil.copyfile(manifest.totals_file(totals_path), result_path)
+        return
+    with BlockWriter(result_path) as writer:
+        writer.write_pairs(_merge_totals(manifest.files(totals_path)))
+
+
+if __name__ == '__main__':
+    # python -m src.storage.totals <папка статей> <папка итогов> [res.txt]
+    print('added %d, updated %d, removed %d' % refresh_totals(sys.argv[1], sys.argv[2]))
+    if len(sys.argv) > 3:
+        export_totals(sys.argv[2], sys.argv[3])
@@ -0,0 +1,286 @@
+"""
+Общий словарь слов (vocabulary): слово -> целочисленный id.
+Каждое слово хранится в памяти один раз, а количества слов статьи - двумя
+массивами uint32 (id и количество) вместо map со строками. Объединение таких
+массивов складывает количества по индексу id и не сравнивает строки;
+строки нужны только при записи результата (один раз на слово словаря).
+
+Файлы:
+
+    vocabulary.txt  - слова по одному в строке, номер строки - id слова;
+                      файл только дописывается, поэтому id не меняются.
+                      Хранится вне папки статей (рядом с папкой индекса),
+                      потому что в папке статей должны быть только папки статей
+    words.ids       - количества слов статьи (в папке статьи): заголовок magic (4 байта), версия (2),
+                      резерв (2), количество слов n (4), затем n id (uint32) по возрастанию
+                      и n количеств (uint32)
+
+Все числа little-endian.
+
+Словарь - отдельный шаг после обхода: обход (save_article, crawl) по-прежнему пишет
+words.txt со строками, потому что статьи считаются в разных процессах, у которых
+не может быть общих id. encode_articles кодирует сохраненные статьи общим
+словарем, и после этого merge_encoded объединяет их, складывая целые числа
+"""
+import os
+import sys
+import struct
+from array import array
+from typing import Dict, Iterable, Iterator, List, Tuple
+from src.storage.block_io import BlockWriter, block_reader
+
+MAGIC = b'WVID'
+VERSION = 1
+HEADER = struct.Struct('<4sHHI')
+VOCABULARY_FILENAME = 'vocabulary.txt'
+IDS_FILENAME = 'words.ids'
+WORDS_FILENAME = 'words.txt'
+
+
+class Vocabulary:
+    """
+    Класс словаря: id выдаются по порядку появления слов
+    """
+    __slots__ = ('_ids', '_words', '_saved')
+
+    def __init__(self, words: Iterable[str] = ()):
+        self._ids: Dict[str, int] = {}
+        self._words: List[str] = []
+        self._saved = 0  # сколько слов уже записано в файл словаря
+        for word in words:
+            self.add(word)
+
+    def __len__(self) -> int:
+        return len(self._words)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self._ids
+
+    def add(self, word: str) -> int:
+        """
+        Возвращает id слова, добавляя слово, если его еще нет
+        :return: id слова
+        """
+        word_id = self._ids.get(word)
+        if word_id is None:
+            word_id = self._ids[word] = len(self._words)
+            self._words.append(word)
+        return word_id
+
+    def id(self, word: str) -> int:
+        """Возвращает id слова (KeyError, если слова нет)"""
+        return self._ids[word]
+
+    def word(self, word_id: int) -> str:
+        """Возвращает слово по id"""
+        return self._words[word_id]
+
+    def intern(self, words: Iterable[str]) -> Iterator[str]:
+        """
+        Заменяет слова их экземплярами из словаря, чтобы одинаковые слова
+        разных статей были одним объектом str
+        """
+        ids, all_words, add = self._ids, self._words, self.add
+        for word in words:
+            word_id = ids.get(word)
+            yield all_words[add(word) if word_id is None else word_id]
+
+    def encode(self, words: Iterable[str]) -> Iterator[int]:
+        """Заменяет слова их id (новые слова добавляются)"""
+        ids, add = self._ids, self.add
+        for word in words:
+            word_id = ids.get(word)
+            yield add(word) if word_id is None else word_id
+
+    def sorted_ids(self) -> List[int]:
+        """Возвращает id всех слов в порядке возрастания слов"""
+        return sorted(range(len(self._words)), key=self._words.__getitem__)
+
+    @classmethod
+    def read(cls, path: str) -> 'Vocabulary':
+        """Читает словарь из файла (пустой словарь, если файла нет)"""
+        vocabulary = cls()
+        if os.path.exists(path):
+            for lines in block_reader(path):
+                for line in lines:
+                    vocabulary.add(line.rstrip('\n'))
+            vocabulary._saved = len(vocabulary)
+        return vocabulary
+
+    def write(self, path: str) -> None:
+        """Дописывает в файл словаря слова, добавленные после чтения или прошлой записи"""
+        with BlockWriter(path, 'a') as writer:
+            for word in self._words[self._saved:]:
+                writer.write(f'{word}\n')
+        self._saved = len(self._words)
+
+
+class IdCounts:
+    """
+    Количества слов статьи: id по возрастанию и количества в двух массивах uint32
+    """
+    __slots__ = ('ids', 'counts')
+
+    def __init__(self, ids: array = None, counts: array = None):
+        self.ids = ids if ids is not None else array('I')
+        self.counts = counts if counts is not None else array('I')
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        return zip(self.ids, self.counts)
+
+    @classmethod
+    def from_pairs(cls, pairs: Iterable[Tuple], vocabulary: Vocabulary = None) -> 'IdCounts':
+        """
+        Создает массивы из пар (id, количество) или, если задан словарь,
+        из пар (слово, количество), например map.items()
+        """
+        if vocabulary is not None:
+            add = vocabulary.add
+            pairs = ((add(word), count) for word, count in pairs)
+        pairs = sorted(pairs)
+        return cls(array('I', (word_id for word_id, _ in pairs)), array('I', (count for _, count in pairs)))
+
+    def items(self, vocabulary: Vocabulary) -> Iterator[Tuple[str, int]]:
+        """Итерация по парам (слово, количество)"""
+        word = vocabulary.word
+        for word_id, count in self:
+            yield word(word_id), count
+
+    def write(self, path: str) -> None:
+        """Записывает массивы в бинарный файл"""
+        ids, counts = array('I', self.ids), array('I', self.counts)
+        if sys.byteorder != 'little':
+            ids.byteswap()
+            counts.byteswap()
+        with open(path, 'wb') as file:
+            file.write(HEADER.pack(MAGIC, VERSION, 0, len(ids)))
+            file.write(ids.tobytes())
+            file.write(counts.tobytes())
+
+    @classmethod
+    def read(cls, path: str) -> 'IdCounts':
+        """Читает массивы из бинарного файла"""
+        with open(path, 'rb') as file:
+            data = file.read()
+        magic, version, _, size = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f'{path} is not a word ids file')
+        if len(data) != HEADER.size + 8 * size:
+            raise ValueError(f'{path} is truncated')
+        middle = HEADER.size + 4 * size
+        ids, counts = array('I', data[HEADER.size:middle]), array('I', data[middle:])
+        if sys.byteorder != 'little':
+            ids.byteswap()
+            counts.byteswap()
+        return cls(ids, counts)
+
+
+def read_words(words_path: str, vocabulary: Vocabulary) -> IdCounts:
+    """Читает words.txt статьи как массивы id (слова добавляются в словарь)"""
+    ids, counts = array('I'), array('I')
+    add = vocabulary.add
+    for lines in block_reader(words_path):
+        for line in lines:
+            word, count = line.split()
+            ids.append(add(word))
+            counts.append(int(count))
+    return IdCounts.from_pairs(zip(ids, counts))
+
+
+def add_totals(totals: array, present: bytearray, id_counts: IdCounts) -> None:
+    """
+    Прибавляет количества статьи к общим количествам по индексу id и отмечает
+    встреченные id в present (слово с нулевым количеством тоже попадает в результат);
+    оба массива дополняются нулями до наибольшего id статьи
+    """
+    if id_counts.ids and id_counts.ids[-1] >= len(totals):
+        grow = id_counts.ids[-1] + 1 - len(totals)
+        totals.frombytes(bytes(totals.itemsize * grow))
+        present.extend(bytes(grow))
+    for word_id, count in id_counts:
+        totals[word_id] += count
+        present[word_id] = 1
+
+
+def write_totals(totals: array, present: bytearray, vocabulary: Vocabulary, result_path: str) -> None:
+    """
+    Записывает общие количества встреченных слов в порядке возрастания слов (как res.txt).
+    Слова словаря, которых не было в объединяемых файлах, не записываются
+    """
+    word = vocabulary.word
+    with BlockWriter(result_path) as writer:
+        for word_id in vocabulary.sorted_ids():
+            if word_id < len(present) and present[word_id]:
+                writer.write(f'{word(word_id)} {totals[word_id]}\n')
+
+
+def vocabulary_files_merge(*filenames: str, result_path: str) -> None:
+    """
+    Объединяет файлы слов через общий словарь: строки каждого файла переводятся в id,
+    количества складываются в массиве по индексу id, и слова сортируются один раз.
+    Результат совпадает с files_merge, в том числе для слов с нулевым количеством
+    :param filenames: итерируемый с именами файлов
+    :param result_path: файл, куда поместится результат
+    :return: None
+    """
+    vocabulary = Vocabulary()
+    totals, present = array('Q'), bytearray()
+    for filename in filenames:
+        add_totals(totals, present, read_words(filename, vocabulary))
+    write_totals(totals, present, vocabulary, result_path)
+
+
+def encode_articles(base_path: str, vocabulary_path: str, overwrite: bool = False) -> int:
+    """
+    Создает words.ids для статей с words.txt и дописывает новые слова в общий словарь.
+    Первый проход только добавляет слова в словарь, затем словарь записывается
+    один раз, и второй проход пишет words.ids по одному: в памяти хранится
+    словарь и массивы одной статьи, а файлы id не ссылаются на незаписанные слова
+    :param base_path: путь к папке со статьями
+    :param vocabulary_path: файл словаря (вне папки статей)
+    :param overwrite: пересоздать words.ids, даже если он уже есть
+    :return: количество записанных файлов words.ids
+    """
+    vocabulary = Vocabulary.read(vocabulary_path)
+    add = vocabulary.add
+    encoded = []
+    for folder in sorted(os.listdir(base_path)):
+        words_path = os.path.join(base_path, folder, WORDS_FILENAME)
+        ids_path = os.path.join(base_path, folder, IDS_FILENAME)
+        if os.path.exists(words_path) and (overwrite or not os.path.exists(ids_path)):
+            for lines in block_reader(words_path):
+                for line in lines:
+                    add(line.split()[0])
+            encoded.append((words_path, ids_path))
+    vocabulary.write(vocabulary_path)
+    for words_path, ids_path in encoded:
+        read_words(words_path, vocabulary).write(ids_path)
+    return len(encoded)
+
+
+def merge_encoded(base_path: str, vocabulary_path: str, result_path: str) -> None:
+    """
+    Объединяет words.ids всех статей: складываются только целые числа,
+    строки декодируются один раз на слово словаря при записи результата.
+    Результат совпадает с files_merge по words.txt тех же статей
+    :param base_path: путь к папке со статьями
+    :param vocabulary_path: файл словаря, которым закодированы статьи
+    :param result_path: файл, куда поместится результат
+    :return: None
+    """
+    vocabulary = Vocabulary.read(vocabulary_path)
+    totals, present = array('Q'), bytearray()
+    for folder in os.listdir(base_path):
+        ids_path = os.path.join(base_path, folder, IDS_FILENAME)
+        if os.path.exists(ids_path):
+            add_totals(totals, present, IdCounts.read(ids_path))
+    write_totals(totals, present, vocabulary, result_path)
+
+
+if __name__ == '__main__':
+    # python -m src.storage.vocabulary <папка статей> <vocabulary.txt> <res.txt>
+    print(f'{encode_articles(sys.argv[1], sys.argv[2])} articles encoded')
+    merge_encoded(sys.argv[1], sys.argv[2], sys.argv[3])
@@ -1,3 +1,16 @@
+from tests import async_crawler_tests
+from tests import avl_tree_map_tests
+from tests import counts_tests
+from tests import file_tests
 from tests import hash_map_tests
+from tests import inverted_index_tests
+from tests import linked_list_tests
 from tests import map_tests
+from tests import open_hash_map_tests
+from tests import sketches_tests
+from tests import sorted_block_map_tests
+from tests import space_saving_tests
+from tests import totals_tests
 from tests import tree_map_tests
+from tests import vocabulary_tests
+from tests import wiki_tests
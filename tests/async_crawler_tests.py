@@ -0,0 +1,208 @@
+"""
+Модуль для тестирования асинхронного обхода статей на локальном http-сервере,
+который отдает сохраненные статьи из articles/*/content.txt
+"""
+import os
+import shutil
+import asyncio
+import filecmp
+import tempfile
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from src.parser.async_crawler import crawl
+from src.parser.wiki import article_heading
+from src.maps.hash_map import HashMap
+
+ARTICLES_DIRECTORY = os.path.join(os.path.dirname(__file__), '..', 'articles')
+
+
+class ArticleHandler(BaseHTTPRequestHandler):
+    """
+    Обработчик, отдающий сохраненные статьи по адресу /wiki/<заголовок>
+    """
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        """
+        Считает открытые соединения
+        :return: None
+        """
+        super().setup()
+        self.server.connections += 1
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """
+        Отдает content.txt статьи, перенаправляет Special:Random на Doi
+        :return: None
+        """
+        self.server.requests += 1
+        heading = article_heading(self.path)
+        if heading == 'Special:Random':
+            self.send_response(302)
+            self.send_header('Location', '/wiki/Doi')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        content_path = os.path.join(ARTICLES_DIRECTORY, heading, 'content.txt')
+        if not os.path.exists(content_path):
+            # send_error закрывает соединение, а 404 не должен его закрывать
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        with open(content_path, 'rb') as file:
+            content = file.read()
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        """Не выводит лог запросов"""
+
+
+class BrokenMap(HashMap):
+    """
+    Map, падающий при подсчете слов статьи Doi
+    """
+    def bulk_add(self, iterable):
+        """Вызывает непредвиденную ошибку, если среди слов есть doi"""
+        words = list(iterable)
+        if 'doi' in words:
+            raise RuntimeError('broken map')
+        super().bulk_add(words)
+
+
+class AsyncCrawlerTesting(unittest.TestCase):
+    """
+    Класс для тестирования асинхронного обхода
+    """
+    @classmethod
+    def setUpClass(cls):
+        """
+        Запускает локальный сервер со статьями
+        :return: None
+        """
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), ArticleHandler)
+        cls.server.daemon_threads = True
+        cls.origin = f'http://127.0.0.1:{cls.server.server_address[1]}'
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        """
+        Останавливает сервер
+        :return: None
+        """
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        """
+        Создает пустую папку для статей и обнуляет счетчики сервера
+        :return: None
+        """
+        self.base_path = tempfile.mkdtemp()
+        self.server.connections = 0
+        self.server.requests = 0
+
+    def tearDown(self):
+        """
+        Удаляет папку для статей
+        :return: None
+        """
+        shutil.rmtree(self.base_path)
+
+    def run_crawl(self, heading: str, depth: int, connections: int = 2, map_type=HashMap) -> int:
+        """
+        Запускает обход с базовой статьи heading
+        :return: количество обработанных статей
+        """
+        with ThreadPoolExecutor(2) as executor:
+            return asyncio.run(crawl(f'{self.origin}/wiki/{heading}', depth, self.base_path,
+                                     connections=connections, executor=executor, map_type=map_type))
+
+    def test_words_match_saved_articles(self):
+        """
+        Проверяет, что слова скачанной статьи совпадают с сохраненными
+        :return: None
+        """
+        self.run_crawl('Rhodophyta', 0)
+        self.assertTrue(filecmp.cmp(os.path.join(self.base_path, 'Rhodophyta', 'words.txt'),
+                                    os.path.join(ARTICLES_DIRECTORY, 'Rhodophyta', 'words.txt'),
+                                    shallow=False))
+
+    def test_connections_are_reused(self):
+        """
+        Проверяет, что все запросы обхода идут через пул из двух соединений
+        :return: None
+        """
+        visited = self.run_crawl('Rhodophyta', 1, connections=2)
+        self.assertGreater(visited, 2)
+        self.assertGreater(self.server.requests, 2)
+        self.assertLessEqual(self.server.connections, 2)
+        saved = set(os.listdir(self.base_path))
+        self.assertGreater(len(saved), 1)
+        self.assertLessEqual(saved, set(os.listdir(ARTICLES_DIRECTORY)))
+
+    def test_redirect(self):
+        """
+        Проверяет переход по перенаправлению со случайной статьи
+        :return: None
+        """
+        self.run_crawl('Special:Random', 0)
+        with open(os.path.join(self.base_path, 'Doi', 'url.txt'), 'r', encoding='utf8') as file:
+            self.assertEqual(file.read(), f'{self.origin}/wiki/Doi')
+
+    def test_cached_article_is_not_fetched(self):
+        """
+        Проверяет, что сохраненная статья не скачивается повторно
+        :return: None
+        """
+        self.run_crawl('Doi', 0)
+        requests = self.server.requests
+        self.run_crawl('Doi', 0)
+        self.assertEqual(self.server.requests, requests)
+
+    def test_features_reach_parser(self):
+        """
+        Проверяет, что построитель дерева передается в разбор статей обхода
+        :return: None
+        """
+        with ThreadPoolExecutor(2) as executor:
+            with self.assertLogs('src.parser.async_crawler', 'WARNING') as logs:
+                asyncio.run(crawl(f'{self.origin}/wiki/Doi', 0, self.base_path, executor=executor,
+                                  features='no-such-builder'))
+        self.assertIn('no-such-builder', '\n'.join(logs.output))
+        self.assertFalse(os.path.exists(os.path.join(self.base_path, 'Doi', 'words.txt')))
+
+    def test_unexpected_error_is_logged(self):
+        """
+        Проверяет, что непредвиденная ошибка статьи записывается в лог и не останавливает обход
+        :return: None
+        """
+        with self.assertLogs('src.parser.async_crawler', 'ERROR') as logs:
+            self.run_crawl('Doi', 0, map_type=BrokenMap)
+        self.assertIn('broken map', '\n'.join(logs.output))
+        self.run_crawl('Rhodophyta', 0, map_type=BrokenMap)
+        self.assertTrue(os.path.exists(os.path.join(self.base_path, 'Rhodophyta', 'words.txt')))
+
+    def test_cancelled_crawl_cancels_tasks(self):
+        """
+        Проверяет, что после отмены обхода не остается незавершенных задач
+        :return: None
+        """
+        async def cancel_crawl():
+            with ThreadPoolExecutor(2) as executor:
+                crawl_task = asyncio.create_task(crawl(f'{self.origin}/wiki/Rhodophyta', 2, self.base_path,
+                                                       executor=executor))
+                while self.server.requests < 2:
+                    await asyncio.sleep(0.01)
+                crawl_task.cancel()
+                with self.assertRaises(asyncio.CancelledError):
+                    await crawl_task
+                return asyncio.all_tasks() - {asyncio.current_task()}
+
+        self.assertEqual(asyncio.run(cancel_crawl()), set())
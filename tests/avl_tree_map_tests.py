@@ -0,0 +1,172 @@
+"""
+Модуль для тестирования AVL Tree Map
+"""
+import os
+import random
+import tempfile
+from tests.map_tests import SortedMapTesting
+from src.maps.avl_tree_map import AVLTreeMap
+
+
+class AVLTreeTesting(SortedMapTesting):
+    """
+    Класс для тестирования методов AVL Tree Map
+    """
+    h_test = AVLTreeMap
+
+    def check_balance(self, node, low=None, high=None) -> int:
+        """
+        Проверяет порядок ключей, высоты и баланс поддерева
+        :return: высота поддерева
+        """
+        if node is None:
+            return 0
+        if low is not None:
+            self.assertLess(low, node.key)
+        if high is not None:
+            self.assertLess(node.key, high)
+        left = self.check_balance(node.left, low, node.key)
+        right = self.check_balance(node.right, node.key, high)
+        self.assertLessEqual(abs(left - right), 1)
+        self.assertEqual(node.height, max(left, right) + 1)
+        self.assertEqual(node.size, (node.left.size if node.left else 0)
+                         + (node.right.size if node.right else 0) + 1)
+        return node.height
+
+    def test_less_in_left(self):
+        """
+        Проверяет, добавлен ли узел с меньшим ключом слева
+        :return: None
+        """
+        self.map[8] = 'root'
+        self.map[7] = 'left'
+        self.assertEqual(self.map[7], self.map.root.left.value)
+
+    def test_sorted_insert_is_balanced(self):
+        """
+        Проверяет, что вставка отсортированных ключей не вырождает дерево в список
+        :return: None
+        """
+        for i in range(10000):
+            self.map[f'{i:05}'] = i
+        self.assertEqual(len(self.map), 10000)
+        self.assertLessEqual(self.map.height(), 14)  # 1.44 * log2(10000)
+        self.assertEqual(self.map['09999'], 9999)
+        self.check_balance(self.map.root)
+
+    def test_random_operations(self):
+        """
+        Сверяет вставку, увеличение и удаление в случайном порядке с dict
+        и проверяет баланс после них
+        :return: None
+        """
+        rnd = random.Random(0)
+        expected = {}
+        for _ in range(3000):
+            key = rnd.randrange(500)
+            action = rnd.random()
+            if action < 0.4:
+                self.map[key] = key
+                expected[key] = key
+            elif action < 0.7:
+                self.map.increment(key)
+                expected[key] = expected.get(key, 0) + 1
+            elif key in expected:
+                del self.map[key]
+                del expected[key]
+            else:
+                with self.assertRaises(KeyError):
+                    del self.map[key]
+        self.assertEqual(len(self.map), len(expected))
+        self.assertEqual(dict(self.map), expected)
+        self.check_balance(self.map.root)
+
+    def test_del_root(self):
+        """
+        Проверяет удаление корня без едного, одного и двух дочерних элементов
+        :return: None
+        """
+        self.map[1] = 'root'
+        del self.map[1]
+        self.assertIsNone(self.map.root)
+        self.map[1] = 'root'
+        self.map[2] = 'right'
+        del self.map[1]
+        self.assertEqual(self.map.root.value, 'right')
+        self.map[1] = 'left'
+        self.map[3] = 'right'
+        del self.map[2]
+        self.assertEqual(self.map.root.value, 'right')
+        self.assertEqual(self.map.root.left.value, 'left')
+
+    def test_sorted_iteration_and_range(self):
+        """
+        Проверяет, что итерация идет по возрастанию ключей, а range_items(low, high)
+        возвращает диапазон [low, high)
+        :return: None
+        """
+        keys = list(range(0, 100, 3))
+        random.Random(1).shuffle(keys)
+        for key in keys:
+            self.map[key] = -key
+        self.assertEqual(list(self.map.keys()), sorted(keys))
+        self.assertEqual(list(self.map.range_items(10, 20)), [(12, -12), (15, -15), (18, -18)])
+        self.assertEqual(list(self.map.range_items(high=4)), [(0, 0), (3, -3)])
+        self.assertEqual(list(self.map.range_items(97)), [(99, -99)])
+
+    def test_prefix_floor_ceiling(self):
+        """
+        Проверяет поиск по префиксу и ближайших ключей снизу и сверху
+        :return: None
+        """
+        for word in ('ма', 'мама', 'мат', 'математика', 'матч', 'мать', 'мб'):
+            self.map[word] = len(word)
+        self.assertEqual([key for key, _ in self.map.prefix_items('мат')],
+                         ['мат', 'математика', 'матч', 'мать'])
+        self.assertEqual(list(self.map.prefix_items('я')), [])
+        self.assertEqual(self.map.floor('матрица'), ('математика', 10))
+        self.assertEqual(self.map.floor('мат'), ('мат', 3))
+        self.assertIsNone(self.map.floor('а'))
+        self.assertEqual(self.map.ceiling('матрица'), ('матч', 4))
+        self.assertIsNone(self.map.ceiling('я'))
+
+    def test_rank_select(self):
+        """
+        Проверяет порядковые статистики после вставок и удалений
+        :return: None
+        """
+        for key in range(200):
+            self.map[key] = key
+        for key in range(0, 200, 2):
+            del self.map[key]
+        self.assertEqual(self.map.rank(51), 25)
+        self.assertEqual(self.map.rank(50), 25)
+        self.assertEqual(self.map.select(25), (51, 51))
+        self.assertEqual(self.map.select(99), (199, 199))
+        self.assertEqual(self.map.select(0), (1, 1))
+        self.assertEqual(self.map.rank(-1), 0)
+        self.assertEqual(self.map.rank(1000), 100)
+        with self.assertRaises(IndexError):
+            self.map.select(100)
+        with self.assertRaises(IndexError):
+            self.map.select(-1)
+        with self.assertRaises(IndexError):
+            self.h_test().select(0)
+        self.assertEqual(self.h_test().rank(5), 0)
+
+    def test_read_builds_balanced_tree(self):
+        """
+        Проверяет, что read строит сбалансированное дерево с верными высотами и размерами
+        :return: None
+        """
+        for index in range(3000):
+            self.map[f'word{index:05}'] = index
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'words.txt')
+            self.map.write(path, 'w')
+            restored = self.h_test.read(path)
+        self.check_balance(restored.root)
+        self.assertEqual(restored.select(1234), ('word01234', 1234))
+        restored['word99999'] = 0
+        del restored['word00000']
+        self.check_balance(restored.root)
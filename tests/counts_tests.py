@@ -0,0 +1,92 @@
+"""
+Модуль для тестирования бинарного формата счетчиков слов
+"""
+import os
+import tempfile
+import unittest
+from src.storage.counts import CountsFile, counts_merge, counts_to_words, \
+    words_to_counts, write_counts
+
+
+class CountsFileTesting(unittest.TestCase):
+    """
+    Класс для тестирования words.bin
+    """
+    def setUp(self):
+        """
+        Создает временную папку для файлов
+        :return: None
+        """
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = lambda name: os.path.join(self.tmp_dir.name, name)
+
+    def tearDown(self):
+        """
+        Удаляет временную папку
+        :return: None
+        """
+        self.tmp_dir.cleanup()
+
+    def test_lookup(self):
+        """
+        Проверяет поиск слов, в том числе русских, и отсутствующих слов
+        :return: None
+        """
+        write_counts([('слово', 3), ('abc', 1), ('ёж', 7)], self.path('a.bin'))
+        with CountsFile(self.path('a.bin')) as counts_file:
+            self.assertEqual(len(counts_file), 3)
+            self.assertEqual(counts_file['слово'], 3)
+            self.assertEqual(counts_file['ёж'], 7)
+            self.assertNotIn('нет', counts_file)
+            with self.assertRaises(KeyError):
+                _ = counts_file['нет']
+            self.assertEqual(list(counts_file), [('abc', 1), ('слово', 3), ('ёж', 7)])
+
+    def test_text_round_trip(self):
+        """
+        Проверяет, что words.txt -> words.bin -> words.txt не меняет файл
+        :return: None
+        """
+        with open(self.path('words.txt'), 'w', encoding='utf8') as file:
+            file.write('а 2\nбыть 1\nя 10\n')
+        words_to_counts(self.path('words.txt'), self.path('words.bin'))
+        counts_to_words(self.path('words.bin'), self.path('back.txt'))
+        with open(self.path('back.txt'), 'r', encoding='utf8') as file:
+            self.assertEqual(file.read(), 'а 2\nбыть 1\nя 10\n')
+
+    def test_merge(self):
+        """
+        Проверяет, что объединение суммирует количества одинаковых слов
+        :return: None
+        """
+        write_counts([('а', 1), ('в', 2)], self.path('a.bin'))
+        write_counts([('б', 5), ('в', 3)], self.path('b.bin'))
+        write_counts([], self.path('c.bin'))
+        counts_merge(self.path('a.bin'), self.path('b.bin'), self.path('c.bin'),
+                     result_path=self.path('res.bin'))
+        with CountsFile(self.path('res.bin')) as counts_file:
+            self.assertEqual(list(counts_file), [('а', 1), ('б', 5), ('в', 5)])
+
+    def test_large_counts(self):
+        """
+        Проверяет, что общие количества больше 2^32 объединяются и читаются без потерь,
+        а переполнение uint64 не оставляет недописанного файла
+        :return: None
+        """
+        write_counts([('а', 3 << 31), ('б', 1)], self.path('a.bin'))
+        write_counts([('а', 3 << 31)], self.path('b.bin'))
+        counts_merge(self.path('a.bin'), self.path('b.bin'), result_path=self.path('res.bin'))
+        with CountsFile(self.path('res.bin')) as counts_file:
+            self.assertEqual(list(counts_file), [('а', 3 << 32), ('б', 1)])
+            self.assertEqual(counts_file['а'], 3 << 32)
+        counts_to_words(self.path('res.bin'), self.path('res.txt'))
+        words_to_counts(self.path('res.txt'), self.path('back.bin'))
+        with CountsFile(self.path('back.bin')) as counts_file:
+            self.assertEqual(counts_file['а'], 3 << 32)
+        write_counts([('а', (1 << 64) - 1)], self.path('max.bin'))
+        with self.assertRaises(OverflowError):
+            counts_merge(self.path('max.bin'), self.path('a.bin'), result_path=self.path('res.bin'))
+        with CountsFile(self.path('res.bin')) as counts_file:
+            self.assertEqual(counts_file['а'], 3 << 32)
+        self.assertEqual(sorted(os.listdir(self.tmp_dir.name)),
+                         ['a.bin', 'b.bin', 'back.bin', 'max.bin', 'res.bin', 'res.txt'])
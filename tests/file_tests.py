@@ -0,0 +1,232 @@
+"""
+Модуль для тестирования объединения файлов слов
+"""
+import os
+import shutil
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from src.parser.file import file_most_common, files_merge, heap_files_merge, hierarchical_files_merge, \
+    links_reader, links_writer, mapreduce_files_merge, merge_buffer_size, partition_bounds
+from src.parser.wiki import LINKS_FILENAME, get_urls, read_content, rebuild_links_index
+
+ARTICLES_DIRECTORY = os.path.join(os.path.dirname(__file__), '..', 'articles')
+
+
+class FilesMergeTesting(unittest.TestCase):
+    """
+    Класс для тестирования объединения файлов слов
+    """
+    def setUp(self):
+        """
+        Создает временную папку для результатов
+        :return: None
+        """
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = lambda name: os.path.join(self.tmp_dir.name, name)
+        self.filenames = [os.path.join(ARTICLES_DIRECTORY, folder, 'words.txt')
+                          for folder in sorted(os.listdir(ARTICLES_DIRECTORY))]
+
+    def tearDown(self):
+        """
+        Удаляет временную папку
+        :return: None
+        """
+        self.tmp_dir.cleanup()
+
+    def read(self, name: str) -> str:
+        """Возвращает содержимое файла из временной папки"""
+        with open(self.path(name), 'r', encoding='utf8') as file:
+            return file.read()
+
+    def test_partition_bounds(self):
+        """
+        Проверяет, что границы диапазонов - отсортированные различные буквы
+        :return: None
+        """
+        bounds = partition_bounds(self.filenames, 4)
+        self.assertLessEqual(len(bounds), 3)
+        self.assertEqual(bounds, sorted(set(bounds)))
+        self.assertTrue(all(len(bound) == 1 for bound in bounds))
+
+    def test_heap_merges_match_files_merge(self):
+        """
+        Проверяет, что объединения кучей (в том числе многопроходное и с маленьким буфером)
+        совпадают с files_merge
+        :return: None
+        """
+        files_merge(*self.filenames, result_path=self.path('expected.txt'))
+        heap_files_merge(*self.filenames, result_path=self.path('heap.txt'))
+        heap_files_merge(*self.filenames, result_path=self.path('small.txt'), buffer_size=256)
+        hierarchical_files_merge(*self.filenames, result_path=self.path('tree.txt'), max_fan_in=4,
+                                 tmp_dir=self.tmp_dir.name, buffer_size=1024)
+        for name in ('heap.txt', 'small.txt', 'tree.txt'):
+            self.assertEqual(self.read(name), self.read('expected.txt'))
+
+    def write_inputs(self, contents: list) -> list:
+        """Записывает входные файлы слов во временную папку и возвращает их имена"""
+        filenames = []
+        for index, lines in enumerate(contents):
+            filenames.append(self.path(f'input{index}.txt'))
+            with open(filenames[-1], 'w', encoding='utf8') as file:
+                file.writelines(f'{word} {count}\n' for word, count in lines)
+        return filenames
+
+    def assert_merge_matches(self, merge, filenames: list, **kwargs) -> None:
+        """Проверяет, что объединение merge побайтно совпадает с files_merge"""
+        files_merge(*filenames, result_path=self.path('expected.txt'))
+        merge(*filenames, result_path=self.path('result.txt'), **kwargs)
+        self.assertEqual(self.read('result.txt'), self.read('expected.txt'))
+
+    def test_heap_merge_edge_cases(self):
+        """
+        Проверяет heap_files_merge на пустых файлах, одном файле и словах,
+        которые повторяются в нескольких файлах
+        :return: None
+        """
+        duplicates = [[('дом', 1), ('кот', 2), ('мир', 3)], [('кот', 5), ('мир', 1)],
+                      [('арбуз', 1), ('кот', 1), ('ясень', 7)]]
+        cases = {
+            'no files': [],
+            'one empty file': [[]],
+            'empty files': [[], [('кот', 1)], []],
+            'one file': [[('дом', 1), ('кот', 2)]],
+            'duplicates': duplicates,
+            'same file twice': duplicates[:1] * 2,
+        }
+        for name, contents in cases.items():
+            with self.subTest(name):
+                self.assert_merge_matches(heap_files_merge, self.write_inputs(contents))
+
+    def test_hierarchical_merge_fan_in(self):
+        """
+        Проверяет многопроходное объединение на границах max_fan_in:
+        один файл, ровно max_fan_in файлов, max_fan_in + 1 и несколько уровней
+        :return: None
+        """
+        for files in (1, 2, 3, 4, 17):
+            with self.subTest(files=files):
+                contents = [[(f'слово{word:03}', index + word) for word in range(index, 60, files)] +
+                            [('общее', index + 1)] for index in range(files)]
+                contents = [sorted(lines) for lines in contents]
+                self.assert_merge_matches(hierarchical_files_merge, self.write_inputs(contents),
+                                          max_fan_in=3, tmp_dir=self.tmp_dir.name)
+        with self.assertRaises(ValueError):
+            hierarchical_files_merge(*self.filenames, result_path=self.path('result.txt'), max_fan_in=1)
+
+    def test_mapreduce_non_cyrillic_words(self):
+        """
+        Проверяет map-reduce на словах с латинскими, небуквенными и редкими первыми символами,
+        которые попадают в крайние диапазоны первых букв
+        :return: None
+        """
+        words = ['42', '_x', 'apple', 'Zeta', 'élan', 'ß', 'ёж', 'арбуз', 'ястреб', '中文', '~']
+        contents = [sorted((word, index + 1) for word in words[index::2] + ['общее']) for index in range(3)]
+        filenames = self.write_inputs(contents)
+        for partitions in (1, 2, 5, 20):
+            with self.subTest(partitions=partitions):
+                self.assert_merge_matches(mapreduce_files_merge, filenames, workers=1,
+                                          partitions=partitions, tmp_dir=self.tmp_dir.name)
+
+    def test_merge_buffer_size(self):
+        """
+        Проверяет, что буферы объединения уменьшаются с количеством файлов в заданных пределах
+        :return: None
+        """
+        self.assertEqual(merge_buffer_size(2), 1 << 20)
+        self.assertLessEqual(65 * merge_buffer_size(64), 1 << 24)
+        self.assertEqual(merge_buffer_size(100000), 1 << 16)
+
+    def test_mapreduce_matches_files_merge(self):
+        """
+        Проверяет, что map-reduce объединение совпадает с files_merge
+        :return: None
+        """
+        files_merge(*self.filenames, result_path=self.path('expected.txt'))
+        mapreduce_files_merge(*self.filenames, result_path=self.path('inline.txt'),
+                              workers=1, partitions=5)
+        mapreduce_files_merge(*self.filenames, result_path=self.path('pool.txt'), workers=2)
+        self.assertEqual(self.read('inline.txt'), self.read('expected.txt'))
+        self.assertEqual(self.read('pool.txt'), self.read('expected.txt'))
+
+    def test_top_k(self):
+        """
+        Проверяет, что top_k объединения и file_most_common совпадают
+        с сортировкой всего результата по количеству
+        :return: None
+        """
+        files_merge(*self.filenames, result_path=self.path('expected.txt'))
+        pairs = [(word, int(count)) for word, count in map(str.split, self.read('expected.txt').splitlines())]
+        expected = sorted(pairs, key=lambda pair: (-pair[1], pair[0]))[:50]
+        self.assertEqual(file_most_common(self.path('expected.txt'), 50), expected)
+        top_words = mapreduce_files_merge(*self.filenames, result_path=self.path('inline.txt'),
+                                          workers=1, partitions=5, top_k=50)
+        self.assertEqual(top_words, expected)
+        self.assertIsNone(mapreduce_files_merge(*self.filenames, result_path=self.path('inline.txt'),
+                                                workers=1))
+
+
+class LinksTesting(unittest.TestCase):
+    """
+    Класс для тестирования файлов ссылок статей (links.txt)
+    """
+    def setUp(self):
+        """
+        Создает временную папку
+        :return: None
+        """
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = lambda name: os.path.join(self.tmp_dir.name, name)
+
+    def tearDown(self):
+        """
+        Удаляет временную папку
+        :return: None
+        """
+        self.tmp_dir.cleanup()
+
+    def test_write_read(self):
+        """
+        Проверяет запись и чтение ссылок, в том числе пустого списка и перезапись файла
+        :return: None
+        """
+        urls = ['https://ru.wikipedia.org/wiki/Кот', 'https://ru.wikipedia.org/wiki/%D0%9C%D0%B8%D1%80']
+        links_writer(urls, self.path(LINKS_FILENAME))
+        self.assertEqual(links_reader(self.path(LINKS_FILENAME)), urls)
+        links_writer([], self.path(LINKS_FILENAME))
+        self.assertEqual(links_reader(self.path(LINKS_FILENAME)), [])
+        self.assertEqual(os.listdir(self.tmp_dir.name), [LINKS_FILENAME])
+
+    def test_concurrent_writers(self):
+        """
+        Проверяет, что потоки одного процесса, одновременно пишущие один файл,
+        не мешают друг другу: файл содержит целиком один из списков
+        :return: None
+        """
+        lists = [[f'https://ru.wikipedia.org/wiki/{index}_{line}' for line in range(2000)] for index in range(8)]
+        with ThreadPoolExecutor(8) as executor:
+            for _ in executor.map(lambda urls: links_writer(urls, self.path(LINKS_FILENAME)), lists * 4):
+                pass
+        self.assertIn(links_reader(self.path(LINKS_FILENAME)), lists)
+        self.assertEqual(os.listdir(self.tmp_dir.name), [LINKS_FILENAME])
+
+    def test_rebuild_links_index(self):
+        """
+        Проверяет, что rebuild_links_index пишет ссылки из content.txt
+        и не трогает существующие links.txt без overwrite
+        :return: None
+        """
+        folders = sorted(os.listdir(ARTICLES_DIRECTORY))[:3]
+        for folder in folders:
+            shutil.copytree(os.path.join(ARTICLES_DIRECTORY, folder), self.path(folder))
+        os.mkdir(self.path('empty'))
+        self.assertEqual(rebuild_links_index(self.tmp_dir.name), 3)
+        for folder in folders:
+            html, _ = read_content(os.path.join(self.path(folder), 'content.txt'))
+            self.assertEqual(links_reader(os.path.join(self.path(folder), LINKS_FILENAME)), get_urls(html))
+        links_writer(['stale'], os.path.join(self.path(folders[0]), LINKS_FILENAME))
+        self.assertEqual(rebuild_links_index(self.tmp_dir.name), 0)
+        self.assertEqual(links_reader(os.path.join(self.path(folders[0]), LINKS_FILENAME)), ['stale'])
+        self.assertEqual(rebuild_links_index(self.tmp_dir.name, overwrite=True), 3)
+        self.assertNotEqual(links_reader(os.path.join(self.path(folders[0]), LINKS_FILENAME)), ['stale'])
+        self.assertFalse(os.path.exists(os.path.join(self.path('empty'), LINKS_FILENAME)))
@@ -26,16 +26,19 @@ class HashMapTesting(MapTesting):
     def test_inner_list_reduction(self) -> None:
         """
         Проверяет, уменьшается ли inner list хэш-таблицы,
-        когда заполнено менее 30% list`a
+        когда заполнено менее 12.5% list`a, но не меньше начального размера
         :return: None
         """
-        self.map[1] = 'first'
-        self.map[2] = 'second'
-        self.map[3] = 'temp'
+        initial_capacity = self.map.get_capacity()
+        for i in range(100):
+            self.map[i] = i
         old_capacity = self.map.get_capacity()
-        del self.map[3]
-        new_capacity = self.map.get_capacity()
-        self.assertLess(new_capacity, old_capacity)
+        for i in range(95):
+            del self.map[i]
+        self.assertLess(self.map.get_capacity(), old_capacity)
+        for i in range(95, 100):
+            del self.map[i]
+        self.assertEqual(self.map.get_capacity(), initial_capacity)
 
     def test_inner_list_expansion(self):
         """
@@ -73,3 +76,75 @@ class HashMapTesting(MapTesting):
         check_no = self.map.get(2, 0)
         self.assertEqual(check_has, 2)
         self.assertEqual(check_no, 0)
+
+    def test_no_resize_thrash(self):
+        """
+        Проверяет, что чередование вставки и удаления у порога расширения
+        не меняет размер inner list`a каждый раз
+        :return: None
+        """
+        key = 0
+        while self.map.get_capacity() == 16:
+            self.map[key] = key
+            key += 1
+        capacities = set()
+        for _ in range(100):
+            del self.map[key - 1]
+            capacities.add(self.map.get_capacity())
+            self.map[key - 1] = key
+            capacities.add(self.map.get_capacity())
+        self.assertEqual(capacities, {32})
+
+    def test_incremental_migration(self):
+        """
+        Проверяет, что во время постепенного переноса элементов
+        все ключи доступны, перезаписываются и удаляются
+        :return: None
+        """
+        for i in range(1000):
+            self.map[i] = i
+            self.assertEqual(self.map[i // 2], i // 2)
+        for i in range(0, 1000, 2):
+            self.map[i] = -i
+        for i in range(0, 1000, 3):
+            del self.map[i]
+        expected = {i: (-i if i % 2 == 0 else i) for i in range(1000) if i % 3 != 0}
+        self.assertEqual(len(self.map), len(expected))
+        self.assertEqual(dict(self.map), expected)
+
+    def test_expected_size(self):
+        """
+        Проверяет, что map, созданная с ожидаемым размером или после reserve,
+        не расширяется при вставке этого количества элементов и clear возвращается к нему
+        :return: None
+        """
+        self.map = HashMap(expected_size=1000)
+        capacity = self.map.get_capacity()
+        for i in range(1000):
+            self.map[i] = i
+        self.assertEqual(self.map.get_capacity(), capacity)
+        reserved = HashMap()
+        reserved.reserve(5000)
+        capacity = reserved.get_capacity()
+        reserved.clear()
+        self.assertEqual(reserved.get_capacity(), capacity)
+        self.assertEqual(HashMap.fromkeys(range(1000), 0).get_capacity(), self.map.get_capacity())
+
+    def test_no_shrink_below_reserve(self):
+        """
+        Проверяет, что удаления не уменьшают inner list меньше размера из reserve
+        и начального размера
+        :return: None
+        """
+        self.map.reserve(200000)
+        capacity = self.map.get_capacity()
+        for i in range(10):
+            self.map[i] = i
+        for i in range(10):
+            del self.map[i]
+        self.assertEqual(self.map.get_capacity(), capacity)
+        self.map = HashMap(expected_size=1000)
+        capacity = self.map.get_capacity()
+        self.map[0] = 0
+        del self.map[0]
+        self.assertEqual(self.map.get_capacity(), capacity)
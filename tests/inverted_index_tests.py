@@ -0,0 +1,91 @@
+"""
+Модуль для тестирования инвертированного индекса
+"""
+import os
+import tempfile
+import unittest
+from src.storage.inverted_index import InvertedIndex, add_articles, compact, read_manifest
+
+
+class InvertedIndexTesting(unittest.TestCase):
+    """
+    Класс для тестирования инвертированного индекса
+    """
+    def setUp(self):
+        """
+        Создает временные папки статей и индекса
+        :return: None
+        """
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.articles_path = os.path.join(self.tmp_dir.name, 'articles')
+        self.index_path = os.path.join(self.tmp_dir.name, 'index')
+        os.mkdir(self.articles_path)
+
+    def tearDown(self):
+        """
+        Удаляет временные папки
+        :return: None
+        """
+        self.tmp_dir.cleanup()
+
+    def add_article(self, folder: str, words: str) -> None:
+        """Создает папку статьи с words.txt"""
+        os.mkdir(os.path.join(self.articles_path, folder))
+        with open(os.path.join(self.articles_path, folder, 'words.txt'), 'w', encoding='utf8') as file:
+            file.write(words)
+
+    def test_lookup(self):
+        """
+        Проверяет списки статей слова, top-k и отсутствующие слова
+        :return: None
+        """
+        self.add_article('Первая статья', 'кот 3\nмир 1\n')
+        self.add_article('Вторая', 'кот 5\nдом 2\n')
+        self.assertEqual(add_articles(self.articles_path, self.index_path), 2)
+        with InvertedIndex(self.index_path) as index:
+            self.assertEqual(index.postings('кот'), [('Вторая', 5), ('Первая статья', 3)])
+            self.assertEqual(index.top_k('кот', 1), [('Вторая', 5)])
+            self.assertEqual(index.document_frequency('мир'), 1)
+            self.assertEqual(index.total_count('кот'), 8)
+            self.assertNotIn('собака', index)
+            self.assertEqual(index.postings('собака'), [])
+
+    def test_incremental_add_and_compact(self):
+        """
+        Проверяет, что новые статьи добавляются отдельным сегментом без перестроения
+        старых, а после объединения сегментов результаты запросов не меняются
+        :return: None
+        """
+        self.add_article('а', 'кот 1\n')
+        add_articles(self.articles_path, self.index_path)
+        first_segment = os.path.join(self.index_path, read_manifest(self.index_path)[0][0])
+        modified = os.stat(first_segment).st_mtime_ns
+        self.add_article('б', 'дом 4\nкот 2\n')
+        self.assertEqual(add_articles(self.articles_path, self.index_path), 1)
+        self.assertEqual(add_articles(self.articles_path, self.index_path), 0)
+        self.assertEqual(os.stat(first_segment).st_mtime_ns, modified)
+        self.assertEqual(len(read_manifest(self.index_path)[0]), 2)
+
+        compact(self.index_path)
+        segments, articles = read_manifest(self.index_path)
+        self.assertEqual(len(segments), 1)
+        self.assertEqual(articles, ['а', 'б'])
+        with InvertedIndex(self.index_path) as index:
+            self.assertEqual(index.postings('кот'), [('а', 1), ('б', 2)])
+            self.assertEqual(index.postings('дом'), [('б', 4)])
+
+    def test_bundled_articles(self):
+        """
+        Сверяет индекс сохраненных статей с их words.txt
+        :return: None
+        """
+        base_path = os.path.join(os.path.dirname(__file__), '..', 'articles')
+        add_articles(base_path, self.index_path)
+        folders = sorted(os.listdir(base_path))
+        with InvertedIndex(self.index_path) as index:
+            self.assertEqual(index.articles, folders)
+            for folder in folders[::10]:
+                with open(os.path.join(base_path, folder, 'words.txt'), 'r', encoding='utf8') as file:
+                    for line in file.readlines()[::50]:
+                        word, count = line.split()
+                        self.assertIn((folder, int(count)), index.postings(word))
@@ -0,0 +1,59 @@
+"""
+Модуль для тестирования Linked list
+"""
+import unittest
+from src.maps.linked_list import LinkedElem, LinkedList
+
+
+class LinkedListTesting(unittest.TestCase):
+    """
+    Класс для тестирования методов Linked list
+    """
+    def setUp(self):
+        """
+        Создает список из трех элементов
+        :return: None
+        """
+        self.list = LinkedList(LinkedElem('a', 1))
+        self.list.add_data('b', 2)
+        self.list.add_data('c', 3)
+
+    def test_nested_iteration(self):
+        """
+        Проверяет, что вложенные обходы одного списка не мешают друг другу
+        :return: None
+        """
+        pairs = [(first, second) for first, _ in self.list for second, _ in self.list]
+        self.assertEqual(len(pairs), 9)
+        self.assertEqual(pairs[-1], ('c', 'c'))
+
+    def test_independent_iterators(self):
+        """
+        Проверяет, что у каждого итератора свой текущий узел
+        :return: None
+        """
+        first = iter(self.list)
+        second = iter(self.list)
+        self.assertEqual(next(first), ('a', 1))
+        self.assertEqual(next(first), ('b', 2))
+        self.assertEqual(next(second), ('a', 1))
+        self.assertEqual(list(first), [('c', 3)])
+
+    def test_length(self):
+        """
+        Проверяет длину списка после добавления и удаления элементов
+        :return: None
+        """
+        self.assertEqual(len(self.list), 3)
+        self.assertTrue(self.list.remove('b'))
+        self.assertFalse(self.list.remove('b'))
+        self.assertEqual(len(self.list), 2)
+        self.assertEqual(list(self.list), [('a', 1), ('c', 3)])
+
+    def test_no_instance_dict(self):
+        """
+        Проверяет, что узлы и списки не создают __dict__
+        :return: None
+        """
+        self.assertFalse(hasattr(self.list.head, '__dict__'))
+        self.assertFalse(hasattr(self.list, '__dict__'))
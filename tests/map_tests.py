@@ -1,9 +1,14 @@
 """
 Модуль для тестирования map
 """
+import os
+import random
+import tempfile
 from test import mapping_tests
 from abc import ABC
 
+FILES_DIRECTORY = os.path.join(os.path.dirname(__file__), 'files')  # файлы для тестов чтения
+
 
 class MapTesting(ABC, mapping_tests.BasicTestMappingProtocol):
     """
@@ -11,13 +16,56 @@ class MapTesting(ABC, mapping_tests.BasicTestMappingProtocol):
     """
     h_test = ABC
 
+    @property
+    def type2test(self):
+        """Класс map для тестов протокола отображения (mapping_tests)"""
+        return self.h_test
+
     def setUp(self):
         """
-        Создает экземпляр класса map
+        Создает экземпляр класса map; сам абстрактный класс не тестируется
         :return: None
         """
+        if self.h_test is ABC:
+            self.skipTest('abstract map tests')
         self.map = self.h_test()
 
+    def test_read(self):
+        """
+        Тест протокола отображения только для чтения (mapping_tests), в котором
+        итерация по map сравнивается с items(): map при итерации возвращает пары k, v,
+        а не ключи, как dict. Остальные проверки те же
+        :return: None
+        """
+        empty = self._empty_mapping()
+        full = self._full_mapping(self.reference)
+        for key, value in self.reference.items():
+            self.assertEqual(full[key], value)
+        known_key, known_value = next(iter(self.other.items()))
+        self.assertRaises(KeyError, lambda: full[known_key])
+        self.assertEqual(len(empty), 0)
+        self.assertEqual(len(full), len(self.reference))
+        for key in self.reference:
+            self.assertIn(key, full)
+        self.assertNotIn(known_key, full)
+        self.assertEqual(empty, empty)
+        self.assertEqual(full, full)
+        self.assertNotEqual(empty, full)
+        self.assertNotEqual(full, empty)
+        self.assertFalse(empty)
+        self.assertTrue(full)
+        for iterable, reference in ((full.keys(), self.reference.keys()),
+                                    (full.values(), self.reference.values()),
+                                    (full.items(), self.reference.items()),
+                                    (full, self.reference.items())):
+            iterator = iter(iterable)
+            self.assertTrue(hasattr(iterator, '__next__'))
+            self.assertEqual(set(iterator), set(reference))
+        key, value = next(iter(full.items()))
+        self.assertEqual(full.get(key, known_value), value)
+        self.assertEqual(full.get(known_key, known_value), known_value)
+        self.assertNotIn(known_key, full)
+
     def test_set_get_item(self):
         """
         Методы набора/получения элементов тестов
@@ -57,7 +105,7 @@ class MapTesting(ABC, mapping_tests.BasicTestMappingProtocol):
         Проверяет, правильно ли функция считывает данные из файла
         :return: None
         """
-        filepath = 'files/to_read.txt'
+        filepath = os.path.join(FILES_DIRECTORY, 'to_read.txt')
         self.map = self.map.read(filepath)
         self.assertEqual(len(self.map), 3)
         self.assertEqual(self.map['babagi'], 'fortaite')
@@ -67,14 +115,134 @@ class MapTesting(ABC, mapping_tests.BasicTestMappingProtocol):
         Проверяет, правильно ли функция записывает данные в файл
         :return: None
         """
-        filepath = 'files/to_write.txt'
         self.map[1] = 'first'
         self.map[2] = 'second'
-        self.map.write(filepath, 'w')
-        with open(filepath, 'r', encoding='utf8') as file:
-            line = file.readline()
-            while line:
-                key, value = line.split()
-                key = int(key)
-                self.assertEqual(value, self.map[key])
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filepath = os.path.join(tmp_dir, 'to_write.txt')
+            self.map.write(filepath, 'w')
+            with open(filepath, 'r', encoding='utf8') as file:
                 line = file.readline()
+                while line:
+                    key, value = line.split()
+                    key = int(key)
+                    self.assertEqual(value, self.map[key])
+                    line = file.readline()
+
+    def test_increment(self):
+        """
+        Проверяет, что increment создает отсутствующий ключ и увеличивает существующий
+        :return: None
+        """
+        self.assertEqual(self.map.increment('word'), 1)
+        self.assertEqual(self.map.increment('word', 4), 5)
+        self.assertEqual(self.map['word'], 5)
+        self.assertEqual(len(self.map), 1)
+
+    def test_bulk_add_and_merge_counts(self):
+        """
+        Проверяет подсчет слов через bulk_add и слияние счетчиков двух map
+        :return: None
+        """
+        words = [f'word{i % 37}' for i in range(500)]
+        self.map.bulk_add(words)
+        other = self.h_test()
+        other.bulk_add(words[:100])
+        other.merge_counts(self.map)
+        for i in range(37):
+            key = f'word{i}'
+            self.assertEqual(self.map[key], words.count(key))
+            self.assertEqual(other[key], words.count(key) + words[:100].count(key))
+        self.assertEqual(len(other), 37)
+
+    def test_most_common(self):
+        """
+        Проверяет, что most_common возвращает пары с наибольшими значениями
+        по убыванию значений и по возрастанию ключей при равных значениях
+        :return: None
+        """
+        counts = {f'word{i}': i % 10 for i in range(100)}
+        self.map.update(counts)
+        expected = sorted(counts.items(), key=lambda pair: (-pair[1], pair[0]))
+        self.assertEqual(self.map.most_common(15), expected[:15])
+        self.assertEqual(self.map.most_common(), expected)
+        self.assertEqual(self.map.most_common(0), [])
+
+    def test_popitem_drains(self):
+        """
+        Проверяет, что popitem по очереди возвращает все пары и затем вызывает KeyError
+        :return: None
+        """
+        expected = {f'key{i}': i for i in range(300)}
+        for key, value in expected.items():
+            self.map[key] = value
+        popped = {}
+        while len(self.map):
+            key, value = self.map.popitem()
+            popped[key] = value
+        self.assertEqual(popped, expected)
+        with self.assertRaises(KeyError):
+            self.map.popitem()
+
+    def test_eq_and_update(self):
+        """
+        Проверяет сравнение map с map и dict и update из map, dict и списка пар
+        :return: None
+        """
+        source = {f'key{i}': i for i in range(100)}
+        self.map.update(source)
+        other = self.h_test()
+        other.update(self.map)
+        self.assertTrue(self.map == source)
+        self.assertTrue(self.map == other)
+        other.update([('key5', -5)])
+        self.assertTrue(self.map != other)
+        other['key5'] = 5
+        other['extra'] = 0
+        self.assertTrue(self.map != other)
+
+    def test_read_parses_counts(self):
+        """
+        Проверяет, что read преобразует числовые значения в int
+        :return: None
+        """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'words.txt')
+            with open(path, 'w', encoding='utf8') as file:
+                file.write('альфа 3\nбета слово\nгамма 12')
+            self.map = self.map.read(path)
+        self.assertEqual(len(self.map), 3)
+        self.assertEqual(self.map['альфа'], 3)
+        self.assertEqual(self.map['бета'], 'слово')
+        self.assertEqual(self.map['гамма'], 12)
+
+
+class SortedMapTesting(MapTesting):
+    """
+    Абстрактный класс с тестами для map с упорядоченными ключами
+    (TreeMap, AVLTreeMap, SortedBlockMap)
+    """
+    def test_rank_select(self):
+        """
+        Проверяет rank и select, в том числе отсутствующие ключи, пустую map и границы индексов
+        :return: None
+        """
+        self.assertEqual(self.map.rank(5), 0)
+        with self.assertRaises(IndexError):
+            self.map.select(0)
+        keys = list(range(0, 600, 3))
+        random.Random(4).shuffle(keys)
+        for key in keys:
+            self.map[key] = -key
+        keys.sort()
+        for index, key in enumerate(keys):
+            self.assertEqual(self.map.rank(key), index)
+            self.assertEqual(self.map.rank(key + 1), index + 1)
+            self.assertEqual(self.map.select(index), (key, -key))
+        self.assertEqual(self.map.rank(-1), 0)
+        self.assertEqual(self.map.rank(1000), len(keys))
+        for index in (-1, len(keys)):
+            with self.assertRaises(IndexError):
+                self.map.select(index)
+        del self.map[3]
+        self.assertEqual(self.map.rank(6), 1)
+        self.assertEqual(self.map.select(1), (6, -6))
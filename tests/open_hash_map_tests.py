@@ -0,0 +1,104 @@
+"""
+Модуль для тестирования Hash map с открытой адресацией
+"""
+from tests.map_tests import MapTesting
+from src.maps.open_hash_map import OpenHashMap
+
+
+class OpenHashMapTesting(MapTesting):
+    """
+    Класс для тестирования методов Hash map с открытой адресацией
+    """
+    h_test = OpenHashMap
+
+    def test_deletion(self) -> None:
+        """
+        Проверяет, действительно ли del удаляет элемент
+        :return: None
+        """
+        self.map[1] = 'first'
+        self.map[0] = 'will be deleted'
+        del self.map[0]
+        with self.assertRaises(KeyError):
+            non_existing = self.map[0]
+            non_existing += 1
+
+    def test_probe_chain_after_deletion(self) -> None:
+        """
+        Проверяет, что после удаления элемента из середины цепочки проб
+        остальные элементы цепочки находятся
+        :return: None
+        """
+        capacity = self.map.get_capacity()
+        self.map[1] = 'first'
+        self.map[1 + capacity] = 'second'
+        self.map[1 + 2 * capacity] = 'third'
+        del self.map[1 + capacity]
+        self.assertEqual(self.map[1 + 2 * capacity], 'third')
+        self.map[1 + capacity] = 'again'
+        self.assertEqual(len(self.map), 3)
+        self.assertEqual(self.map[1 + capacity], 'again')
+
+    def test_inner_list_expansion(self):
+        """
+        Проверяет, расширяется ли inner list, когда заполнено более 70% list`a
+        :return: None
+        """
+        old_capacity = self.map.get_capacity()
+        for i in range(old_capacity):
+            self.map[i] = i*i
+        self.assertLess(old_capacity, self.map.get_capacity())
+        for i in range(old_capacity):
+            self.assertEqual(self.map[i], i*i)
+
+    def test_inner_list_reduction(self) -> None:
+        """
+        Проверяет, уменьшается ли inner list, когда заполнено менее 12.5% list`a
+        :return: None
+        """
+        for i in range(100):
+            self.map[i] = i
+        old_capacity = self.map.get_capacity()
+        for i in range(95):
+            del self.map[i]
+        self.assertLess(self.map.get_capacity(), old_capacity)
+        self.assertEqual(sorted(self.map.keys()), list(range(95, 100)))
+
+    def test_same_size_when_rewritten(self):
+        """
+        Проверяет, не изменяется ли _size, когда значение элемента переписывается
+        :return: None
+        """
+        self.map[1] = 'first'
+        self.map[2] = 'second'
+        old_size = len(self.map)
+        self.map[2] = 'new second'
+        self.assertEqual(old_size, len(self.map))
+
+    def test_get(self):
+        """
+        Проверяет, правильно ли работает метод get
+        :return: None
+        """
+        self.map[1] = 2
+        self.assertEqual(self.map.get(1, 0), 2)
+        self.assertEqual(self.map.get(2, 0), 0)
+
+    def test_no_shrink_below_reserve(self):
+        """
+        Проверяет, что удаления не уменьшают списки меньше размера из reserve
+        и начального размера
+        :return: None
+        """
+        self.map.reserve(200000)
+        capacity = self.map.get_capacity()
+        for i in range(10):
+            self.map[i] = i
+        for i in range(10):
+            del self.map[i]
+        self.assertEqual(self.map.get_capacity(), capacity)
+        self.map = OpenHashMap(expected_size=1000)
+        capacity = self.map.get_capacity()
+        self.map[0] = 0
+        del self.map[0]
+        self.assertEqual(self.map.get_capacity(), capacity)
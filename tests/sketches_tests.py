@@ -0,0 +1,155 @@
+"""
+Модуль для тестирования приближенной статистики (Count-Min и HyperLogLog)
+на сохраненных статьях: оценки сравниваются с точными words.txt
+"""
+import os
+import shutil
+import tempfile
+import unittest
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from src.storage.sketches import (SKETCH_FILENAME, CountMinSketch, HyperLogLog, WordSketch,
+                                  add_article_sketches, corpus_sketch, words_sketch)
+
+ARTICLES_DIRECTORY = os.path.join(os.path.dirname(__file__), '..', 'articles')
+
+
+def read_words(words_path: str) -> dict:
+    """Возвращает точные количества слов из words.txt"""
+    with open(words_path, 'r', encoding='utf8') as file:
+        return {word: int(count) for word, count in map(str.split, file)}
+
+
+class SketchesTesting(unittest.TestCase):
+    """
+    Класс для тестирования сводок слов
+    """
+    def setUp(self):
+        """
+        Создает временную копию статей
+        :return: None
+        """
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.articles_path = os.path.join(self.tmp_dir.name, 'articles')
+        shutil.copytree(ARTICLES_DIRECTORY, self.articles_path)
+        self.folders = sorted(os.listdir(self.articles_path))
+
+    def tearDown(self):
+        """
+        Удаляет временную копию
+        :return: None
+        """
+        self.tmp_dir.cleanup()
+
+    def words_path(self, folder: str) -> str:
+        """Путь к words.txt статьи"""
+        return os.path.join(self.articles_path, folder, 'words.txt')
+
+    def test_article_bounds(self):
+        """
+        Проверяет границы ошибок для каждой статьи: Count-Min не занижает, а завышает
+        больше epsilon * total не чаще чем в доле delta слов; HyperLogLog ошибается
+        меньше чем на 3 стандартные ошибки
+        :return: None
+        """
+        words, violations = 0, 0
+        for folder in self.folders:
+            exact = read_words(self.words_path(folder))
+            sketch = words_sketch(self.words_path(folder))
+            self.assertEqual(sketch.frequencies.total, sum(exact.values()))
+            bound = sketch.frequencies.error_bound()
+            for word, count in exact.items():
+                self.assertLessEqual(count, sketch.estimate(word))
+                violations += sketch.estimate(word) > count + bound
+            words += len(exact)
+            error = abs(sketch.distinct() - len(exact)) / len(exact)
+            self.assertLess(error, 3 * sketch.vocabulary.standard_error)
+        self.assertLessEqual(violations / words, sketch.frequencies.delta)
+
+    def test_corpus_merge(self):
+        """
+        Проверяет, что сводка корпуса из сводок статей (в том числе в пуле процессов)
+        совпадает со сводкой, построенной сразу по всем словам, и укладывается в границы
+        :return: None
+        """
+        self.assertEqual(add_article_sketches(self.articles_path), len(self.folders))
+        self.assertEqual(add_article_sketches(self.articles_path), 0)
+        exact = Counter()
+        direct = WordSketch()
+        for folder in self.folders:
+            words = read_words(self.words_path(folder))
+            exact.update(words)
+            direct.update(words.items())
+        for workers in (1, 2):
+            corpus = corpus_sketch(self.articles_path, workers)
+            self.assertEqual(corpus.frequencies.total, sum(exact.values()))
+            self.assertEqual(corpus.distinct(), direct.distinct())
+            for word in list(exact)[::50]:
+                self.assertEqual(corpus.estimate(word), direct.estimate(word))
+        bound = corpus.frequencies.error_bound()
+        overestimates = [corpus.estimate(word) - count for word, count in exact.items()]
+        self.assertGreaterEqual(min(overestimates), 0)
+        violations = sum(overestimate > bound for overestimate in overestimates)
+        self.assertLessEqual(violations / len(exact), corpus.frequencies.delta)
+        self.assertLess(abs(corpus.distinct() - len(exact)) / len(exact), 3 * corpus.vocabulary.standard_error)
+
+    def test_write_read(self):
+        """
+        Проверяет, что сводка после записи и чтения не меняется
+        :return: None
+        """
+        sketch = words_sketch(self.words_path(self.folders[0]))
+        path = os.path.join(self.articles_path, self.folders[0], SKETCH_FILENAME)
+        sketch.write(path)
+        restored = WordSketch.read(path)
+        self.assertEqual(restored.frequencies.total, sketch.frequencies.total)
+        self.assertEqual(restored.distinct(), sketch.distinct())
+        for word in read_words(self.words_path(self.folders[0])):
+            self.assertEqual(restored.estimate(word), sketch.estimate(word))
+        with open(path, 'r+b') as file:
+            file.write(b'XXXX')
+        with self.assertRaises(ValueError):
+            WordSketch.read(path)
+
+    def test_large_counts(self):
+        """
+        Проверяет, что счетчики больше 2^32 не переполняются при добавлении, объединении,
+        записи и чтении
+        :return: None
+        """
+        sketch = WordSketch(64, 2, 4)
+        sketch.add('кот', 3 << 31)
+        other = WordSketch(64, 2, 4)
+        other.add('кот', 3 << 31)
+        sketch.merge(other)
+        path = os.path.join(self.tmp_dir.name, SKETCH_FILENAME)
+        sketch.write(path)
+        self.assertEqual(WordSketch.read(path).estimate('кот'), 3 << 32)
+
+    def test_concurrent_writes(self):
+        """
+        Проверяет, что потоки, одновременно пишущие одну сводку, не мешают друг другу
+        :return: None
+        """
+        sketch = words_sketch(self.words_path(self.folders[0]))
+        path = os.path.join(self.tmp_dir.name, SKETCH_FILENAME)
+        with ThreadPoolExecutor(8) as executor:
+            for _ in executor.map(lambda _: sketch.write(path), range(32)):
+                pass
+        self.assertEqual(WordSketch.read(path).distinct(), sketch.distinct())
+        self.assertEqual(sorted(os.listdir(self.tmp_dir.name)), ['articles', SKETCH_FILENAME])
+
+    def test_parameters(self):
+        """
+        Проверяет выбор размеров по ошибке и отказ объединять разные сводки
+        :return: None
+        """
+        sketch = CountMinSketch.from_error(0.001, 0.01)
+        self.assertLessEqual(sketch.epsilon, 0.001)
+        self.assertLessEqual(sketch.delta, 0.01)
+        with self.assertRaises(ValueError):
+            sketch.merge(CountMinSketch(64, 5))
+        with self.assertRaises(ValueError):
+            HyperLogLog(10).merge(HyperLogLog(12))
+        with self.assertRaises(ValueError):
+            CountMinSketch(1000, 4)
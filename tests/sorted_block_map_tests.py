@@ -0,0 +1,85 @@
+"""
+Модуль для тестирования map на отсортированных блоках
+"""
+import random
+from tests.map_tests import SortedMapTesting
+from src.maps.sorted_block_map import SortedBlockMap
+
+
+class SortedBlockMapTesting(SortedMapTesting):
+    """
+    Класс для тестирования методов map на отсортированных блоках
+    """
+    h_test = SortedBlockMap
+
+    def test_rank_select_small_blocks(self):
+        """
+        Проверяет rank и select, когда ключи разделены на много блоков
+        :return: None
+        """
+        self.map = SortedBlockMap(block_size=4)
+        self.test_rank_select()
+        self.assertGreater(self.map.blocks(), 10)
+
+    def test_sorted_append(self):
+        """
+        Проверяет, что ключи по возрастанию дописываются в конец и блоки делятся
+        :return: None
+        """
+        self.map = SortedBlockMap(block_size=4)
+        for i in range(100):
+            self.map[f'{i:03}'] = i
+        self.assertEqual(len(self.map), 100)
+        self.assertGreater(self.map.blocks(), 1)
+        self.assertEqual(list(self.map.values()), list(range(100)))
+        self.assertEqual(self.map['057'], 57)
+
+    def test_random_operations(self):
+        """
+        Сверяет вставку, увеличение и удаление в случайном порядке с dict
+        на маленьких блоках, чтобы чаще делить и сливать их
+        :return: None
+        """
+        self.map = SortedBlockMap(block_size=4)
+        rnd = random.Random(0)
+        expected = {}
+        for _ in range(3000):
+            key = rnd.randrange(300)
+            action = rnd.random()
+            if action < 0.4:
+                self.map[key] = key
+                expected[key] = key
+            elif action < 0.7:
+                self.map.increment(key)
+                expected[key] = expected.get(key, 0) + 1
+            elif key in expected:
+                del self.map[key]
+                del expected[key]
+            else:
+                with self.assertRaises(KeyError):
+                    del self.map[key]
+        self.assertEqual(list(self.map), sorted(expected.items()))
+        self.assertEqual(len(self.map), len(expected))
+
+    def test_deletion_of_all(self):
+        """
+        Проверяет, что после удаления всех элементов не остается пустых блоков
+        :return: None
+        """
+        for i in range(2000):
+            self.map[i] = i
+        for i in range(2000):
+            del self.map[i]
+        self.assertEqual(len(self.map), 0)
+        self.assertEqual(self.map.blocks(), 0)
+        self.assertIsNone(self.map.get(5))
+
+    def test_get(self):
+        """
+        Проверяет, правильно ли работает метод get
+        :return: None
+        """
+        self.map[1] = 2
+        self.assertEqual(self.map.get(1, 0), 2)
+        self.assertEqual(self.map.get(2, 0), 0)
+        self.assertEqual(self.map.get(0, 0), 0)
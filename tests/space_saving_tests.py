@@ -0,0 +1,100 @@
+"""
+Модуль для тестирования сводки Space-Saving
+"""
+import random
+import unittest
+from collections import Counter
+from src.maps.space_saving import SpaceSaving
+
+
+def zipf_stream(size: int, vocabulary: int, seed: int = 0) -> list:
+    """Возвращает поток слов с частотами по закону Ципфа (как у слов статей)"""
+    words = [f'word{i}' for i in range(vocabulary)]
+    weights = [1 / (rank + 1) for rank in range(vocabulary)]
+    return random.Random(seed).choices(words, weights, k=size)
+
+
+class SpaceSavingTesting(unittest.TestCase):
+    """
+    Класс для тестирования сводки Space-Saving
+    """
+    def setUp(self):
+        """
+        Создает поток слов и его точные количества
+        :return: None
+        """
+        self.stream = zipf_stream(50000, 5000)
+        self.exact = Counter(self.stream)
+
+    def check_bounds(self, summary: SpaceSaving) -> None:
+        """Проверяет, что настоящее количество каждого слова лежит в границах сводки"""
+        for word, count in self.exact.items():
+            low, high = summary.bounds(word)
+            self.assertLessEqual(low, count)
+            self.assertGreaterEqual(high, count)
+
+    def test_exact_when_fits(self):
+        """
+        Проверяет, что без вытеснений количества точные
+        :return: None
+        """
+        summary = SpaceSaving(capacity=len(self.exact))
+        summary.bulk_add(self.stream)
+        self.assertEqual(dict(summary), dict(self.exact))
+        self.assertEqual(summary.most_common(10), sorted(self.exact.items(), key=lambda p: (-p[1], p[0]))[:10])
+
+    def test_bounded_memory_and_heavy_hitters(self):
+        """
+        Проверяет, что хранится не больше capacity слов, границы верны,
+        а все слова чаще total / capacity раз найдены
+        :return: None
+        """
+        summary = SpaceSaving(capacity=200)
+        summary.bulk_add(self.stream)
+        self.assertEqual(len(summary), 200)
+        self.assertEqual(summary.total, len(self.stream))
+        self.check_bounds(summary)
+        for word, count in self.exact.items():
+            if count > summary.total / summary.capacity:
+                self.assertIn(word, summary)
+        top = [word for word, _ in self.exact.most_common(20)]
+        self.assertEqual({word for word, _ in summary.most_common(20)}, set(top))
+        guaranteed = summary.guaranteed(20)
+        self.assertTrue(guaranteed)
+        self.assertTrue({word for word, _ in guaranteed} <= set(top))
+
+    def test_observe_and_weighted_counts(self):
+        """
+        Проверяет observe (поток проходит дальше без изменений) и прибавление количеств map
+        :return: None
+        """
+        summary = SpaceSaving(capacity=100)
+        self.assertEqual(list(summary.observe(self.stream[:1000])), self.stream[:1000])
+        summary.merge_counts(Counter(self.stream[1000:]))
+        self.assertEqual(summary.total, len(self.stream))
+        self.check_bounds(summary)
+
+    def test_merge(self):
+        """
+        Проверяет, что объединение сводок частей потока сохраняет границы и размер
+        :return: None
+        """
+        parts = [SpaceSaving(capacity=300) for _ in range(4)]
+        for index, part in enumerate(parts):
+            part.bulk_add(self.stream[index::4])
+        merged = parts[0]
+        for part in parts[1:]:
+            merged.merge_counts(part)
+        self.assertEqual(len(merged), 300)
+        self.assertEqual(merged.total, len(self.stream))
+        self.check_bounds(merged)
+        self.assertEqual({word for word, _ in merged.most_common(10)},
+                         {word for word, _ in self.exact.most_common(10)})
+
+    def test_invalid_capacity(self):
+        """
+        Проверяет, что capacity должна быть положительной
+        :return: None
+        """
+        with self.assertRaises(ValueError):
+            SpaceSaving(capacity=0)
@@ -0,0 +1,126 @@
+"""
+Модуль для тестирования инкрементальных общих количеств слов
+"""
+import os
+import shutil
+import tempfile
+import unittest
+from src.storage.totals import LOG_FILENAME, MANIFEST_FILENAME, MAX_RUNS, Manifest, export_totals, \
+    refresh_totals
+
+
+class TotalsTesting(unittest.TestCase):
+    """
+    Класс для тестирования инкрементальных итогов
+    """
+    def setUp(self):
+        """
+        Создает временные папки статей и итогов
+        :return: None
+        """
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.articles_path = os.path.join(self.tmp_dir.name, 'articles')
+        self.totals_path = os.path.join(self.tmp_dir.name, 'totals')
+        os.mkdir(self.articles_path)
+
+    def tearDown(self):
+        """
+        Удаляет временные папки
+        :return: None
+        """
+        self.tmp_dir.cleanup()
+
+    def write_article(self, folder: str, words: str) -> None:
+        """Создает или перезаписывает words.txt статьи"""
+        os.makedirs(os.path.join(self.articles_path, folder), exist_ok=True)
+        words_path = os.path.join(self.articles_path, folder, 'words.txt')
+        with open(words_path, 'w', encoding='utf8') as file:
+            file.write(words)
+        # отпечаток учитывает время изменения: делаем его заведомо новым
+        stat = os.stat(words_path)
+        os.utime(words_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    def totals(self) -> str:
+        """Возвращает текущие итоги"""
+        result_path = os.path.join(self.tmp_dir.name, 'res.txt')
+        export_totals(self.totals_path, result_path)
+        with open(result_path, 'r', encoding='utf8') as file:
+            return file.read()
+
+    def test_add_update_remove(self):
+        """
+        Проверяет прибавление новых статей и вычитание вклада
+        перезаписанных и удаленных статей
+        :return: None
+        """
+        self.write_article('а', 'дом 2\nкот 1\n')
+        self.write_article('б', 'кот 3\n')
+        self.assertEqual(refresh_totals(self.articles_path, self.totals_path), (2, 0, 0))
+        self.assertEqual(self.totals(), 'дом 2\nкот 4\n')
+
+        self.write_article('в', 'мир 5\n')
+        self.assertEqual(refresh_totals(self.articles_path, self.totals_path), (1, 0, 0))
+        self.assertEqual(self.totals(), 'дом 2\nкот 4\nмир 5\n')
+
+        self.write_article('а', 'кот 7\n')  # статья скачана заново
+        shutil.rmtree(os.path.join(self.articles_path, 'б'))
+        self.assertEqual(refresh_totals(self.articles_path, self.totals_path), (0, 1, 1))
+        self.assertEqual(self.totals(), 'кот 7\nмир 5\n')
+        self.assertEqual(refresh_totals(self.articles_path, self.totals_path), (0, 0, 0))
+        self.assertEqual(sorted(Manifest.read(self.totals_path).folders), ['а', 'в'])
+
+    def test_uncommitted_log_is_discarded(self):
+        """
+        Проверяет, что записи журнала, дописанные после фиксации манифеста
+        (прерванное обновление), отбрасываются при следующем обновлении
+        :return: None
+        """
+        self.write_article('а', 'кот 1\n')
+        refresh_totals(self.articles_path, self.totals_path)
+        with open(os.path.join(self.totals_path, LOG_FILENAME), 'ab') as log:
+            log.write('+ 1 0-0 б\nкот 100\n'.encode('utf8'))
+        self.write_article('б', 'кот 2\n')
+        refresh_totals(self.articles_path, self.totals_path)
+        self.assertEqual(self.totals(), 'кот 3\n')
+        shutil.rmtree(os.path.join(self.articles_path, 'б'))
+        refresh_totals(self.articles_path, self.totals_path)
+        self.assertEqual(self.totals(), 'кот 1\n')
+
+    def test_small_refresh_keeps_totals_file(self):
+        """
+        Проверяет, что небольшие обновления дописывают файлы изменений, не переписывая
+        файл итогов, а накопившиеся изменения объединяются с ним в новый файл итогов
+        :return: None
+        """
+        big = ''.join(f'слово{chr(ord("а") + i)}{chr(ord("а") + j)} 1\n' for i in range(32) for j in range(32))
+        self.write_article('большая', big)
+        refresh_totals(self.articles_path, self.totals_path)
+        totals_file = Manifest.read(self.totals_path).totals_file(self.totals_path)
+        stat = os.stat(totals_file)
+        for number in range(3):
+            self.write_article(f'маленькая{number}', f'кот {number + 1}\nсловоаа 2\n')
+            refresh_totals(self.articles_path, self.totals_path)
+        manifest = Manifest.read(self.totals_path)
+        self.assertEqual((manifest.generation, manifest.base, manifest.runs), (4, 1, [2, 3, 4]))
+        self.assertEqual(os.stat(totals_file).st_mtime_ns, stat.st_mtime_ns)
+        expected = big.replace('словоаа 1\n', 'словоаа 7\n') + 'кот 6\n'
+        self.assertEqual(self.totals(), ''.join(sorted(expected.splitlines(keepends=True))))
+
+        shutil.rmtree(os.path.join(self.articles_path, 'большая'))
+        refresh_totals(self.articles_path, self.totals_path)
+        manifest = Manifest.read(self.totals_path)
+        self.assertEqual((manifest.base, manifest.runs), (5, []))
+        self.assertEqual(self.totals(), 'кот 6\nсловоаа 6\n')
+        self.assertEqual(sorted(os.listdir(self.totals_path)), [LOG_FILENAME, MANIFEST_FILENAME, 'totals000005.txt'])
+
+    def test_run_limit(self):
+        """
+        Проверяет, что файлов изменений не становится больше MAX_RUNS
+        :return: None
+        """
+        self.write_article('большая', ''.join(f'слово{i} 1\n' for i in range(10000)))
+        for number in range(MAX_RUNS + 2):
+            self.write_article(f'статья{number}', 'кот 1\n')
+            refresh_totals(self.articles_path, self.totals_path)
+            self.assertLessEqual(len(Manifest.read(self.totals_path).runs), MAX_RUNS)
+        self.assertIn(f'кот {MAX_RUNS + 2}\n', self.totals())
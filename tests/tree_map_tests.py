@@ -1,15 +1,18 @@
 """
 Модуль для тестирования Binary Tree Map
 """
-from tests.map_tests import MapTesting
+import os
+import random
+import tempfile
+from tests.map_tests import SortedMapTesting
 from src.maps.tree_map import TreeMap
 
 
-class BinaryTreeTesting(MapTesting):
+class BinaryTreeTesting(SortedMapTesting):
     """
     Класс для тестирования методов Binary Tree Map
     """
-    t_test = TreeMap
+    h_test = TreeMap
 
     def test_less_in_left(self):
         """
@@ -102,3 +105,95 @@ class BinaryTreeTesting(MapTesting):
         del self.map[1]
         self.assertEqual(self.map.root.value, 'right')
         self.assertEqual(self.map.root.left.value, 'left')
+
+    def fill_words(self) -> None:
+        """Вставляет слова в случайном порядке (значение - длина слова)"""
+        words = ['ма', 'мама', 'мат', 'математика', 'матч', 'мать', 'мб']
+        random.Random(2).shuffle(words)
+        for word in words:
+            self.map[word] = len(word)
+
+    def test_range_items(self):
+        """
+        Проверяет range_items на диапазоне [low, high), в том числе пустые диапазоны
+        и границы, которых нет среди ключей
+        :return: None
+        """
+        self.fill_words()
+        self.assertEqual([key for key, _ in self.map.range_items('мат', 'мать')], ['мат', 'математика', 'матч'])
+        self.assertEqual([key for key, _ in self.map.range_items('мамочка')], ['мат', 'математика', 'матч',
+                                                                             'мать', 'мб'])
+        self.assertEqual([key for key, _ in self.map.range_items(high='мама')], ['ма'])
+        self.assertEqual(list(self.map.range_items('мат', 'мат')), [])
+        self.assertEqual(list(self.map.range_items('мб', 'ма')), [])
+        self.assertEqual(list(self.map.range_items('я')), [])
+        self.assertEqual(list(self.map.range_items()), list(self.map.sorted_items()))
+        self.assertEqual(list(self.h_test().range_items('а', 'я')), [])
+
+    def test_prefix_items(self):
+        """
+        Проверяет поиск по префиксу, в том числе префиксы без ключей и пустой префикс
+        :return: None
+        """
+        self.fill_words()
+        self.assertEqual([key for key, _ in self.map.prefix_items('мат')], ['мат', 'математика', 'матч', 'мать'])
+        self.assertEqual(self.map.prefix_items('матем').__next__(), ('математика', 10))
+        self.assertEqual(list(self.map.prefix_items('мв')), [])
+        self.assertEqual(list(self.map.prefix_items('я')), [])
+        self.assertEqual(len(list(self.map.prefix_items(''))), 7)
+        self.assertEqual(list(self.h_test().prefix_items('м')), [])
+
+    def test_floor_ceiling(self):
+        """
+        Проверяет ближайшие ключи снизу и сверху для существующих и отсутствующих ключей
+        и для пустого дерева
+        :return: None
+        """
+        self.assertIsNone(self.map.floor('мат'))
+        self.assertIsNone(self.map.ceiling('мат'))
+        self.fill_words()
+        self.assertEqual(self.map.floor('мат'), ('мат', 3))
+        self.assertEqual(self.map.ceiling('мат'), ('мат', 3))
+        self.assertEqual(self.map.floor('матрица'), ('математика', 10))
+        self.assertEqual(self.map.ceiling('матрица'), ('матч', 4))
+        self.assertIsNone(self.map.floor('а'))
+        self.assertEqual(self.map.ceiling('а'), ('ма', 2))
+        self.assertEqual(self.map.floor('я'), ('мб', 2))
+        self.assertIsNone(self.map.ceiling('я'))
+
+    def test_sorted_items(self):
+        """
+        Проверяет, что итерация и sorted_items идут по возрастанию ключей
+        :return: None
+        """
+        keys = list(range(500))
+        random.Random(3).shuffle(keys)
+        for key in keys:
+            self.map[key] = -key
+        self.assertEqual(list(self.map.sorted_items()), [(key, -key) for key in range(500)])
+        self.assertEqual(list(self.map), list(self.map.sorted_items()))
+
+    def test_sorted_insert_and_read_round_trip(self):
+        """
+        Проверяет, что 3000 ключей по возрастанию вставляются, ищутся и удаляются
+        без RecursionError, а после write и read дерево сбалансировано
+        :return: None
+        """
+        words = [f'word{index:05}' for index in range(3000)]
+        for index, word in enumerate(words):
+            self.map[word] = index
+        self.assertEqual(self.map[words[-1]], 2999)
+        del self.map[words[-1]]
+        self.map[words[-1]] = 2999
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'words.txt')
+            self.map.write(path, 'w')
+            restored = self.h_test.read(path)
+        self.assertEqual(len(restored), 3000)
+        self.assertEqual(list(restored), list(self.map))
+        self.assertEqual(restored[words[1234]], 1234)
+        depth, level = 0, [restored.root]
+        while level:
+            depth += 1
+            level = [child for node in level for child in (node.left, node.right) if child is not None]
+        self.assertLessEqual(depth, 12)
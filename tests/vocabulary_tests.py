@@ -0,0 +1,140 @@
+"""
+Модуль для тестирования общего словаря и массивов id
+"""
+import os
+import shutil
+import tempfile
+import unittest
+from src.maps.hash_map import HashMap
+from src.parser.file import files_merge
+from src.parser.wiki import count_words, read_content
+from src.storage.vocabulary import (IDS_FILENAME, VOCABULARY_FILENAME, IdCounts, Vocabulary,
+                                    encode_articles, merge_encoded, vocabulary_files_merge)
+
+ARTICLES_DIRECTORY = os.path.join(os.path.dirname(__file__), '..', 'articles')
+
+
+class VocabularyTesting(unittest.TestCase):
+    """
+    Класс для тестирования общего словаря
+    """
+    def setUp(self):
+        """
+        Создает временную копию статей
+        :return: None
+        """
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.articles_path = os.path.join(self.tmp_dir.name, 'articles')
+        shutil.copytree(ARTICLES_DIRECTORY, self.articles_path)
+        self.folders = sorted(os.listdir(self.articles_path))
+        self.path = lambda name: os.path.join(self.tmp_dir.name, name)
+
+    def tearDown(self):
+        """
+        Удаляет временную копию
+        :return: None
+        """
+        self.tmp_dir.cleanup()
+
+    def read(self, name: str) -> str:
+        """Возвращает содержимое файла из временной папки"""
+        with open(self.path(name), 'r', encoding='utf8') as file:
+            return file.read()
+
+    def test_ids_and_interning(self):
+        """
+        Проверяет выдачу id, перевод слов в id и общие экземпляры строк
+        :return: None
+        """
+        vocabulary = Vocabulary(['кот', 'дом'])
+        self.assertEqual(list(vocabulary.encode(['дом', 'мир', 'кот', 'мир'])), [1, 2, 0, 2])
+        self.assertEqual(len(vocabulary), 3)
+        self.assertEqual(vocabulary.word(2), 'мир')
+        self.assertEqual([vocabulary.word(word_id) for word_id in vocabulary.sorted_ids()], ['дом', 'кот', 'мир'])
+        word = ''.join(['м', 'ир'])
+        self.assertIs(next(vocabulary.intern([word])), vocabulary.word(2))
+        with self.assertRaises(KeyError):
+            vocabulary.id('лес')
+
+    def test_vocabulary_file_appends(self):
+        """
+        Проверяет, что файл словаря только дописывается и id после чтения не меняются
+        :return: None
+        """
+        path = self.path(VOCABULARY_FILENAME)
+        vocabulary = Vocabulary(['кот', 'дом'])
+        vocabulary.write(path)
+        restored = Vocabulary.read(path)
+        restored.add('мир')
+        restored.write(path)
+        restored.write(path)
+        self.assertEqual(self.read(VOCABULARY_FILENAME), 'кот\nдом\nмир\n')
+        self.assertEqual(Vocabulary.read(path).id('мир'), 2)
+
+    def test_id_counts_file(self):
+        """
+        Проверяет запись и чтение массивов id и отказ читать чужой файл
+        :return: None
+        """
+        vocabulary = Vocabulary()
+        id_counts = IdCounts.from_pairs({'мир': 2, 'кот': 5}.items(), vocabulary)
+        id_counts.write(self.path(IDS_FILENAME))
+        restored = IdCounts.read(self.path(IDS_FILENAME))
+        self.assertEqual(list(restored), [(0, 2), (1, 5)])
+        self.assertEqual(dict(restored.items(vocabulary)), {'мир': 2, 'кот': 5})
+        with open(self.path('bad.ids'), 'wb') as file:
+            file.write(b'\0' * 16)
+        with self.assertRaises(ValueError):
+            IdCounts.read(self.path('bad.ids'))
+
+    def test_merges_match_files_merge(self):
+        """
+        Проверяет, что объединения через словарь совпадают с files_merge,
+        а повторное кодирование статей добавляет только новые
+        :return: None
+        """
+        filenames = [os.path.join(self.articles_path, folder, 'words.txt') for folder in self.folders]
+        files_merge(*filenames, result_path=self.path('expected.txt'))
+        vocabulary_files_merge(*filenames, result_path=self.path('merged.txt'))
+        self.assertEqual(self.read('merged.txt'), self.read('expected.txt'))
+
+        removed = os.path.join(self.articles_path, self.folders[-1], IDS_FILENAME)
+        vocabulary_path = self.path(VOCABULARY_FILENAME)
+        self.assertEqual(encode_articles(self.articles_path, vocabulary_path), len(self.folders))
+        self.assertEqual(sorted(os.listdir(self.articles_path)), self.folders)
+        os.remove(removed)
+        self.assertEqual(encode_articles(self.articles_path, vocabulary_path), 1)
+        merge_encoded(self.articles_path, vocabulary_path, self.path('encoded.txt'))
+        self.assertEqual(self.read('encoded.txt'), self.read('expected.txt'))
+        words_path = os.path.join(self.articles_path, self.folders[-1], 'words.txt')
+        expected = {word: int(count) for word, count in map(str.split, self.read(words_path).splitlines())}
+        restored = IdCounts.read(removed).items(Vocabulary.read(vocabulary_path))
+        self.assertEqual(dict(restored), expected)
+
+    def test_zero_counts(self):
+        """
+        Проверяет, что слова с нулевым общим количеством записываются, как в files_merge
+        :return: None
+        """
+        contents = ['дом 0\nкот 2\n', 'дом 0\nмир 0\n', 'кот 1\n']
+        filenames = []
+        for index, content in enumerate(contents):
+            filenames.append(self.path(f'zero{index}.txt'))
+            with open(filenames[-1], 'w', encoding='utf8') as file:
+                file.write(content)
+        files_merge(*filenames, result_path=self.path('expected.txt'))
+        vocabulary_files_merge(*filenames, result_path=self.path('merged.txt'))
+        self.assertEqual(self.read('merged.txt'), 'дом 0\nкот 3\nмир 0\n')
+        self.assertEqual(self.read('merged.txt'), self.read('expected.txt'))
+
+    def test_count_words_by_id(self):
+        """
+        Проверяет, что подсчет слов статьи по id совпадает с подсчетом по строкам
+        :return: None
+        """
+        html, _ = read_content(os.path.join(self.articles_path, self.folders[0], 'content.txt'))
+        vocabulary = Vocabulary()
+        by_id = count_words(html, HashMap(), vocabulary=vocabulary)
+        by_word = count_words(html, HashMap())
+        self.assertEqual(len(vocabulary), len(by_word))
+        self.assertEqual(dict((vocabulary.word(word_id), count) for word_id, count in by_id), dict(by_word))
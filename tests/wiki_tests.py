@@ -0,0 +1,275 @@
+"""
+Модуль для тестирования разбора вики-статей на сохраненных статьях
+"""
+import os
+import re
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from concurrent.futures import ThreadPoolExecutor
+from bs4 import FeatureNotFound
+from bs4.builder import builder_registry
+from src.maps.hash_map import HashMap
+from src.parser.wiki import (CONTENT_END, CONTENT_START, EXCLUDED_PHRASE, HTML_FEATURES, WIKI_DOMAIN, WIKI_RANDOM,
+                             WORD_SPLITTERS, _phrase_prefix_start, analyze_article, article_heading, content_block,
+                             content_region, count_words, fast_features, get_urls, iter_words, multi_parsing,
+                             read_content, save_article)
+
+ARTICLES_DIRECTORY = os.path.join(os.path.dirname(__file__), '..', 'articles')
+# ссылки статей для обхода без сети; Special:Random ведет на A, а статья Bad падает
+LINKS = {
+    'A': ['B', 'C', 'A'],
+    'B': ['A', 'D', 'Bad', 'B'],
+    'C': ['D', 'E'],
+    'D': ['F'],
+    'E': [],
+    'F': [],
+}
+
+
+def read_html(folder: str) -> str:
+    """Возвращает html области статьи из content.txt"""
+    html, _ = read_content(os.path.join(ARTICLES_DIRECTORY, folder, 'content.txt'))
+    return html
+
+
+def split_words(strings: list) -> list:
+    """Прежнее разбиение на слова: re.split по всему тексту блока"""
+    return [word.lower() for word in re.split(WORD_SPLITTERS, ''.join(strings)) if word != '' and word.isalpha()]
+
+
+def read_bytes(folder: str) -> bytes:
+    """Возвращает весь content.txt статьи"""
+    with open(os.path.join(ARTICLES_DIRECTORY, folder, 'content.txt'), 'rb') as file:
+        return file.read()
+
+
+class WikiTesting(unittest.TestCase):
+    """
+    Класс для тестирования разбора статей
+    """
+    def setUp(self):
+        """
+        Составляет список сохраненных статей
+        :return: None
+        """
+        self.folders = sorted(os.listdir(ARTICLES_DIRECTORY))
+
+    def test_analyze_article_matches_separate_parses(self):
+        """
+        Проверяет, что один разбор analyze_article дает те же слова и ссылки,
+        что count_words и get_urls по отдельности
+        :return: None
+        """
+        for folder in self.folders[::5]:
+            html = read_html(folder)
+            words, urls = analyze_article(html, HashMap())
+            self.assertEqual(dict(words), dict(count_words(html, HashMap())), folder)
+            self.assertEqual(sorted(urls), sorted(get_urls(html)), folder)
+        _, first_urls = analyze_article(html, HashMap(), max_urls=3)
+        self.assertEqual(len(first_urls), 3)
+        self.assertLessEqual(set(first_urls), set(urls))
+
+    def test_default_features(self):
+        """
+        Проверяет, что по умолчанию используется html.parser, даже если установлен lxml
+        :return: None
+        """
+        self.assertEqual(HTML_FEATURES, 'html.parser')
+        self.assertIn(fast_features(), ('html.parser', 'lxml'))
+
+    @unittest.skipIf(builder_registry.lookup('lxml') is None, 'lxml is not installed')
+    def test_lxml_matches_html_parser(self):
+        """
+        Проверяет, что lxml дает те же слова и ссылки, что html.parser
+        :return: None
+        """
+        for folder in self.folders:
+            html = read_html(folder)
+            words, urls = analyze_article(html, HashMap())
+            lxml_words, lxml_urls = analyze_article(html, HashMap(), features='lxml')
+            self.assertEqual(dict(lxml_words), dict(words), folder)
+            self.assertEqual(sorted(lxml_urls), sorted(urls), folder)
+
+    def test_save_article_features(self):
+        """
+        Проверяет, что построитель дерева доходит до разбора при сохранении статьи
+        :return: None
+        """
+        folder = self.folders[0]
+        content = read_bytes(folder)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            urls = save_article(folder, f'{WIKI_DOMAIN}/wiki/{folder}', content, tmp_dir, features=HTML_FEATURES)
+            with open(os.path.join(tmp_dir, folder, 'words.txt'), 'rb') as file:
+                words = file.read()
+            with open(os.path.join(ARTICLES_DIRECTORY, folder, 'words.txt'), 'rb') as file:
+                self.assertEqual(words, file.read())
+            self.assertEqual(sorted(urls), sorted(get_urls(read_html(folder))))
+            with self.assertRaises(FeatureNotFound):
+                save_article('other', f'{WIKI_DOMAIN}/wiki/other', content, tmp_dir, features='no-such-builder')
+
+    def test_phrase_prefix_start(self):
+        """
+        Проверяет поиск конца текста, с которого может начинаться EXCLUDED_PHRASE
+        :return: None
+        """
+        self.assertEqual(_phrase_prefix_start(''), 0)
+        self.assertEqual(_phrase_prefix_start('кот'), 3)
+        self.assertEqual(_phrase_prefix_start('кот п'), 4)
+        self.assertEqual(_phrase_prefix_start('кот править | пр'), 4)
+        self.assertEqual(_phrase_prefix_start('кот ' + EXCLUDED_PHRASE[:-1]), 4)
+        # целая фраза уже отделяется разбиением, переносить ее не нужно
+        self.assertEqual(_phrase_prefix_start('кот ' + EXCLUDED_PHRASE), 4 + len(EXCLUDED_PHRASE))
+        self.assertEqual(_phrase_prefix_start('править кот'), 11)
+        self.assertEqual(_phrase_prefix_start('пп'), 1)
+
+    def test_iter_words_matches_split(self):
+        """
+        Проверяет, что iter_words с маленькими порциями совпадает с прежним re.split
+        по всему тексту: разделители и EXCLUDED_PHRASE на границе порций, слова,
+        разрезанные между тегами, и пустые куски
+        :return: None
+        """
+        phrase = EXCLUDED_PHRASE
+        cases = {
+            'splitters': ['Кот.мир!', 'дом?', ' сад,лес;', '[река](море)\\поле|луг\n'],
+            'phrase': [f'начало{phrase}конец {phrase} середина{phrase}'],
+            'phrase in tags': ['кот' + phrase[:3], phrase[3:9], phrase[9:], 'мир'],
+            'partial phrase': ['править |', ' править', ' кот править | правило'],
+            'word in tags': ['при', 'вет', ' ', 'м', 'ир'],
+            'empty tokens': ['', '  ', '..', '', ',,кот,,', '', '\n\n'],
+            'not alpha': ['кот2 3 мир x-y ', 'Ёж'],
+            'empty': [],
+        }
+        for name, strings in cases.items():
+            for chunk_size in (1, 2, 3, 5, 7, 8192):
+                with self.subTest(name, chunk_size=chunk_size):
+                    self.assertEqual(list(iter_words(strings, chunk_size)), split_words(strings))
+
+    def test_iter_words_matches_split_on_articles(self):
+        """
+        Проверяет совпадение с прежним разбиением на текстовых узлах сохраненных статей
+        :return: None
+        """
+        for folder in self.folders[:3]:
+            strings = list(content_block(read_html(folder)).strings)
+            expected = split_words(strings)
+            for chunk_size in (1, 64):
+                with self.subTest(folder, chunk_size=chunk_size):
+                    self.assertEqual(list(iter_words(strings, chunk_size)), expected)
+
+    def assert_same_analysis(self, html: str, expected_html: str, message: str) -> None:
+        """Проверяет, что слова и ссылки двух html совпадают"""
+        words, urls = analyze_article(html, HashMap())
+        expected_words, expected_urls = analyze_article(expected_html, HashMap())
+        self.assertEqual(dict(words), dict(expected_words), message)
+        self.assertEqual(sorted(urls), sorted(expected_urls), message)
+
+    def test_content_region_matches_full_html(self):
+        """
+        Проверяет, что слова и ссылки области mw-content-text совпадают
+        с разбором всего html на всех сохраненных статьях
+        :return: None
+        """
+        for folder in self.folders:
+            content = read_bytes(folder)
+            html, decoded = read_content(os.path.join(ARTICLES_DIRECTORY, folder, 'content.txt'))
+            self.assertLess(decoded, len(content), folder)
+            self.assertEqual(html, content[slice(*content_region(content))].decode(), folder)
+            self.assert_same_analysis(html, content.decode(), folder)
+
+    def test_content_region_fallback(self):
+        """
+        Проверяет, что без разметки начала или конца области читается весь текст
+        или текст до конца файла, и разбор совпадает с разбором всего html
+        :return: None
+        """
+        content = read_bytes(self.folders[0])
+        self.assertEqual(content_region(b''), (0, 0))
+        self.assertEqual(content_region(b'<p>no markers</p>'), (0, 17))
+        no_end = content.replace(CONTENT_END, b'class="footer"')
+        start, end = content_region(no_end)
+        self.assertGreater(start, 0)
+        self.assertEqual(end, len(no_end))
+        no_start = content.replace(CONTENT_START, b"id='mw-content-text'")
+        self.assertEqual(content_region(no_start), (0, len(no_start)))
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'content.txt')
+            for changed in (no_end, no_start):
+                with open(path, 'wb') as file:
+                    file.write(changed)
+                html, _ = read_content(path)
+                self.assert_same_analysis(html, changed.decode(), self.folders[0])
+            open(path, 'wb').close()
+            self.assertEqual(read_content(path), ('', 0))
+
+
+class MultiParsingTesting(unittest.TestCase):
+    """
+    Класс для тестирования обхода статей пулом (multi_parsing) с подмененной загрузкой статей
+    """
+    def setUp(self):
+        """
+        Подменяет parse_article: статьи берутся из LINKS, а вызовы запоминаются
+        :return: None
+        """
+        self.calls = []
+        self.features = set()
+        self.lock = threading.Lock()
+        patcher = mock.patch('src.parser.wiki.parse_article', self.parse_article)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def parse_article(self, url: str, *args) -> tuple:
+        """Заглушка parse_article: возвращает заголовок и ссылки статьи из LINKS"""
+        heading = article_heading(url)
+        with self.lock:
+            self.calls.append(heading)
+            self.features.add(args[-1])
+        if heading == 'Special:Random':
+            heading = 'A'
+        if heading == 'Bad':
+            raise RuntimeError('broken article')
+        return heading, [f'{WIKI_DOMAIN}/wiki/{link}' for link in LINKS[heading]]
+
+    def crawl(self, depth: int, url: str = WIKI_RANDOM) -> int:
+        """Запускает обход пулом потоков"""
+        return multi_parsing(url, ThreadPoolExecutor, depth=depth, workers=4)
+
+    def test_depth(self):
+        """
+        Проверяет ограничение глубины, отсутствие повторных загрузок (в том числе статьи,
+        на которую привела Special:Random) и количество обработанных статей без упавших
+        :return: None
+        """
+        self.assertEqual(self.crawl(0), 1)
+        self.assertEqual(self.calls, ['Special:Random'])
+        self.calls.clear()
+        self.assertEqual(self.crawl(1), 3)
+        self.assertEqual(sorted(self.calls), ['B', 'C', 'Special:Random'])
+        self.calls.clear()
+        with self.assertLogs('src.parser.wiki', 'WARNING') as logs:
+            self.assertEqual(self.crawl(2), 5)
+        self.assertEqual(sorted(self.calls), ['B', 'Bad', 'C', 'D', 'E', 'Special:Random'])
+        self.assertIn('broken article', '\n'.join(logs.output))
+        self.calls.clear()
+        self.assertEqual(self.crawl(5, f'{WIKI_DOMAIN}/wiki/A'), 6)
+        self.assertEqual(sorted(self.calls), ['A', 'B', 'Bad', 'C', 'D', 'E', 'F'])
+        self.assertEqual(self.features, {None})
+
+    def test_features_reach_articles(self):
+        """
+        Проверяет, что построитель дерева передается в обработку каждой статьи
+        :return: None
+        """
+        multi_parsing(WIKI_RANDOM, ThreadPoolExecutor, depth=1, workers=2, features='lxml')
+        self.assertEqual(self.features, {'lxml'})
+
+    def test_failing_callback(self):
+        """
+        Проверяет, что обход завершается, даже если обработка ошибки статьи сама падает
+        :return: None
+        """
+        with mock.patch('src.parser.wiki.logger.warning', side_effect=RuntimeError('broken log')):
+            self.assertEqual(self.crawl(2), 5)